@@ -1,8 +1,6 @@
 #!/usr/bin/env python3
 
 
-from rich import print
-
 from helpers import load_input
 
 
@@ -22,8 +20,11 @@ def part2(file_contents: str) -> int:
 
 
 if __name__ == "__main__":
-    answer1 = part1(load_input(__file__))
-    answer2 = part2(load_input(__file__))
+    from rich import print
+
+    data = load_input(__file__)
+    answer1 = part1(data)
+    answer2 = part2(data)
     print(f"The answer is: {answer1=}, {answer2=}")
 
 
@@ -0,0 +1,115 @@
+import functools
+import json
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+from aoc.cache import CACHE_DIR, atomic_write_bytes, sha256
+
+ROOT = Path(__file__).parent.parent
+
+
+def _module_path(name: str) -> Optional[Path]:
+    """Maps a module name to its file, if it lives in this repo."""
+    parts = name.split(".")
+    for candidate in (ROOT.joinpath(*parts).with_suffix(".py"), ROOT.joinpath(*parts, "__init__.py")):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def local_dependencies(path: Path) -> set[Path]:
+    """Every file in this repo that a module imports, directly or indirectly, including itself."""
+    import ast
+
+    seen = set()
+    queue = [path]
+    while queue:
+        path = queue.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+
+        for node in ast.walk(ast.parse(path.read_text())):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                # `from aoc import cache` imports a module, `from aoc.ds import t` imports a name
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            queue.extend(dep for dep in map(_module_path, names) if dep is not None)
+
+    return seen
+
+
+@functools.cache
+def code_hash(module_name: str) -> str:
+    module = sys.modules.get(module_name)
+    path = Path(module.__file__) if module and module.__file__ else _module_path(module_name)
+    if path is None:
+        raise ValueError(f"Can't find the source of {module_name}")
+    return sha256("".join(sha256(dep.read_bytes()) for dep in sorted(local_dependencies(path))))
+
+
+def _cache_path(func: Callable, file_contents: str) -> Path:
+    key = sha256(f"{code_hash(func.__module__)}:{func.__qualname__}:{sha256(file_contents)}")
+    return CACHE_DIR / "answers" / f"{func.__module__}.{func.__qualname__}.{key[:32]}.json"
+
+
+def enabled() -> bool:
+    return os.environ.get("AOC_ANSWER_CACHE") != "0"
+
+
+def lookup(func: Callable, file_contents: str) -> Optional[dict]:
+    """Returns `{"answer": ..., "ms": ...}` from when this code last solved this input, if it has."""
+    if not enabled():
+        return None
+    try:
+        return json.loads(_cache_path(func, file_contents).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def store(func: Callable, file_contents: str, answer: Any, ms: float):
+    if not enabled() or not isinstance(answer, (int, str)):
+        return
+    atomic_write_bytes(_cache_path(func, file_contents), json.dumps({"answer": answer, "ms": ms}).encode())
+
+
+def cached_call(func: Callable, file_contents: str) -> Any:
+    """Calls `func(file_contents)`, unless the current code has already answered for this input."""
+    if cached := lookup(func, file_contents):
+        return cached["answer"]
+
+    start = perf_counter()
+    answer = func(file_contents)
+    store(func, file_contents, answer, (perf_counter() - start) * 1000)
+    return answer
+
+
+def test_local_dependencies():
+    assert local_dependencies(ROOT / "day_17.py") >= {
+        ROOT / "day_17.py",
+        ROOT / "helpers.py",
+        ROOT / "aoc" / "grid.py",
+        ROOT / "aoc" / "cache.py",
+    }
+    assert ROOT / "aoc" / "ds.py" not in local_dependencies(ROOT / "day_16.py")
+
+
+def test_cached_call(tmp_path, monkeypatch):
+    monkeypatch.setitem(globals(), "CACHE_DIR", tmp_path)
+    calls = []
+
+    def solve(file_contents):
+        calls.append(file_contents)
+        return len(file_contents)
+
+    assert cached_call(solve, "abc") == 3
+    assert cached_call(solve, "abc") == 3
+    assert cached_call(solve, "abcd") == 4
+    assert calls == ["abc", "abcd"]
+    assert lookup(solve, "abc")["answer"] == 3  # type: ignore[index]
@@ -0,0 +1,132 @@
+import argparse
+import glob
+import importlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Iterator, Optional, TextIO
+
+from aoc.day import DayRun, load as load_day
+
+# The day module each worker imported when it started, so inputs don't pay for the import
+_day: Any = None
+
+
+def find_inputs(patterns: list[str]) -> list[Path]:
+    """Every file in the given directories, or matching the given globs, or the given files themselves."""
+    inputs: list[Path] = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            inputs.extend(sorted(path for path in Path(pattern).iterdir() if path.is_file()))
+        else:
+            inputs.extend(sorted(map(Path, glob.glob(pattern))) or [Path(pattern)])
+    return inputs
+
+
+def _start_worker(day: str):
+    global _day
+    _day = load_day(importlib.import_module(f"day_{day}"))
+
+
+def solve_input(day: str, path: Path, parts: tuple[int, ...] = (1, 2)) -> list[dict]:
+    """Solves each part for one input, parsing it once for days declaring a `Day` (so part 1's time includes it)."""
+    results = []
+    try:
+        run = DayRun(_day, path.read_text())
+    except OSError as e:
+        return [{"input": str(path), "day": day, "part": part, "error": f"{type(e).__name__}: {e}"} for part in parts]
+
+    for part in parts:
+        result: dict = {"input": str(path), "day": day, "part": part, "answer": None, "ms": None, "error": None}
+        try:
+            with redirect_stdout(StringIO()):
+                start = perf_counter()
+                result["answer"] = run.solve(part)
+                result["ms"] = (perf_counter() - start) * 1000
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        results.append(result)
+    return results
+
+
+def solve_chunk(day: str, paths: list[Path], parts: tuple[int, ...]) -> list[dict]:
+    return [result for path in paths for result in solve_input(day, path, parts)]
+
+
+def run_batch(
+    day: str,
+    inputs: list[Path],
+    parts: tuple[int, ...] = (1, 2),
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> Iterator[dict]:
+    """
+    Yields results as inputs are solved, across a pool of workers that each import the day once. Inputs are sent to
+    workers in chunks, so tiny inputs aren't dominated by the cost of handing them over; by default each worker gets
+    about four chunks, so one slow chunk doesn't hold up the end of the run.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, len(inputs) // (workers * 4))
+    chunks = [inputs[i : i + chunk_size] for i in range(0, len(inputs), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker, initargs=(day,)) as executor:
+        futures = [executor.submit(solve_chunk, day, chunk, parts) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def write_ndjson(results: Iterator[dict], outfile: TextIO) -> int:
+    count = 0
+    for result in results:
+        outfile.write(json.dumps(result, default=str) + "\n")
+        count += 1
+    return count
+
+
+def main(argv: list[str]):
+    parser = argparse.ArgumentParser(
+        prog="run.py batch", description="Solve a day for many inputs, writing answers and timings as NDJSON."
+    )
+    parser.add_argument("day", help="Day to solve, e.g. 05")
+    parser.add_argument("inputs", nargs="+", help="Input files, directories of them, or globs")
+    parser.add_argument("--parts", type=int, nargs="+", choices=(1, 2), default=[1, 2], help="Parts to solve")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Inputs sent to a worker at a time")
+    parser.add_argument("--output", default="-", help="Where to write the results (default: stdout)")
+    args = parser.parse_args(argv)
+
+    day = f"{int(args.day):02}"
+    inputs = find_inputs(args.inputs)
+    start = perf_counter()
+    results = run_batch(day, inputs, tuple(args.parts), workers=args.workers, chunk_size=args.chunk_size)
+    if args.output == "-":
+        count = write_ndjson(results, sys.stdout)
+    else:
+        with open(args.output, "w") as outfile:
+            count = write_ndjson(results, outfile)
+
+    seconds = perf_counter() - start
+    print(f"Solved {len(inputs)} inputs ({count} results) in {seconds:.2f}s", file=sys.stderr)
+
+
+def test_run_batch(tmp_path):
+    (tmp_path / "a.txt").write_text("0 3 6 9 12 15\n1 3 6 10 15 21\n10 13 16 21 30 45\n")
+    (tmp_path / "b.txt").write_text("0 3 6 9 12 15\n")
+    (tmp_path / "c.txt").write_text("not numbers\n")
+    inputs = find_inputs([str(tmp_path)])
+    assert [path.name for path in inputs] == ["a.txt", "b.txt", "c.txt"]
+    assert find_inputs([str(tmp_path / "[ab].txt")]) == inputs[:2]
+
+    results = sorted(run_batch("09", inputs, workers=2), key=lambda r: (r["input"], r["part"]))
+    assert [(Path(r["input"]).name, r["part"], r["answer"]) for r in results[:4]] == [
+        ("a.txt", 1, 114),
+        ("a.txt", 2, 2),
+        ("b.txt", 1, 18),
+        ("b.txt", 2, -3),
+    ]
+    assert all(r["ms"] > 0 for r in results[:4])
+    assert results[4]["error"].startswith("ValueError")
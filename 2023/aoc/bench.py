@@ -0,0 +1,211 @@
+import argparse
+import datetime
+import importlib
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from time import perf_counter, process_time
+from typing import Callable, Optional
+
+from aoc import counters, history, memo
+from aoc.budget import budget_for, describe, run_within
+from aoc.cache import sha256
+from aoc.measure import measure_part
+from aoc.variants import part_of, variants
+from helpers import call_part, get_input_filepath
+
+PART_FUNCTION = re.compile(r"^part[12](_\w+)?$")
+
+
+def discover_days() -> list[str]:
+    return sorted(path.stem[4:] for path in Path(".").glob("day_[0-9][0-9].py"))
+
+
+def solution_functions(module) -> dict[str, Callable]:
+    """
+    Returns every `partN` function in a day module, including registered variants and ones named like
+    `part1_quadratic`.
+    """
+    functions = {
+        name: func
+        for name, func in vars(module).items()
+        if PART_FUNCTION.match(name) and callable(func) and getattr(func, "__module__", None) == module.__name__
+    }
+    return functions | {name: func for funcs in variants(module).values() for name, func in funcs.items()}
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def benchmark_function(module, func: Callable, file_contents: str, warmup: int = 1, repeat: int = 5) -> dict:
+    """
+    Times repeated calls of a part function (in milliseconds), then makes one call split into parse/solve phases and
+    one traced call to measure peak traced memory.
+    """
+    stdout = StringIO()
+    with redirect_stdout(stdout):
+        for _ in range(warmup):
+            call_part(func, file_contents)
+
+        timings, cpu_timings = [], []
+        for _ in range(repeat):
+            start, cpu_start = perf_counter(), process_time()
+            answer = call_part(func, file_contents)
+            timings.append((perf_counter() - start) * 1000)
+            cpu_timings.append((process_time() - cpu_start) * 1000)
+
+        # Tracing slows everything down, so memory is measured separately from the timed runs.
+        _, timed = measure_part(module, func, file_contents, trace_memory=False)
+        memo.reset_stats()
+        with counters.recording() as snapshot:
+            _, traced = measure_part(module, func, file_contents, trace_memory=True)
+            counts = snapshot()
+        memo_stats = memo.snapshot()
+
+    phases = traced.as_dict()
+    for name, stats in timed.phases.items():
+        phases[name]["ms"] = stats.ms
+
+    return {
+        "answer": answer,
+        "runs": repeat,
+        "min_ms": min(timings),
+        "median_ms": statistics.median(timings),
+        "p95_ms": percentile(timings, 95),
+        "median_cpu_ms": statistics.median(cpu_timings),
+        "peak_bytes": phases["solve"]["peak_bytes"],
+        "phases": phases,
+        "counters": counts,
+        "memo": memo_stats,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "node": platform.node(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def quiet_call(func: Callable, file_contents: str):
+    with redirect_stdout(StringIO()):
+        return call_part(func, file_contents)
+
+
+def within_budget(module, day: str, name: str, func: Callable, file_contents: str) -> Optional[str]:
+    """
+    Solves once in a child process within the day's budget, so a solution that runs away is reported (with how far it
+    got) rather than hanging the benchmark. Returns why it failed, if it did.
+    """
+    budget = budget_for(module, day, part_of(name, func))
+    with counters.recording():
+        outcome = run_within(budget, quiet_call, func, file_contents)
+    return None if outcome.ok else describe(outcome, budget)
+
+
+def run_benchmarks(days: list[str], warmup: int = 1, repeat: int = 5, budgets: bool = True) -> list[dict]:
+    results = []
+    for day in days:
+        if not os.path.exists(get_input_filepath(day)):
+            print(f"Skipping day {day}: no input at {get_input_filepath(day)}", file=sys.stderr)
+            continue
+
+        module = importlib.import_module(f"day_{day}")
+        with open(get_input_filepath(day)) as f:
+            file_contents = f.read()
+
+        for name, func in solution_functions(module).items():
+            if budgets and (error := within_budget(module, day, name, func, file_contents)):
+                results.append({"day": day, "function": name, "error": error})
+                print(f"day {day} {name}: {error}", file=sys.stderr)
+                continue
+
+            result = benchmark_function(module, func, file_contents, warmup=warmup, repeat=repeat)
+            results.append({"day": day, "function": name, **result})
+            print(f"day {day} {name}: median {result['median_ms']:.3f}ms", file=sys.stderr)
+            history.record(
+                [
+                    {
+                        "day": day,
+                        "part": part_of(name, func),
+                        "variant": name,
+                        "input_hash": sha256(file_contents),
+                        "wall_ms": result["median_ms"],
+                        "cpu_ms": result["median_cpu_ms"],
+                        "peak_rss_kib": result["phases"]["solve"]["peak_rss_kib"],
+                    }
+                ],
+                source="bench",
+            )
+
+    return results
+
+
+def print_results(results: list[dict]):
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table("Day", "Function", "Min (ms)", "Median (ms)", "p95 (ms)", "Parse (ms)", "Peak traced (KiB)", "Answer")
+    for result in results:
+        if "error" in result:
+            table.add_row(result["day"], result["function"], *["-"] * 5, f"[red]{result['error']}[/red]")
+            continue
+        parse = result["phases"].get("parse")
+        table.add_row(
+            result["day"],
+            result["function"],
+            f"{result['min_ms']:.3f}",
+            f"{result['median_ms']:.3f}",
+            f"{result['p95_ms']:.3f}",
+            f"{parse['ms']:.3f}" if parse else "-",
+            f"{result['peak_bytes'] / 1024:.1f}",
+            str(result["answer"]),
+        )
+    Console().print(table)
+
+
+def main(argv: list[str]):
+    parser = argparse.ArgumentParser(prog="run.py bench", description="Benchmark every part of every day.")
+    parser.add_argument("days", nargs="*", help="Days to benchmark, e.g. 05 17 (default: all)")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed calls before timing starts")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed calls per function")
+    parser.add_argument("--output", default="bench.json", help="Where to write the JSON results")
+    parser.add_argument("--no-budget", action="store_true", help="Don't first check each function is within budget")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    # Otherwise every call after the first would time unpickling the parsed input rather than parsing it
+    os.environ["AOC_PARSE_CACHE"] = "0"
+
+    days = [f"{int(day):02}" for day in args.days] or discover_days()
+    results = run_benchmarks(days, warmup=args.warmup, repeat=args.repeat, budgets=not args.no_budget)
+
+    with open(args.output, "w") as outfile:
+        json.dump({"environment": environment(), "results": results}, outfile, indent=2, default=str)
+        outfile.write("\n")
+
+    print_results(results)
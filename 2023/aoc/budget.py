@@ -0,0 +1,267 @@
+import dataclasses
+import json
+import math
+import os
+from time import perf_counter, process_time
+from typing import Any, Callable, Optional
+
+from aoc import counters, memo
+
+BUDGETS_FILE = "budgets.json"
+# The watchdog kills a solve after this many times its CPU budget in wall-clock time, in case it's stuck without using
+# any CPU (or is sharing it with other solves)
+WALL_CLOCK_FACTOR = 2
+# How often (seconds) a solve reports its progress, so there's something recent to show if it's killed
+PROGRESS_EVERY = 0.25
+
+MiB = 1024 * 1024
+
+
+@dataclasses.dataclass(frozen=True)
+class Budget:
+    """
+    Limits for one solve: `seconds` of CPU time and `memory_mib` of memory on top of what the process already had. None
+    means no limit. A day module can declare its own as `BUDGET = Budget(...)`, or `{1: Budget(...), 2: ...}` per part.
+    """
+
+    seconds: Optional[float] = None
+    memory_mib: Optional[int] = None
+
+    def override(self, other: Optional["Budget"]) -> "Budget":
+        """This budget with any limits `other` sets replacing its own."""
+        if other is None:
+            return self
+        return dataclasses.replace(self, **{k: v for k, v in dataclasses.asdict(other).items() if v is not None})
+
+
+DEFAULT_BUDGET = Budget(seconds=60, memory_mib=4096)
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+@dataclasses.dataclass
+class Outcome:
+    value: Any = None
+    error: Optional[str] = None
+    # "time" or "memory" if the solve was stopped for going over its budget
+    breach: Optional[str] = None
+    # The last progress the solve reported: "ms", "cpu_ms", "peak_rss_mib" and (if counters are enabled) "counters"
+    # and "memo"
+    progress: dict = dataclasses.field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.breach is None
+
+
+def load_budgets(path: str = BUDGETS_FILE) -> dict[str, Budget]:
+    """Budgets from the config file, keyed by `day` or `day/part`, e.g. `{"12": {"seconds": 5}, "20/2": {...}}`."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return {key: Budget(**limits) for key, limits in json.load(f).items()}
+
+
+def _declared(module, part: int) -> Optional[Budget]:
+    declared = getattr(module, "BUDGET", None)
+    return declared.get(part) if isinstance(declared, dict) else declared
+
+
+def declares_budget(module, day: str, part: int, budgets: Optional[dict[str, Budget]] = None) -> bool:
+    """Whether the module's `BUDGET` or the config file sets this part a budget, rather than it getting the default."""
+    budgets = load_budgets() if budgets is None else budgets
+    return _declared(module, part) is not None or day in budgets or f"{day}/{part}" in budgets
+
+
+def budget_for(module, day: str, part: int, budgets: Optional[dict[str, Budget]] = None) -> Budget:
+    """The default budget, overridden by the module's `BUDGET`, then the config file's `day` and `day/part` budgets."""
+    budgets = load_budgets() if budgets is None else budgets
+    declared = _declared(module, part)
+    return DEFAULT_BUDGET.override(declared).override(budgets.get(day)).override(budgets.get(f"{day}/{part}"))
+
+
+def _address_space() -> int:
+    """Bytes of address space already mapped (Linux only, otherwise 0). Forked children inherit all of it."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _progress(start: float) -> dict:
+    from aoc.measure import peak_rss_kib
+
+    progress: dict[str, Any] = {
+        "ms": (perf_counter() - start) * 1000,
+        # A forked child's CPU time starts from zero
+        "cpu_ms": process_time() * 1000,
+        "peak_rss_mib": peak_rss_kib() / 1024,
+    }
+    if counters.enabled():
+        progress["counters"] = counters.snapshot()
+        progress["memo"] = memo.snapshot()
+    return progress
+
+
+def _on_sigxcpu(signum, frame):
+    raise BudgetExceeded("time")
+
+
+def _child(conn, func: Callable, args: tuple, budget: Budget):
+    import resource
+    import signal
+    import threading
+
+    start = perf_counter()
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def send(message):
+        with lock:
+            conn.send(message)
+
+    def report():
+        while not done.wait(PROGRESS_EVERY):
+            send(("progress", _progress(start)))
+
+    counters.reset()
+    memo.reset_stats()
+    threading.Thread(target=report, daemon=True).start()
+
+    # Limits are set once the reporting thread (and its stack) exists
+    if budget.memory_mib is not None:
+        limit = _address_space() + budget.memory_mib * MiB
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if budget.seconds is not None:
+        # SIGXCPU at the soft limit lets the solve report where it got to; the kernel kills it at the hard limit
+        signal.signal(signal.SIGXCPU, _on_sigxcpu)
+        cpu = math.ceil(budget.seconds)
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+
+    try:
+        message = ("done", func(*args))
+    except BudgetExceeded as e:
+        message = ("breach", str(e))
+    except MemoryError:
+        message = ("breach", "memory")
+    except Exception as e:
+        message = ("error", f"{type(e).__name__}: {e}")
+    done.set()
+    send((*message, _progress(start)))
+
+
+def run_within(budget: Budget, func: Callable, *args) -> Outcome:
+    """
+    Calls `func(*args)` in a forked child process limited to the budget's CPU time and memory (`RLIMIT_CPU` and
+    `RLIMIT_AS`), with a watchdog that kills it after `WALL_CLOCK_FACTOR` times its CPU budget. The result has the
+    value `func` returned, or why it didn't return, along with the last progress it reported.
+    """
+    import multiprocessing
+    import signal
+
+    parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.get_context("fork").Process(target=_child, args=(child_conn, func, args, budget))
+    process.start()
+    # Otherwise the pipe stays open after the child dies, and we'd never notice
+    child_conn.close()
+
+    deadline = None if budget.seconds is None else perf_counter() + budget.seconds * WALL_CLOCK_FACTOR
+    outcome = Outcome()
+    try:
+        while True:
+            timeout = None if deadline is None else max(0, deadline - perf_counter())
+            if not parent_conn.poll(timeout):
+                outcome.breach = "time"
+                break
+            try:
+                kind, *message = parent_conn.recv()
+            except EOFError:
+                process.join()
+                # Killed at the hard CPU limit, or by the OOM killer
+                if process.exitcode in (-signal.SIGKILL, -signal.SIGXCPU):
+                    outcome.breach = "time" if budget.seconds is not None else "memory"
+                else:
+                    outcome.error = f"Exited with code {process.exitcode}"
+                break
+
+            if kind == "progress":
+                outcome.progress = message[0]
+                continue
+            value, outcome.progress = message
+            if kind == "done":
+                outcome.value = value
+            elif kind == "breach":
+                outcome.breach = value
+            else:
+                outcome.error = value
+            break
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        parent_conn.close()
+    return outcome
+
+
+def describe(outcome: Outcome, budget: Budget) -> str:
+    """Why a solve stopped, and how far it got, in one line."""
+    if outcome.breach == "time":
+        reason = f"Over its {budget.seconds:g}s time budget"
+    elif outcome.breach == "memory":
+        reason = f"Over its {budget.memory_mib}MiB memory budget"
+    else:
+        reason = outcome.error or "OK"
+    progress = outcome.progress
+    if not progress:
+        return reason
+    details = [f"{progress['cpu_ms'] / 1000:.1f}s CPU", f"{progress['peak_rss_mib']:.0f}MiB peak RSS"]
+    details += counters.format_snapshot(progress.get("counters", {}))
+    details += memo.format_snapshot(progress.get("memo", {}))
+    return f"{reason} ({', '.join(details)})"
+
+
+def _spin():
+    while True:
+        counters.count("spin")
+
+
+def _hoard():
+    hoard = []
+    while True:
+        hoard.append(bytearray(16 * MiB))
+
+
+def test_run_within_budget():
+    outcome = run_within(Budget(seconds=5, memory_mib=100), sum, [1, 2, 3])
+    assert outcome.ok and outcome.value == 6 and outcome.progress["ms"] >= 0
+
+    outcome = run_within(Budget(seconds=5), int, "x")
+    assert outcome.error == "ValueError: invalid literal for int() with base 10: 'x'"
+
+
+def test_run_over_budget():
+    with counters.recording():
+        outcome = run_within(Budget(seconds=0.3), _spin)
+    assert outcome.breach == "time"
+    # The last progress report, from before the watchdog killed it
+    assert outcome.progress["counters"]["spin"]["total"] > 0
+    assert describe(outcome, Budget(seconds=0.3)).startswith("Over its 0.3s time budget (")
+
+    outcome = run_within(Budget(seconds=5, memory_mib=64), _hoard)
+    assert outcome.breach == "memory"
+
+
+def test_budget_for():
+    class Module:
+        BUDGET = {2: Budget(seconds=5)}
+
+    budgets = {"12": Budget(memory_mib=100), "12/1": Budget(seconds=1)}
+    assert budget_for(Module, "12", 1, budgets) == Budget(seconds=1, memory_mib=100)
+    assert budget_for(Module, "12", 2, budgets) == Budget(seconds=5, memory_mib=100)
+    assert budget_for(Module, "13", 2, {}) == Budget(seconds=5, memory_mib=DEFAULT_BUDGET.memory_mib)
+
+    assert declares_budget(Module, "13", 2, {}) and declares_budget(Module, "12", 1, budgets)
+    assert not declares_budget(Module, "13", 1, {"13/2": Budget(seconds=1)})
@@ -0,0 +1,130 @@
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+CACHE_DIR = Path(__file__).parent.parent / ".cache"
+PARSE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Inputs smaller than this (i.e. test data) parse faster than a round trip to disk.
+PARSE_CACHE_MIN_INPUT_SIZE = 1024
+
+
+def sha256(data: str | bytes) -> str:
+    return hashlib.sha256(data.encode() if isinstance(data, str) else data).hexdigest()
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def evict(directory: Path, max_bytes: int):
+    """Deletes the least recently used files in a directory until it fits in `max_bytes`."""
+    entries = []
+    for path in directory.glob("*.pickle"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def parse_cache(func: Callable) -> Callable:
+    """
+    Caches a parser's output on disk, keyed by a hash of the input and of the parser's module and the local modules it
+    imports (which may define the classes it returns), so a parser only ever runs once for a given input and code. Set
+    AOC_PARSE_CACHE=0 to disable.
+
+    Each call unpickles a fresh copy, so solutions are free to mutate what they're given.
+    """
+
+    @functools.wraps(func)
+    def wrapper(file_contents: str, *args, **kwargs):
+        if os.environ.get("AOC_PARSE_CACHE") == "0" or len(file_contents) < PARSE_CACHE_MIN_INPUT_SIZE:
+            return func(file_contents, *args, **kwargs)
+
+        # Imported here as `answers` imports this module
+        from aoc import answers
+
+        code = f"{answers.code_hash(func.__module__)}:{func.__qualname__}"
+        key = sha256(f"{code}:{sha256(file_contents)}:{args!r}:{sorted(kwargs.items())!r}")
+        path = CACHE_DIR / "parsed" / f"{func.__module__}.{func.__qualname__}.{key[:32]}.pickle"
+
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+            os.utime(path)
+            return result
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # e.g. the pickle refers to a class that's since been renamed; just parse again.
+            path.unlink(missing_ok=True)
+
+        result = func(file_contents, *args, **kwargs)
+        atomic_write_bytes(path, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        evict(path.parent, PARSE_CACHE_MAX_BYTES)
+        return result
+
+    return wrapper
+
+
+@parse_cache
+def _parse_numbers(file_contents: str, sep: str = ",") -> list[int]:
+    _parse_numbers.calls += 1  # type: ignore[attr-defined]
+    return [int(n) for n in file_contents.split(sep)]
+
+
+def test_parse_cache(tmp_path, monkeypatch):
+    monkeypatch.setitem(globals(), "CACHE_DIR", tmp_path)
+    _parse_numbers.calls = 0  # type: ignore[attr-defined]
+    data = ",".join(str(n) for n in range(1000))
+
+    assert _parse_numbers(data) == list(range(1000))
+    assert _parse_numbers(data) == list(range(1000))
+    assert _parse_numbers.calls == 1  # type: ignore[attr-defined]
+
+    # Different arguments are cached separately
+    assert _parse_numbers(data.replace(",", ";"), sep=";") == list(range(1000))
+    assert _parse_numbers.calls == 2  # type: ignore[attr-defined]
+
+    # As is the output of different code, e.g. after editing a class the parser returns
+    from aoc import answers
+
+    monkeypatch.setattr(answers, "code_hash", lambda module_name: "edited")
+    assert _parse_numbers(data) == list(range(1000))
+    assert _parse_numbers.calls == 3  # type: ignore[attr-defined]
+
+    # Small inputs aren't worth caching
+    assert _parse_numbers("1,2") == [1, 2]
+    assert _parse_numbers("1,2") == [1, 2]
+    assert _parse_numbers.calls == 5  # type: ignore[attr-defined]
+    assert len(list((tmp_path / "parsed").glob("*.pickle"))) == 3
+
+
+def test_evict(tmp_path):
+    for i in range(5):
+        path = tmp_path / f"{i}.pickle"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (i, i))
+
+    evict(tmp_path, 250)
+    assert sorted(p.name for p in tmp_path.glob("*.pickle")) == ["3.pickle", "4.pickle"]
@@ -0,0 +1,132 @@
+import dataclasses
+import os
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Optional
+
+# Counts are added to their time series every this many increments, so hot loops don't build huge lists
+SAMPLE_EVERY = 1024
+
+
+@dataclasses.dataclass
+class Series:
+    total: int = 0
+    last: int = 0
+    max: Optional[int] = None
+    next_sample: int = SAMPLE_EVERY
+    # (ms since the counters were reset, value)
+    samples: list[tuple[float, int]] = dataclasses.field(default_factory=list)
+
+
+_series: dict[str, Series] = {}
+_start = perf_counter()
+
+
+def _noop(name: str, value: int = 1):
+    pass
+
+
+def _count(name: str, n: int = 1):
+    series = _series.get(name) or _series.setdefault(name, Series())
+    series.total += n
+    if series.total >= series.next_sample:
+        series.samples.append(((perf_counter() - _start) * 1000, series.total))
+        series.next_sample = series.total + SAMPLE_EVERY
+
+
+def _gauge(name: str, value: int):
+    series = _series.get(name) or _series.setdefault(name, Series())
+    series.total += 1
+    series.last = value
+    series.max = value if series.max is None else max(series.max, value)
+    series.samples.append(((perf_counter() - _start) * 1000, value))
+
+
+# Solutions call these through the module, e.g. `counters.count("queue_push")` or `counters.gauge("frontier", n)`, so
+# they can be swapped out at runtime. Disabled (unless AOC_COUNTERS=1) they're a function that does nothing.
+count = _noop
+gauge = _noop
+
+
+def enabled() -> bool:
+    return count is _count
+
+
+def reset():
+    global _start
+    _series.clear()
+    _start = perf_counter()
+
+
+def enable():
+    global count, gauge
+    count, gauge = _count, _gauge
+
+
+def disable():
+    global count, gauge
+    count, gauge = _noop, _noop
+
+
+@contextmanager
+def recording():
+    """Enables (and resets) the counters for the duration of the block, yielding a function to take a snapshot."""
+    was_enabled = enabled()
+    reset()
+    enable()
+    try:
+        yield snapshot
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def snapshot(series: bool = False) -> dict[str, dict]:
+    """
+    Counter totals, e.g. `{"queue_push": {"total": 1234}}`; gauges also have their `last` and `max` values and `total`
+    is the number of readings. Pass `series=True` to include the `(ms, value)` samples.
+    """
+    result: dict[str, dict] = {}
+    for name, s in sorted(_series.items()):
+        result[name] = {"total": s.total} if s.max is None else {"total": s.total, "last": s.last, "max": s.max}
+        if series:
+            # Include the final total, so a count's series always ends where it got to
+            samples = s.samples if s.max is not None else [*s.samples, ((perf_counter() - _start) * 1000, s.total)]
+            result[name]["series"] = samples
+    return result
+
+
+def format_snapshot(counts: dict[str, dict]) -> list[str]:
+    lines = []
+    for name, values in counts.items():
+        line = f"{name}: {values['total']:,}"
+        if "max" in values:
+            line += f" readings (last {values['last']:,}, max {values['max']:,})"
+        lines.append(line)
+    return lines
+
+
+if os.environ.get("AOC_COUNTERS") == "1":
+    enable()
+
+
+def test_counters():
+    with recording() as snap:
+        for i in range(SAMPLE_EVERY * 2 + 1):
+            count("push")
+        count("pop", 5)
+        gauge("frontier", 3)
+        gauge("frontier", 7)
+        gauge("frontier", 2)
+        counts = snap(series=True)
+
+    assert counts["push"]["total"] == SAMPLE_EVERY * 2 + 1
+    assert [value for _, value in counts["push"]["series"]] == [SAMPLE_EVERY, SAMPLE_EVERY * 2, SAMPLE_EVERY * 2 + 1]
+    assert counts["pop"]["total"] == 5
+    assert {k: v for k, v in counts["frontier"].items() if k != "series"} == {"total": 3, "last": 2, "max": 7}
+    assert [value for _, value in counts["frontier"]["series"]] == [3, 7, 2]
+
+    # Disabled again afterwards, so nothing more is recorded
+    assert not enabled()
+    count("push")
+    assert snapshot()["push"]["total"] == SAMPLE_EVERY * 2 + 1
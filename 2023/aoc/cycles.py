@@ -0,0 +1,155 @@
+import random
+from dataclasses import dataclass, field
+from typing import Callable, Hashable, Iterable, Optional, TypeVar
+
+State = TypeVar("State")
+
+
+@dataclass
+class Cycle:
+    """
+    The states after `start` steps and after `start + length` steps are the same, so from `start` on everything repeats
+    every `length` steps.
+    """
+
+    start: int
+    length: int
+    # The key of the state after each step, from 0 up to (not including) `start + length`, if they were kept
+    keys: Optional[list[Hashable]] = field(default=None, repr=False)
+
+    def equivalent_step(self, n: int) -> int:
+        """The first step whose state is the same as the state after `n` steps."""
+        return n if n < self.start else self.start + (n - self.start) % self.length
+
+    def key_at(self, n: int) -> Hashable:
+        if self.keys is None:
+            raise ValueError("This cycle was found without keeping keys")
+        return self.keys[self.equivalent_step(n)]
+
+
+class CycleFinder:
+    """
+    Finds a cycle by remembering the step at which every key was first seen. Feed it the key of each state in turn,
+    starting with the initial state; it returns the cycle as soon as a key repeats. Keys should be compact (e.g. bytes
+    or a tuple of ints), since every one is kept.
+    """
+
+    def __init__(self):
+        self.seen: dict[Hashable, int] = {}
+        self.keys: list[Hashable] = []
+        self.cycle: Optional[Cycle] = None
+
+    def see(self, key: Hashable) -> Optional[Cycle]:
+        if self.cycle is None:
+            if key in self.seen:
+                start = self.seen[key]
+                self.cycle = Cycle(start, len(self.keys) - start, self.keys)
+            else:
+                self.seen[key] = len(self.keys)
+                self.keys.append(key)
+        return self.cycle
+
+
+def extrapolate(state: State, step: Callable[[State], State], key: Callable[[State], Hashable], n: int) -> Hashable:
+    """
+    The key of the state after `n` steps, only stepping until the first repeated state. `step` can change the state in
+    place, but then `key` has to copy whatever it needs (e.g. `bytes(grid.data)`) and the state is left wherever the
+    stepping stopped; rebuild it from the key returned.
+    """
+    finder = CycleFinder()
+    finder.see(key(state))
+    for _ in range(n):
+        state = step(state)
+        if cycle := finder.see(key(state)):
+            return cycle.key_at(n)
+    return finder.keys[-1]
+
+
+def brent(initial: Callable[[], State], step: Callable[[State], State], key: Callable[[State], Hashable]) -> Cycle:
+    """
+    Brent's algorithm: finds a cycle keeping only two keys, not every one, at the cost of stepping from `initial()`
+    about three times as often. `initial` makes a fresh initial state each time it's called, so `step` can change the
+    state in place.
+    """
+    # Find the length by racing ahead, moving the marker up to the front every power of 2 steps
+    power = length = 1
+    hare = step(initial())
+    marker = key(initial())
+    while (hare_key := key(hare)) != marker:
+        if power == length:
+            marker, power, length = hare_key, power * 2, 0
+        hare = step(hare)
+        length += 1
+
+    # Then find the start: with one state `length` steps ahead of the other, they first match at the start of the cycle
+    tortoise, hare = initial(), initial()
+    for _ in range(length):
+        hare = step(hare)
+    start = 0
+    while key(tortoise) != key(hare):
+        tortoise, hare = step(tortoise), step(hare)
+        start += 1
+
+    return Cycle(start, length)
+
+
+class Zobrist:
+    """
+    Zobrist hashing: a state made of cells is hashed by XORing a random number for each (cell, value) in it, so changing
+    one cell only needs two XORs rather than rehashing everything. Use the hash as a key for states that change a few
+    cells per step. Different states can, very rarely, have the same hash.
+    """
+
+    def __init__(self, cells: int, values: Iterable[Hashable], seed: int = 0):
+        rng = random.Random(seed)
+        self.table = {value: [rng.getrandbits(64) for _ in range(cells)] for value in values}
+        self.hash = 0
+
+    def of(self, cells: Iterable[Hashable]) -> int:
+        """Resets the hash to that of a whole state, given each cell's value."""
+        self.hash = 0
+        for cell, value in enumerate(cells):
+            self.hash ^= self.table[value][cell]
+        return self.hash
+
+    def change(self, cell: int, old: Hashable, new: Hashable) -> int:
+        self.hash ^= self.table[old][cell] ^ self.table[new][cell]
+        return self.hash
+
+
+def _rho(x: int) -> int:
+    # 0 -> 1 -> 2 -> 5 -> 26 -> 677 -> 330 -> 901 -> 802 -> 205 -> 26 (start 4, length 6)
+    return (x * x + 1) % 1000
+
+
+def test_cycle_finders_agree():
+    cycle = brent(lambda: 0, _rho, key=lambda x: x)
+    assert (cycle.start, cycle.length) == (4, 6)
+
+    finder, x = CycleFinder(), 0
+    while not finder.see(x):
+        x = _rho(x)
+    assert finder.cycle is not None and (finder.cycle.start, finder.cycle.length) == (4, 6)
+
+    expected = 0
+    for n in range(30):
+        assert extrapolate(0, _rho, lambda x: x, n) == expected
+        assert finder.cycle.key_at(n) == expected
+        expected = _rho(expected)
+
+
+def test_extrapolate_in_place():
+    def step(state: list[int]) -> list[int]:
+        state.append(state.pop(0))
+        return state
+
+    assert extrapolate([1, 2, 3], step, key=tuple, n=10**9 + 1) == (3, 1, 2)
+
+
+def test_zobrist():
+    zobrist = Zobrist(3, "abc")
+    start = zobrist.of("abc")
+    zobrist.change(1, "b", "c")
+    assert zobrist.hash == Zobrist(3, "abc").of("acc") != start
+    zobrist.change(1, "c", "b")
+    assert zobrist.hash == start
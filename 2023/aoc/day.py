@@ -0,0 +1,111 @@
+import dataclasses
+import functools
+from typing import Any, Callable
+
+from helpers import call_part
+
+
+def _unparsed(file_contents: str) -> str:
+    return file_contents
+
+
+@dataclasses.dataclass(frozen=True)
+class Day:
+    """
+    A day split into phases, declared by a day module as `DAY = Day(...)`: `parse` the input once, then solve each part
+    from what it returned. Parts take `(parsed)` or `(parsed, shared)`, where `shared` is a dict either part can leave
+    results in for the other, e.g. day 10's loop, which both parts need. A part can't rely on the other having run
+    first, and mustn't change `parsed`.
+    """
+
+    part1: Callable[..., Any]
+    part2: Callable[..., Any]
+    parse: Callable[[str], Any] = _unparsed
+
+    def solve(self, part: int, parsed: Any, shared: dict) -> Any:
+        func = self.part1 if part == 1 else self.part2
+        return func(parsed, shared) if _takes_shared(func) else func(parsed)
+
+    def run(self, file_contents: str, part: int) -> Any:
+        """Parses and solves one part from scratch."""
+        return DayRun(self, file_contents).solve(part)
+
+
+@functools.cache
+def _takes_shared(func: Callable) -> bool:
+    import inspect
+
+    return len(inspect.signature(func).parameters) > 1
+
+
+def declares_day(module) -> bool:
+    return isinstance(getattr(module, "DAY", None), Day)
+
+
+def load(module) -> Day:
+    """
+    A day module's `DAY`. Modules without one, whose `part1`/`part2` do their own parsing, get a Day that passes them
+    the input as it is, so everything can be run the same way.
+    """
+    if declares_day(module):
+        return module.DAY
+    return Day(
+        part1=functools.partial(call_part, module.part1),
+        part2=functools.partial(call_part, module.part2),
+    )
+
+
+class DayRun:
+    """Solves the parts of a day for one input, parsing it at most once and sharing `shared` between the parts."""
+
+    def __init__(self, day: Day, file_contents: str):
+        self.day = day
+        self.file_contents = file_contents
+        self.shared: dict = {}
+        self.is_parsed = False
+        self._parsed: Any = None
+
+    def parsed(self) -> Any:
+        if not self.is_parsed:
+            self._parsed = self.day.parse(self.file_contents)
+            self.is_parsed = True
+        return self._parsed
+
+    def solve(self, part: int) -> Any:
+        return self.day.solve(part, self.parsed(), self.shared)
+
+
+def test_day_run_parses_once():
+    calls = []
+
+    def parse(file_contents: str) -> list[int]:
+        calls.append("parse")
+        return [int(x) for x in file_contents.split()]
+
+    def total(numbers: list[int], shared: dict) -> int:
+        calls.append("total")
+        shared["total"] = sum(numbers)
+        return shared["total"]
+
+    def mean(numbers: list[int], shared: dict) -> float:
+        return (shared["total"] if "total" in shared else total(numbers, shared)) / len(numbers)
+
+    day = Day(parse=parse, part1=total, part2=mean)
+    run = DayRun(day, "1 2 3 6")
+    assert (run.solve(1), run.solve(2)) == (12, 3)
+    assert calls == ["parse", "total"]
+
+    assert day.run("1 2 3 6", 2) == 3 and calls[2:] == ["parse", "total"]
+    assert Day(part1=len, part2=str.upper).run("abc", 2) == "ABC"
+
+
+def test_load_adapts_legacy_modules():
+    import day_01
+    import day_09
+
+    # Under pytest this file is also imported as `day`, with its own Day class; use the one the days import
+    from aoc.day import declares_day, load
+
+    assert not declares_day(day_09)
+    assert load(day_09).run("0 3 6 9 12 15\n1 3 6 10 15 21\n10 13 16 21 30 45\n", 1) == 114
+    assert load(day_01) is day_01.DAY
@@ -34,3 +34,69 @@ class t(tuple):
 
     def __rfloordiv__(self, other):
         return self // other
+
+
+_tuple_new = tuple.__new__
+
+
+class Point(tuple):
+    """
+    A 2D `t`: the same operators, but written out for two coordinates rather than zipping, so it's a few times faster.
+    Like `t`, it's still a tuple, so it hashes and compares equal to a plain `(x, y)`.
+
+    For the very hottest loops, `to_complex`/`from_complex` convert to complex numbers, whose `+` and `-` are builtin.
+    """
+
+    __slots__ = ()
+
+    def __add__(self, other):
+        return _tuple_new(Point, (self[0] + other[0], self[1] + other[1]))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return _tuple_new(Point, (self[0] - other[0], self[1] - other[1]))
+
+    def __rsub__(self, other):
+        return _tuple_new(Point, (other[0] - self[0], other[1] - self[1]))
+
+    def __neg__(self):
+        return _tuple_new(Point, (-self[0], -self[1]))
+
+    def __mul__(self, other):
+        if isinstance(other, int):
+            return _tuple_new(Point, (self[0] * other, self[1] * other))
+        return _tuple_new(Point, (self[0] * other[0], self[1] * other[1]))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, int):
+            return _tuple_new(Point, (self[0] / other, self[1] / other))
+        return _tuple_new(Point, (self[0] / other[0], self[1] / other[1]))
+
+    def __floordiv__(self, other):
+        if isinstance(other, int):
+            return _tuple_new(Point, (self[0] // other, self[1] // other))
+        return _tuple_new(Point, (self[0] // other[0], self[1] // other[1]))
+
+
+def to_complex(coord: tuple[int, int]) -> complex:
+    return complex(coord[0], coord[1])
+
+
+def from_complex(c: complex) -> Point:
+    return Point((int(c.real), int(c.imag)))
+
+
+def test_point():
+    a, b = Point((1, 2)), Point((3, -4))
+    assert a + b == (4, -2) and isinstance(a + b, Point)
+    assert (3, -4) + a == (4, -2) and isinstance((3, -4) + a, Point)
+    assert a - b == (-2, 6) and (3, -4) - a == (2, -6) and -a == (-1, -2)
+    assert a * 3 == 3 * a == (3, 6) and a * b == (3, -8)
+    assert b // 2 == (1, -2) and b / 2 == (1.5, -2.0)
+    assert {(1, 2): "x"}[a] == "x" and a == t((1, 2))
+    x, y = a
+    assert (x, y) == (1, 2)
+    assert from_complex(to_complex(b) + to_complex(a)) == a + b
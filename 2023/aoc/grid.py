@@ -0,0 +1,209 @@
+from typing import Iterator, Optional
+
+
+class Grid:
+    """
+    A rectangular grid of characters, stored as the bytes of the input itself: row x starts at `x * stride` in `data`,
+    and each row is followed by its newline, so stepping off the end of a row lands on a newline rather than the next
+    row. Cells can be read by coordinate (`grid[x, y]`, as a str) or by flat index (`grid.data[i]`, as an int).
+
+    Transposed and reversed grids are views over the same bytes, so writes through a view are seen by the original.
+    With `pad` set, reading a coordinate outside the grid returns `pad` instead of raising IndexError.
+    """
+
+    __slots__ = ("data", "height", "width", "stride", "offset", "row_step", "col_step", "pad")
+
+    def __init__(
+        self,
+        data: bytearray,
+        height: int,
+        width: int,
+        stride: int,
+        offset: int = 0,
+        row_step: Optional[int] = None,
+        col_step: int = 1,
+        pad: Optional[str] = None,
+    ):
+        self.data = data
+        self.height = height
+        self.width = width
+        self.stride = stride
+        self.offset = offset
+        self.row_step = stride if row_step is None else row_step
+        self.col_step = col_step
+        self.pad = pad
+
+    @classmethod
+    def parse(cls, file_contents: str, pad: Optional[str] = None) -> "Grid":
+        text = file_contents.strip()
+        if " " in text or "\r" in text:
+            # e.g. indented test data
+            text = "\n".join(line.strip() for line in text.splitlines())
+        data = bytearray(text, "ascii")
+        width = data.find(b"\n")
+        if width == -1:
+            width = len(data)
+        height, remainder = divmod(len(data) + 1, width + 1)
+        if remainder:
+            raise ValueError("Every row of a grid must be the same length")
+        return cls(data, height, width, width + 1, pad=pad)
+
+    def _view(self, **changes) -> "Grid":
+        attrs = {name: getattr(self, name) for name in self.__slots__}
+        return Grid(**{**attrs, **changes})
+
+    def index(self, x: int, y: int) -> int:
+        return self.offset + x * self.row_step + y * self.col_step
+
+    def coord(self, i: int) -> tuple[int, int]:
+        """The coordinate of a flat index, i.e. the inverse of `index`."""
+        # One of the steps is +/-1 and the other +/-stride; work out the multiples of each, then which is the row.
+        row_major = abs(self.row_step) > abs(self.col_step)
+        big, small = (self.row_step, self.col_step) if row_major else (self.col_step, self.row_step)
+        rel = (i - self.offset) * (1 if big > 0 else -1)
+        if (big > 0) == (small > 0):
+            a, b = divmod(rel, self.stride)
+        else:
+            a = -(-rel // self.stride)
+            b = a * self.stride - rel
+        return (a, b) if row_major else (b, a)
+
+    def __contains__(self, coord: tuple[int, int]) -> bool:
+        return 0 <= coord[0] < self.height and 0 <= coord[1] < self.width
+
+    def __getitem__(self, coord: tuple[int, int]) -> str:
+        x, y = coord
+        if 0 <= x < self.height and 0 <= y < self.width:
+            return chr(self.data[self.offset + x * self.row_step + y * self.col_step])
+        if self.pad is not None:
+            return self.pad
+        raise IndexError(coord)
+
+    def __setitem__(self, coord: tuple[int, int], char: str):
+        if coord not in self:
+            raise IndexError(coord)
+        self.data[self.index(*coord)] = ord(char)
+
+    def get(self, coord: tuple[int, int], default: Optional[str] = None) -> Optional[str]:
+        return self[coord] if coord in self else default
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __str__(self) -> str:
+        return "\n".join(row.tobytes().decode() for row in self.rows())
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Grid) and list(self.rows()) == list(other.rows())
+
+    def row(self, x: int) -> memoryview:
+        start = self.offset + x * self.row_step
+        stop = start + self.width * self.col_step
+        # A negative stop would count from the end
+        return memoryview(self.data)[start : stop if stop >= 0 else None : self.col_step]
+
+    def rows(self) -> Iterator[memoryview]:
+        return (self.row(x) for x in range(self.height))
+
+    def columns(self) -> Iterator[memoryview]:
+        return self.transpose().rows()
+
+    def coords(self) -> Iterator[tuple[int, int]]:
+        return ((x, y) for x in range(self.height) for y in range(self.width))
+
+    def indices(self) -> Iterator[int]:
+        """Flat indices of every cell, row by row."""
+        return (
+            self.offset + x * self.row_step + y * self.col_step for x in range(self.height) for y in range(self.width)
+        )
+
+    def neighbours(self, i: int) -> Iterator[int]:
+        """Flat indices of the cells above, below, left and right of a flat index, if they're in the grid."""
+        x, y = self.coord(i)
+        if x > 0:
+            yield i - self.row_step
+        if x < self.height - 1:
+            yield i + self.row_step
+        if y > 0:
+            yield i - self.col_step
+        if y < self.width - 1:
+            yield i + self.col_step
+
+    def find(self, char: str) -> Optional[tuple[int, int]]:
+        i = self.data.find(ord(char))
+        return None if i == -1 else self.coord(i)
+
+    def count(self, char: str) -> int:
+        return self.data.count(ord(char))
+
+    def transpose(self) -> "Grid":
+        return self._view(height=self.width, width=self.height, row_step=self.col_step, col_step=self.row_step)
+
+    def flip_rows(self) -> "Grid":
+        """Upside down: the last row first."""
+        return self._view(offset=self.offset + (self.height - 1) * self.row_step, row_step=-self.row_step)
+
+    def flip_columns(self) -> "Grid":
+        """Mirrored left to right: the last column first."""
+        return self._view(offset=self.offset + (self.width - 1) * self.col_step, col_step=-self.col_step)
+
+    def copy(self) -> "Grid":
+        """A view like this one over a copy of the bytes."""
+        return self._view(data=bytearray(self.data))
+
+
+test_data = """
+#.S
+..#
+"""
+
+
+def test_parse_and_index():
+    grid = Grid.parse(test_data)
+    assert (grid.height, grid.width) == (2, 3)
+    assert grid[0, 2] == "S" and grid[1, 2] == "#"
+    assert grid.find("S") == (0, 2)
+    assert grid.count("#") == 2
+    assert [grid.coord(i) for i in grid.indices()] == list(grid.coords())
+    assert str(grid) == test_data.strip()
+    assert Grid.parse("  #.S\n  ..#\n") == grid
+
+
+def test_bounds_and_padding():
+    import pytest
+
+    grid = Grid.parse(test_data)
+    assert (2, 0) not in grid and grid.get((-1, 0)) is None
+    with pytest.raises(IndexError):
+        grid[0, 3]
+    assert Grid.parse(test_data, pad=".")[0, 3] == "."
+    with pytest.raises(ValueError):
+        Grid.parse("ab\nc")
+
+
+def test_views():
+    grid = Grid.parse(test_data)
+    assert str(grid.transpose()) == "#.\n..\nS#"
+    assert str(grid.flip_rows()) == "..#\n#.S"
+    assert str(grid.flip_columns()) == "S.#\n#.."
+    assert str(grid.transpose().flip_columns()) == ".#\n..\n#S"
+    assert list(grid.columns())[2].tobytes() == b"S#"
+
+    for view in (grid.transpose(), grid.flip_rows(), grid.flip_columns(), grid.transpose().flip_rows().flip_columns()):
+        assert [view.coord(i) for i in view.indices()] == list(view.coords())
+        assert [view[c] for c in view.coords()] == [chr(grid.data[i]) for i in view.indices()]
+
+    # Views share the original's bytes
+    grid.transpose()[2, 1] = "O"
+    assert grid[1, 2] == "O"
+    copy = grid.copy()
+    copy[0, 0] = "."
+    assert grid[0, 0] == "#"
+
+
+def test_neighbours():
+    grid = Grid.parse(test_data)
+    assert sorted(grid.coord(i) for i in grid.neighbours(grid.index(0, 0))) == [(0, 1), (1, 0)]
+    assert sorted(grid.coord(i) for i in grid.neighbours(grid.index(1, 1))) == [(0, 1), (1, 0), (1, 2)]
+    view = grid.transpose().flip_rows()
+    assert sorted(view.coord(i) for i in view.neighbours(view.index(2, 1))) == [(1, 1), (2, 0)]
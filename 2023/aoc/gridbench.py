@@ -0,0 +1,126 @@
+import argparse
+import tracemalloc
+from time import perf_counter
+from typing import Any, Callable
+
+from aoc.grid import Grid
+from aoc.synthetic import GENERATORS
+from helpers import parse_grid
+
+
+def parse_dict(file_contents: str) -> dict[tuple[int, int], str]:
+    return {(x, y): c for x, line in enumerate(file_contents.strip().splitlines()) for y, c in enumerate(line)}
+
+
+def scan_lists(grid: list[list[str]]) -> int:
+    return sum(1 for row in grid for c in row if c == "#")
+
+
+def scan_dict(grid: dict[tuple[int, int], str]) -> int:
+    return sum(1 for c in grid.values() if c == "#")
+
+
+def scan_grid(grid: Grid) -> int:
+    return grid.count("#")
+
+
+def neighbours_lists(grid: list[list[str]]) -> int:
+    total, height, width = 0, len(grid), len(grid[0])
+    for x in range(height):
+        for y in range(width):
+            for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if 0 <= nx < height and 0 <= ny < width and grid[nx][ny] == "#":
+                    total += 1
+    return total
+
+
+def neighbours_dict(grid: dict[tuple[int, int], str]) -> int:
+    total = 0
+    for x, y in grid:
+        for coord in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if grid.get(coord) == "#":
+                total += 1
+    return total
+
+
+def neighbours_grid(grid: Grid) -> int:
+    total, data, size, rock = 0, grid.data, len(grid.data), ord("#")
+    steps = (-grid.stride, grid.stride, -1, 1)
+    for i in grid.indices():
+        for step in steps:
+            # Newlines are never "#", so only the ends of the grid need checking
+            if 0 <= i + step < size and data[i + step] == rock:
+                total += 1
+    return total
+
+
+REPRESENTATIONS: dict[str, tuple[Callable[[str], Any], Callable[[Any], int], Callable[[Any], int]]] = {
+    "list of lists": (parse_grid, scan_lists, neighbours_lists),
+    "dict by (x, y)": (parse_dict, scan_dict, neighbours_dict),
+    "Grid": (Grid.parse, scan_grid, neighbours_grid),
+}
+
+
+def best_ms(func: Callable, arg: Any, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func(arg)
+        timings.append((perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def compare(file_contents: str, repeat: int = 5) -> list[dict]:
+    """Memory held by each representation of a grid, and how long it takes to build, scan and walk neighbours."""
+    results = []
+    for name, (parse, scan, neighbours) in REPRESENTATIONS.items():
+        tracemalloc.start()
+        try:
+            grid = parse(file_contents)
+            memory = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        results.append(
+            {
+                "representation": name,
+                "memory_bytes": memory,
+                "parse_ms": best_ms(parse, file_contents, repeat),
+                "scan_ms": best_ms(scan, grid, repeat),
+                "neighbours_ms": best_ms(neighbours, grid, repeat),
+                # Every representation should agree on what's in the grid
+                "checks": (scan(grid), neighbours(grid)),
+            }
+        )
+    return results
+
+
+def main(argv: list[str]):
+    from rich.console import Console
+    from rich.table import Table
+
+    parser = argparse.ArgumentParser(
+        prog="run.py bench-grid", description="Compare grid representations on a synthetic input."
+    )
+    parser.add_argument("--size", type=int, default=141, help="Side of the grid (default: the size of real inputs)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed calls per operation (the fastest is used)")
+    args = parser.parse_args(argv)
+
+    results = compare(GENERATORS["14"](args.size), repeat=args.repeat)
+    table = Table("Representation", "Memory (KiB)", "Parse (ms)", "Scan (ms)", "Neighbours (ms)")
+    for result in results:
+        table.add_row(
+            result["representation"],
+            f"{result['memory_bytes'] / 1024:.1f}",
+            f"{result['parse_ms']:.3f}",
+            f"{result['scan_ms']:.3f}",
+            f"{result['neighbours_ms']:.3f}",
+        )
+    Console().print(table)
+
+
+def test_compare():
+    results = compare(GENERATORS["14"](20), repeat=1)
+    assert [r["representation"] for r in results] == list(REPRESENTATIONS)
+    assert len({r["checks"] for r in results}) == 1
+    assert results[-1]["memory_bytes"] < results[0]["memory_bytes"]
@@ -0,0 +1,209 @@
+import functools
+import os
+
+from aoc.grid import Grid
+from aoc.testing import parametrize
+
+ROUND, CUBE, EMPTY, NEWLINE = map(ord, "O#.\n")
+
+# Below this many cells, the cost of setting up NumPy arrays outweighs what they save.
+NUMPY_MIN_CELLS = 1024
+
+
+@functools.cache
+def numpy():
+    """NumPy if it's installed (and not disabled with AOC_NUMPY=0), otherwise None. Imported on first use."""
+    if os.environ.get("AOC_NUMPY") == "0":
+        return None
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def use_numpy(grid: Grid) -> bool:
+    return grid.height * grid.width >= NUMPY_MIN_CELLS and numpy() is not None
+
+
+def as_array(grid: Grid):
+    """A (height, width) uint8 array over the grid's bytes, so writes to it change the grid (and its views)."""
+    np = numpy()
+    flat = np.frombuffer(grid.data, dtype=np.uint8)
+    return np.lib.stride_tricks.as_strided(
+        flat[grid.offset :], shape=(grid.height, grid.width), strides=(grid.row_step, grid.col_step)
+    )
+
+
+def _empty_rows_python(grid: Grid, char: str) -> list[int]:
+    code = ord(char)
+    return [x for x, row in enumerate(grid.rows()) if code not in row]
+
+
+def _empty_rows_numpy(grid: Grid, char: str) -> list[int]:
+    np = numpy()
+    return np.flatnonzero(~(as_array(grid) == ord(char)).any(axis=1)).tolist()
+
+
+def empty_rows(grid: Grid, char: str) -> list[int]:
+    """Rows without any `char` in them."""
+    return _empty_rows_numpy(grid, char) if use_numpy(grid) else _empty_rows_python(grid, char)
+
+
+def empty_columns(grid: Grid, char: str) -> list[int]:
+    return empty_rows(grid.transpose(), char)
+
+
+def _neighbour_mask_python(grid: Grid, codes: frozenset[int]) -> bytearray:
+    data, size = grid.data, len(grid.data)
+    mask = bytearray(size)
+    offsets = [dx * grid.stride + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+    for i, c in enumerate(data):
+        if c in codes:
+            for offset in offsets:
+                if 0 <= i + offset < size and data[i + offset] != NEWLINE:
+                    mask[i + offset] = 1
+    return mask
+
+
+def _neighbour_mask_numpy(grid: Grid, codes: frozenset[int]) -> bytearray:
+    np = numpy()
+    matches = np.isin(as_array(grid), list(codes))
+    # OR together the matches shifted one cell in each of the 8 directions
+    padded = np.pad(matches, 1)
+    height, width = matches.shape
+    near = np.zeros_like(matches)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            if dx or dy:
+                near |= padded[1 + dx : 1 + dx + height, 1 + dy : 1 + dy + width]
+
+    mask = np.zeros((height, grid.stride), dtype=np.uint8)
+    mask[:, :width] = near
+    return bytearray(mask.reshape(-1)[: len(grid.data)].tobytes())
+
+
+def neighbour_mask(grid: Grid, chars: str) -> bytearray:
+    """
+    Flags (with 1s, indexed like `grid.data`) every cell next to, including diagonally, any of `chars`. Only for grids
+    fresh from `Grid.parse`, not views of them.
+    """
+    codes = frozenset(map(ord, chars))
+    return _neighbour_mask_numpy(grid, codes) if use_numpy(grid) else _neighbour_mask_python(grid, codes)
+
+
+def _mirror_differences_python(grid: Grid, limit: int) -> list[int]:
+    rows = [row.tobytes() for row in grid.rows()]
+    differences = []
+    for i in range(grid.height - 1):
+        total = 0
+        for r1, r2 in zip(rows[i::-1], rows[i + 1 :]):
+            total += sum(a != b for a, b in zip(r1, r2))
+            if total > limit:
+                break
+        differences.append(min(total, limit + 1))
+    return differences
+
+
+def _mirror_differences_numpy(grid: Grid, limit: int) -> list[int]:
+    array = as_array(grid)
+    differences = []
+    for i in range(grid.height - 1):
+        k = min(i + 1, grid.height - i - 1)
+        total = int((array[i - k + 1 : i + 1][::-1] != array[i + 1 : i + 1 + k]).sum())
+        differences.append(min(total, limit + 1))
+    return differences
+
+
+def mirror_differences(grid: Grid, limit: int) -> list[int]:
+    """
+    For a mirror between each row `i` and `i + 1`, how many cells differ from their reflection (ignoring rows reflected
+    off the edge of the grid). Counts stop at `limit + 1`, i.e. "more than `limit`".
+    """
+    return _mirror_differences_numpy(grid, limit) if use_numpy(grid) else _mirror_differences_python(grid, limit)
+
+
+def _tilt_python(grid: Grid):
+    data, row_step = grid.data, grid.row_step
+    for col in range(grid.width):
+        i = slot = grid.index(0, col)
+        for _ in range(grid.height):
+            if data[i] == ROUND:
+                data[i] = EMPTY
+                data[slot] = ROUND
+                slot += row_step
+            elif data[i] == CUBE:
+                slot = i + row_step
+            i += row_step
+
+
+def _tilt_numpy(grid: Grid):
+    np = numpy()
+    array = as_array(grid)
+    cube, rounded = array == CUBE, array == ROUND
+    # Each cube starts a new segment of its column. Sorting every column by (segment, cube then round then empty) puts
+    # each segment's cube first, then its round rocks, then the empty spaces: exactly where the rocks roll to.
+    keys = np.cumsum(cube, axis=0) * 3 + np.where(cube, 0, np.where(rounded, 1, 2))
+    keys.sort(axis=0)
+    array[:] = np.choose(keys % 3, [CUBE, ROUND, EMPTY])
+
+
+def tilt(grid: Grid) -> Grid:
+    """
+    Rolls every round rock (O) towards row 0 until it hits a cube rock (#), in a grid of only O, # and `.`. Tilt a view
+    to roll another way.
+    """
+    if use_numpy(grid):
+        _tilt_numpy(grid)
+    else:
+        _tilt_python(grid)
+    return grid
+
+
+def _random_grid(seed: int, chars: str, size: int = 40) -> Grid:
+    import random
+
+    rng = random.Random(seed)
+    rows = ["".join(rng.choice(chars) for _ in range(size + seed % 3)) for _ in range(size)]
+    # Make a few rows/columns empty, and a few rows mirror images of each other
+    for x in rng.sample(range(size), 3):
+        rows[x] = "." * len(rows[x])
+    rows[5:10] = rows[9:4:-1]
+    return Grid.parse("\n".join(rows))
+
+
+@parametrize("seed", range(5))
+def test_numpy_matches_python(seed):
+    import pytest
+
+    if numpy() is None:
+        pytest.skip("NumPy isn't installed")
+
+    grid = _random_grid(seed, "....#O*$")
+    views = [grid, grid.transpose(), grid.flip_rows(), grid.transpose().flip_rows()]
+    for view in views:
+        assert _empty_rows_numpy(view, "#") == _empty_rows_python(view, "#")
+        for limit in (0, 1, 10_000):
+            assert _mirror_differences_numpy(view, limit) == _mirror_differences_python(view, limit)
+
+    codes = frozenset(map(ord, "*$"))
+    assert _neighbour_mask_numpy(grid, codes) == _neighbour_mask_python(grid, codes)
+
+    grid = _random_grid(seed, "..#O")
+    for view in [grid, grid.transpose(), grid.flip_rows(), grid.transpose().flip_rows()]:
+        expected = view.copy()
+        _tilt_python(expected)
+        _tilt_numpy(view)
+        assert view == expected
+
+
+def test_kernels():
+    grid = Grid.parse("O.#\n...\n.O.\nO#O")
+    assert empty_rows(grid, "O") == [1] and empty_columns(grid, "#") == [0]
+    assert str(tilt(grid)) == "OO#\nO.O\n...\n.#."
+    assert mirror_differences(Grid.parse("#.\n..\n..\n#."), limit=5) == [1, 0, 1]
+    assert mirror_differences(Grid.parse("##\n..\n..\n##"), limit=1) == [2, 0, 2]
+
+    grid = Grid.parse("*..\n...\n..$")
+    assert [grid.coord(i) for i, flag in enumerate(neighbour_mask(grid, "*")) if flag] == [(0, 1), (1, 0), (1, 1)]
+    assert neighbour_mask(grid, "$")[grid.index(0, 3)] == 0  # the newline after row 0
@@ -0,0 +1,268 @@
+import argparse
+import dataclasses
+import datetime
+import functools
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+from pathlib import Path
+from typing import Iterable, Optional
+
+HISTORY_DB = Path(__file__).parent.parent / "history.db"
+
+# A result is a regression if it's slower than the median of the `WINDOW` runs before it by more than `SIGMAS` times
+# their (robust) standard deviation, and by at least `MIN_SLOWDOWN` of the median, so tiny timings aren't flagged for
+# being a few microseconds out. There have to be `MIN_RUNS` earlier runs to compare against.
+WINDOW = 10
+MIN_RUNS = 3
+SIGMAS = 3.0
+MIN_SLOWDOWN = 0.1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    source TEXT NOT NULL,
+    day TEXT NOT NULL,
+    part INTEGER NOT NULL,
+    variant TEXT NOT NULL,
+    git_revision TEXT,
+    input_hash TEXT NOT NULL,
+    python TEXT NOT NULL,
+    wall_ms REAL NOT NULL,
+    cpu_ms REAL,
+    peak_rss_kib INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_by_day ON runs (day, part, variant);
+"""
+COLUMNS = [
+    "timestamp",
+    "source",
+    "day",
+    "part",
+    "variant",
+    "git_revision",
+    "input_hash",
+    "python",
+    "wall_ms",
+    "cpu_ms",
+    "peak_rss_kib",
+]
+
+
+def enabled() -> bool:
+    return os.environ.get("AOC_HISTORY") != "0"
+
+
+@functools.cache
+def git_revision() -> Optional[str]:
+    from aoc.bench import git_revision
+
+    return git_revision()
+
+
+def connect(path: Path = HISTORY_DB) -> sqlite3.Connection:
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def record(results: Iterable[dict], source: str, path: Path = HISTORY_DB):
+    """
+    Appends results to the history. Each has a `day`, `part`, `variant` (e.g. "part1_quadratic"), `input_hash`,
+    `wall_ms`, and optionally `cpu_ms` and `peak_rss_kib`; where and when it ran are filled in.
+    """
+    if not enabled():
+        return
+    common = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "source": source,
+        "git_revision": git_revision(),
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+    }
+    rows = [{"cpu_ms": None, "peak_rss_kib": None, **result, **common} for result in results]
+    with connect(path) as connection:
+        connection.executemany(f"INSERT INTO runs ({', '.join(COLUMNS)}) VALUES (:{', :'.join(COLUMNS)})", rows)
+    connection.close()
+
+
+@dataclasses.dataclass
+class Regression:
+    day: str
+    part: int
+    variant: str
+    source: str
+    git_revision: Optional[str]
+    ms: float
+    baseline_ms: float
+    threshold_ms: float
+
+
+def find_regressions(
+    connection: sqlite3.Connection,
+    days: Optional[list[str]] = None,
+    window: int = WINDOW,
+    sigmas: float = SIGMAS,
+) -> list[Regression]:
+    """
+    Compares each day/part/variant's latest run with the `window` runs before it from the same source (e.g. "bench"
+    times warm, repeated calls), on the same input and interpreter.
+    """
+    runs: dict[tuple, list[sqlite3.Row]] = {}
+    for row in connection.execute("SELECT * FROM runs ORDER BY id"):
+        if not days or row["day"] in days:
+            key = (row["day"], row["part"], row["variant"], row["source"], row["input_hash"], row["python"])
+            runs.setdefault(key, []).append(row)
+
+    latest: dict[tuple, list[sqlite3.Row]] = {}
+    for key, rows in runs.items():
+        # Only the input and interpreter that were used most recently
+        if key[:4] not in latest or rows[-1]["id"] > latest[key[:4]][-1]["id"]:
+            latest[key[:4]] = rows
+
+    regressions = []
+    for (day, part, variant, source), rows in sorted(latest.items()):
+        *earlier, last = rows
+        baseline = [row["wall_ms"] for row in earlier[-window:]]
+        if len(baseline) < MIN_RUNS:
+            continue
+        median = statistics.median(baseline)
+        # The median absolute deviation, scaled to estimate the standard deviation, so one outlier doesn't widen it
+        spread = 1.4826 * statistics.median(abs(ms - median) for ms in baseline)
+        threshold = median + max(sigmas * spread, MIN_SLOWDOWN * median)
+        if last["wall_ms"] > threshold:
+            regressions.append(
+                Regression(day, part, variant, source, last["git_revision"], last["wall_ms"], median, threshold)
+            )
+    return regressions
+
+
+def trend(connection: sqlite3.Connection, day: str) -> list[dict]:
+    """A day's median timings at each git revision, in the order the revisions were first run."""
+    groups: dict[tuple, list[sqlite3.Row]] = {}
+    for row in connection.execute("SELECT * FROM runs WHERE day = ? ORDER BY id", (day,)):
+        groups.setdefault((row["git_revision"], row["part"], row["variant"], row["source"]), []).append(row)
+
+    def median(rows: list[sqlite3.Row], column: str) -> Optional[float]:
+        values = [row[column] for row in rows if row[column] is not None]
+        return statistics.median(values) if values else None
+
+    return [
+        {
+            "git_revision": revision,
+            "part": part,
+            "variant": variant,
+            "source": source,
+            "runs": len(rows),
+            "first_run": rows[0]["timestamp"],
+            "wall_ms": median(rows, "wall_ms"),
+            "cpu_ms": median(rows, "cpu_ms"),
+            "peak_rss_kib": max((row["peak_rss_kib"] for row in rows if row["peak_rss_kib"] is not None), default=None),
+        }
+        for (revision, part, variant, source), rows in groups.items()
+    ]
+
+
+def print_regressions(regressions: list[Regression]):
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(
+        "Day",
+        "Part",
+        "Variant",
+        "Source",
+        "Revision",
+        "Took (ms)",
+        "Baseline (ms)",
+        "Threshold (ms)",
+        title="Regressions",
+    )
+    for r in regressions:
+        table.add_row(
+            r.day,
+            str(r.part),
+            r.variant,
+            r.source,
+            (r.git_revision or "-")[:8],
+            f"{r.ms:.3f}",
+            f"{r.baseline_ms:.3f}",
+            f"{r.threshold_ms:.3f}",
+        )
+    Console().print(table)
+
+
+def print_trend(rows: list[dict], day: str):
+    from rich.console import Console
+    from rich.table import Table
+
+    columns = ["Revision", "First run", "Part", "Variant", "Source", "Runs", "Wall (ms)", "CPU (ms)", "Peak RSS (MiB)"]
+    table = Table(*columns, title=f"Day {day}")
+    for row in rows:
+        table.add_row(
+            (row["git_revision"] or "-")[:8],
+            row["first_run"][:19],
+            str(row["part"]),
+            row["variant"],
+            row["source"],
+            str(row["runs"]),
+            f"{row['wall_ms']:.3f}",
+            f"{row['cpu_ms']:.3f}" if row["cpu_ms"] is not None else "-",
+            f"{row['peak_rss_kib'] / 1024:.1f}" if row["peak_rss_kib"] is not None else "-",
+        )
+    Console().print(table)
+
+
+def main(argv: list[str]):
+    parser = argparse.ArgumentParser(
+        prog="run.py regressions", description="Flag days that got slower, from the timing history."
+    )
+    parser.add_argument("days", nargs="*", help="Days to check, e.g. 05 17 (default: all)")
+    parser.add_argument("--window", type=int, default=WINDOW, help="Earlier runs to compare the latest run with")
+    parser.add_argument("--sigmas", type=float, default=SIGMAS, help="How far out (in standard deviations) is slower")
+    parser.add_argument("--trend", metavar="DAY", help="Show a day's timings at each git revision instead")
+    args = parser.parse_args(argv)
+
+    if not HISTORY_DB.exists():
+        print(f"No timing history yet ({HISTORY_DB.name} is written by ./run.py, --all and bench)")
+        return
+
+    connection = connect()
+    if args.trend:
+        day = f"{int(args.trend):02}"
+        print_trend(trend(connection, day), day)
+        return
+
+    days = [f"{int(day):02}" for day in args.days]
+    regressions = find_regressions(connection, days, window=args.window, sigmas=args.sigmas)
+    if regressions:
+        print_regressions(regressions)
+        sys.exit(1)
+    print("No regressions")
+
+
+def _result(day: str, wall_ms: float, variant: str = "part1", input_hash: str = "abc") -> dict:
+    return {"day": day, "part": 1, "variant": variant, "input_hash": input_hash, "wall_ms": wall_ms}
+
+
+def test_find_regressions(tmp_path):
+    path = tmp_path / "history.db"
+    # Day 01 is noisy but no slower, day 02 got slower, and day 03 only has one earlier run
+    noisy = [10.0, 12.0, 9.0, 11.0, 10.5, 13.0]
+    record([_result("01", ms) for ms in noisy] + [_result("02", 10.0 + i / 4) for i in range(5)], "test", path)
+    record([_result("01", 14.0), _result("02", 12.0), _result("03", 1.0), _result("03", 100.0)], "test", path)
+    # A new input starts a new baseline
+    record([_result("04", 10.0) for _ in range(5)] + [_result("04", 500.0, input_hash="def")], "test", path)
+
+    with connect(path) as connection:
+        regressions = find_regressions(connection)
+        assert [(r.day, r.ms) for r in regressions] == [("02", 12.0)]
+        assert regressions[0].baseline_ms == 10.5
+        assert find_regressions(connection, ["01"]) == []
+
+        (row,) = trend(connection, "02")
+        assert (row["runs"], row["wall_ms"], row["variant"]) == (6, 10.625, "part1")
+    connection.close()
@@ -0,0 +1,83 @@
+import dataclasses
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+# Cold start budget for `run.py` plus a day module, excluding interpreter startup.
+IMPORT_BUDGET_MS = 50
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclasses.dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> list[ImportTiming]:
+    timings = []
+    for line in stderr.splitlines():
+        if match := IMPORTTIME_LINE.match(line):
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(ImportTiming(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return timings
+
+
+def profile_imports(modules: list[str]) -> list[ImportTiming]:
+    """Imports the given modules in a fresh interpreter with `-X importtime`, dropping interpreter startup."""
+    statement = "; ".join(f"import {module}" for module in modules)
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True
+    ).stderr
+
+    timings = parse_importtime(stderr)
+    # Everything up to and including `site` is paid by every python process, so isn't ours to budget.
+    site_index = max((i for i, t in enumerate(timings) if t.module == "site" and t.depth == 0), default=-1)
+    return timings[site_index + 1 :]
+
+
+def by_package(timings: list[ImportTiming]) -> dict[str, int]:
+    """Self time (us) of every imported module, summed up by top-level package."""
+    packages: dict[str, int] = defaultdict(int)
+    for timing in timings:
+        packages[timing.module.split(".")[0]] += timing.self_us
+    return dict(sorted(packages.items(), key=lambda item: item[1], reverse=True))
+
+
+def report(modules: list[str], budget_ms: float = IMPORT_BUDGET_MS, top: int = 15) -> bool:
+    timings = profile_imports(modules)
+    total_ms = sum(t.cumulative_us for t in timings if t.depth == 0) / 1000
+
+    print(f"Import time for {', '.join(modules)}: {total_ms:.1f}ms (budget {budget_ms}ms)\n")
+    print(f"{'package':<30}{'self (ms)':>12}")
+    for package, self_us in list(by_package(timings).items())[:top]:
+        print(f"{package:<30}{self_us / 1000:>12.2f}")
+
+    print(f"\n{'module':<40}{'self (ms)':>12}{'cumulative (ms)':>18}")
+    for timing in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:top]:
+        print(f"{timing.module:<40}{timing.self_us / 1000:>12.2f}{timing.cumulative_us / 1000:>18.2f}")
+
+    if total_ms > budget_ms:
+        print(f"\nImport time of {total_ms:.1f}ms is over the {budget_ms}ms budget")
+        return False
+    return True
+
+
+def test_parse_importtime():
+    stderr = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 | site
+import time:       250 |        250 |     _pytest.compat
+import time:       300 |        550 |   _pytest
+import time:       450 |       1000 | pytest
+"""
+    assert parse_importtime(stderr) == [
+        ImportTiming("site", 100, 100, 0),
+        ImportTiming("_pytest.compat", 250, 250, 2),
+        ImportTiming("_pytest", 300, 550, 1),
+        ImportTiming("pytest", 450, 1000, 0),
+    ]
+    assert by_package(parse_importtime(stderr)) == {"_pytest": 550, "pytest": 450, "site": 100}
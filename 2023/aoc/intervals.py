@@ -0,0 +1,150 @@
+import bisect
+import itertools
+from typing import Iterable, Iterator
+
+from aoc.testing import parametrize
+
+# Intervals are half-open (start, stop) pairs, like ranges: (3, 6) is 3, 4 and 5.
+Interval = tuple[int, int]
+
+
+def length(interval: Interval) -> int:
+    return max(0, interval[1] - interval[0])
+
+
+def split_at(interval: Interval, point: int) -> tuple[Interval, Interval]:
+    """The parts of an interval below `point` and from `point` up, either of which may be empty."""
+    start, stop = interval
+    return (start, min(stop, point)), (max(start, point), stop)
+
+
+def merge(intervals: Iterable[Interval]) -> list[Interval]:
+    """The sorted union of some intervals, with overlapping and touching intervals joined and empty ones dropped."""
+    merged: list[Interval] = []
+    for start, stop in sorted(interval for interval in intervals if interval[0] < interval[1]):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+class IntervalMap:
+    """
+    Maps numbers by adding the offset of whichever of a set of disjoint intervals they fall in; numbers outside all of
+    them map to themselves. The intervals are kept sorted in parallel lists, so a lookup is a bisect.
+    """
+
+    __slots__ = ("starts", "stops", "offsets")
+
+    def __init__(self, entries: Iterable[tuple[int, int, int]] = ()):
+        """From (start, stop, offset) entries."""
+        entries = sorted(entry for entry in entries if entry[0] < entry[1])
+        for (_, stop, _), (start, _, _) in itertools.pairwise(entries):
+            if start < stop:
+                raise ValueError("Intervals in an IntervalMap can't overlap")
+        self.starts = [start for start, _, _ in entries]
+        self.stops = [stop for _, stop, _ in entries]
+        self.offsets = [offset for _, _, offset in entries]
+
+    def __iter__(self) -> Iterator[tuple[int, int, int]]:
+        return zip(self.starts, self.stops, self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, number: int) -> int:
+        i = bisect.bisect_right(self.starts, number) - 1
+        if i >= 0 and number < self.stops[i]:
+            return number + self.offsets[i]
+        return number
+
+    def pieces(self, interval: Interval) -> Iterator[tuple[int, int, int]]:
+        """Splits an interval into (start, stop, offset) pieces, each mapped by one offset (0 between intervals)."""
+        start, stop = interval
+        i = max(0, bisect.bisect_right(self.starts, start) - 1)
+        while start < stop:
+            if i == len(self.starts) or stop <= self.starts[i]:
+                yield start, stop, 0
+                return
+            if start < self.starts[i]:
+                yield start, self.starts[i], 0
+                start = self.starts[i]
+            if start < self.stops[i]:
+                yield start, min(stop, self.stops[i]), self.offsets[i]
+                start = self.stops[i]
+            i += 1
+
+    def map_intervals(self, intervals: Iterable[Interval]) -> list[Interval]:
+        """Where a batch of intervals ends up, merged."""
+        return merge(
+            (start + offset, stop + offset) for interval in intervals for start, stop, offset in self.pieces(interval)
+        )
+
+    def then(self, other: "IntervalMap") -> "IntervalMap":
+        """One map that does this map and then `other`."""
+        if not self or not other:
+            return other if not self else self
+        # Outside both maps' intervals, both (and so the result) map numbers to themselves
+        lo, hi = min(self.starts[0], other.starts[0]), max(self.stops[-1], other.stops[-1])
+        entries: list[tuple[int, int, int]] = []
+        for start, stop, offset in self.pieces((lo, hi)):
+            for mapped_start, mapped_stop, other_offset in other.pieces((start + offset, stop + offset)):
+                entry = (mapped_start - offset, mapped_stop - offset, offset + other_offset)
+                if entries and entries[-1][1] == entry[0] and entries[-1][2] == entry[2]:
+                    entries[-1] = (entries[-1][0], entry[1], entry[2])
+                else:
+                    entries.append(entry)
+        return IntervalMap(entry for entry in entries if entry[2])
+
+
+def _random_map(rng, domain: int = 60) -> IntervalMap:
+    points = sorted(rng.sample(range(domain), rng.randrange(0, 12, 2)))
+    return IntervalMap((start, stop, rng.randint(-20, 20)) for start, stop in zip(points[::2], points[1::2]))
+
+
+def _random_intervals(rng, domain: int = 60) -> list[Interval]:
+    return [(start, start + rng.randint(0, 15)) for start in rng.sample(range(domain), rng.randint(0, 5))]
+
+
+def _numbers(intervals: Iterable[Interval]) -> set[int]:
+    return {n for start, stop in intervals for n in range(start, stop)}
+
+
+@parametrize("seed", range(50))
+def test_against_brute_force(seed):
+    import random
+
+    rng = random.Random(seed)
+    first, second = _random_map(rng), _random_map(rng)
+    brute = {n: n for n in range(-100, 100)}
+    for start, stop, offset in first:
+        brute.update({n: n + offset for n in range(start, stop)})
+    assert all(first[n] == brute[n] for n in brute)
+
+    intervals = _random_intervals(rng)
+    assert _numbers(merge(intervals)) == _numbers(intervals)
+    assert all(a[1] < b[0] for a, b in itertools.pairwise(merge(intervals)))
+
+    mapped = first.map_intervals(intervals)
+    assert _numbers(mapped) == {first[n] for n in _numbers(intervals)}
+    assert mapped == merge(mapped)
+
+    both = first.then(second)
+    assert all(both[n] == second[first[n]] for n in range(-100, 100))
+    assert second.map_intervals(mapped) == both.map_intervals(intervals)
+
+
+def test_interval_map():
+    import pytest
+
+    interval_map = IntervalMap([(10, 20, 5), (0, 5, 100)])
+    assert [interval_map[n] for n in (0, 4, 5, 9, 10, 19, 20)] == [100, 104, 5, 9, 15, 24, 20]
+    assert list(interval_map.pieces((3, 25))) == [(3, 5, 100), (5, 10, 0), (10, 20, 5), (20, 25, 0)]
+    # 15..19 go up 5 and back down again, and 20..24 only go down
+    assert list(interval_map.then(IntervalMap([(20, 25, -5)]))) == [(0, 5, 100), (10, 15, 5), (20, 25, -5)]
+    with pytest.raises(ValueError):
+        IntervalMap([(0, 10, 1), (5, 15, 1)])
+
+    assert split_at((3, 8), 5) == ((3, 5), (5, 8))
+    assert length(split_at((3, 8), 10)[1]) == 0
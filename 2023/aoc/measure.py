@@ -0,0 +1,189 @@
+import dataclasses
+import functools
+import inspect
+import re
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+from aoc.day import DayRun
+from helpers import call_part
+
+# Parsers are found by name, so legacy `partN(file_contents)` functions can be split into parse and solve phases.
+PARSER_NAME = re.compile(r"^(parse\w*|make_grid)$")
+
+
+def peak_rss_kib() -> int:
+    """The process' high water mark. This only ever goes up, so it's attributed to the phase that raised it."""
+    import resource
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+@dataclasses.dataclass
+class PhaseStats:
+    name: str
+    calls: int = 0
+    # Exclusive of any nested phases, e.g. `solve` doesn't include the `parse` calls made while solving
+    ms: float = 0
+    # The most memory traced by `tracemalloc` at once, over what was allocated when the phase started
+    peak_bytes: Optional[int] = None
+    # Net change in the number of live allocated blocks (not how many were allocated), i.e. what the phase left behind
+    # for later phases
+    net_blocks: int = 0
+    peak_rss_kib: int = 0
+
+
+@dataclasses.dataclass
+class _ActivePhase:
+    stats: PhaseStats
+    start: float
+    start_traced: int
+    start_blocks: int
+    peak_traced: int = 0
+    child_ms: float = 0
+
+
+class Measurement:
+    """
+    Records time, memory and allocations for named (and possibly nested) phases of a solve:
+
+        measurement = Measurement()
+        with measurement.phase("solve"):
+            with measurement.phase("parse"):
+                ...
+
+    Tracing allocations slows python down a lot, so with `trace_memory=False` only times and peak RSS are recorded.
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.phases: dict[str, PhaseStats] = {}
+        self._active: list[_ActivePhase] = []
+        self._started_tracing = False
+
+    def _traced(self) -> tuple[int, int]:
+        return tracemalloc.get_traced_memory() if self.trace_memory else (0, 0)
+
+    @contextmanager
+    def phase(self, name: str):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        current, peak = self._traced()
+        for parent in self._active:
+            parent.peak_traced = max(parent.peak_traced, peak)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+
+        stats = self.phases.setdefault(name, PhaseStats(name))
+        active = _ActivePhase(stats, perf_counter(), current, sys.getallocatedblocks())
+        self._active.append(active)
+        try:
+            yield stats
+        finally:
+            elapsed = (perf_counter() - active.start) * 1000
+            self._active.pop()
+            _, peak = self._traced()
+            active.peak_traced = max(active.peak_traced, peak)
+
+            stats.calls += 1
+            stats.ms += elapsed - active.child_ms
+            stats.net_blocks += sys.getallocatedblocks() - active.start_blocks
+            stats.peak_rss_kib = max(stats.peak_rss_kib, peak_rss_kib())
+            if self.trace_memory:
+                stats.peak_bytes = max(stats.peak_bytes or 0, active.peak_traced - active.start_traced)
+
+            if self._active:
+                self._active[-1].child_ms += elapsed
+                self._active[-1].peak_traced = max(self._active[-1].peak_traced, active.peak_traced)
+            elif self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """Wraps a function so every call to it is recorded as a phase."""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                result = func(*args, **kwargs)
+                # Consume lazy parsers here, otherwise their work is attributed to whoever iterates over them
+                return list(result) if inspect.isgenerator(result) else result
+
+        return wrapper
+
+    def as_dict(self) -> dict[str, dict]:
+        return {name: dataclasses.asdict(stats) for name, stats in self.phases.items()}
+
+
+def measure_part(module, func: Callable, file_contents: str, trace_memory: bool = True) -> tuple[Any, Measurement]:
+    """Calls a part function, recording calls to the module's parser(s) as a `parse` phase within `solve`."""
+    measurement = Measurement(trace_memory=trace_memory)
+    parsers = {name: f for name, f in vars(module).items() if PARSER_NAME.match(name) and inspect.isfunction(f)}
+
+    for name, parser in parsers.items():
+        setattr(module, name, measurement.wrap("parse", parser))
+    try:
+        with measurement.phase("solve"):
+            answer = call_part(func, file_contents)
+    finally:
+        for name, parser in parsers.items():
+            setattr(module, name, parser)
+
+    return answer, measurement
+
+
+def measure_run(run: DayRun, part: int, trace_memory: bool = True) -> tuple[Any, Measurement]:
+    """Solves a part of a `Day`, with parsing (unless the other part already did it) and solving as separate phases."""
+    measurement = Measurement(trace_memory=trace_memory)
+    if not run.is_parsed:
+        with measurement.phase("parse"):
+            run.parsed()
+    with measurement.phase("solve"):
+        answer = run.solve(part)
+    return answer, measurement
+
+
+def test_measurement_phases():
+    measurement = Measurement()
+    with measurement.phase("solve"):
+        with measurement.phase("parse"):
+            data = [str(i) * 10 for i in range(10_000)]
+        total = sum(len(x) for x in data)
+        del data
+
+    parse, solve = measurement.phases["parse"], measurement.phases["solve"]
+    assert total > 0
+    assert parse.calls == solve.calls == 1
+    assert parse.peak_bytes > 400_000  # type: ignore[operator]
+    # The solve phase's peak includes everything its parse phase allocated
+    assert solve.peak_bytes >= parse.peak_bytes  # type: ignore[operator]
+    assert parse.net_blocks > 9_000 and solve.net_blocks < 1_000
+    assert not tracemalloc.is_tracing()
+
+
+def test_measure_part():
+    import day_09
+
+    parser = day_09.parse_file_contents
+    answer, measurement = measure_part(day_09, day_09.part1, "0 3 6 9 12 15\n1 3 6 10 15 21\n10 13 16 21 30 45\n")
+    assert answer == 114
+    assert set(measurement.phases) == {"solve", "parse"}
+    assert day_09.parse_file_contents is parser
+
+
+def test_measure_run():
+    import day_10
+    from aoc.day import load
+
+    run = DayRun(load(day_10), day_10.test_data)
+    answer, measurement = measure_run(run, 1, trace_memory=False)
+    assert answer == 8 and list(measurement.phases) == ["parse", "solve"]
+    # Part 2 reuses the parsed input (and the loop, from `shared`)
+    answer, measurement = measure_run(run, 2, trace_memory=False)
+    assert list(measurement.phases) == ["solve"] and "depths" in run.shared
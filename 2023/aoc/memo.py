@@ -0,0 +1,196 @@
+import dataclasses
+import functools
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional
+
+# Every memoised function, so the harness can report on them
+_memos: list["Memo"] = []
+
+_MISSING = object()
+
+
+@dataclasses.dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    # The most entries held at once
+    peak: int = 0
+
+
+class Memo:
+    """
+    A memoised function (see `memo`). `stats` counts hits, misses and evictions across every call; `scope()` keeps a
+    scoped cache alive across several calls.
+    """
+
+    def __init__(self, func: Callable, max_size: Optional[int], exclude: Iterable[str], scoped: bool):
+        exclude = frozenset(exclude)
+        if exclude and not scoped:
+            raise ValueError("Only a scoped cache can exclude parameters, which must be the same throughout a scope")
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.max_size = max_size
+        self.scoped = scoped
+        code = func.__code__
+        self.names = code.co_varnames[: code.co_argcount + code.co_kwonlyargcount]
+        self.key_names = tuple(name for name in self.names if name not in exclude)
+        # Positional calls can use their arguments as the key as they are
+        self.plain = not exclude
+        self.cache: OrderedDict = OrderedDict()
+        self.stats = MemoStats()
+        self.depth = 0
+        _memos.append(self)
+
+    def key(self, args: tuple, kwargs: dict) -> tuple:
+        if self.plain and not kwargs:
+            return args
+        values = dict(zip(self.names, args), **kwargs)
+        return tuple(values.get(name, _MISSING) for name in self.key_names)
+
+    def __call__(self, *args, **kwargs):
+        key = self.key(args, kwargs)
+        cache = self.cache
+        if key in cache:
+            self.stats.hits += 1
+            if self.max_size is not None:
+                cache.move_to_end(key)
+            return cache[key]
+
+        self.stats.misses += 1
+        self.depth += 1
+        try:
+            value = self.func(*args, **kwargs)
+        finally:
+            self.depth -= 1
+            if self.scoped and not self.depth:
+                # The end of the outermost call (and not in a `scope()`), even if it raised, so nothing it cached can be
+                # returned for another call tree
+                cache.clear()
+        if self.scoped and not self.depth:
+            return value
+
+        cache[key] = value
+        if self.max_size is not None and len(cache) > self.max_size:
+            cache.popitem(last=False)
+            self.stats.evictions += 1
+        self.stats.peak = max(self.stats.peak, len(cache))
+        return value
+
+    @contextmanager
+    def scope(self):
+        """Shares a scoped cache between every call made in the block, clearing it afterwards."""
+        self.depth += 1
+        try:
+            yield self
+        finally:
+            self.depth -= 1
+            if not self.depth:
+                self.cache.clear()
+
+    def cache_clear(self):
+        self.cache.clear()
+
+
+def memo(
+    max_size: Optional[int] = None, exclude: Iterable[str] = (), scoped: bool = False
+) -> Callable[[Callable], Memo]:
+    """
+    Memoises a function, like `functools.cache`, but:
+
+    * `max_size` bounds the cache, evicting the least recently used entry.
+    * `scoped=True` only keeps entries while a call tree is running: the cache is cleared when the outermost call
+      returns (e.g. once per record for a recursive function), or at the end of a `with func.scope():` block.
+    * `exclude` leaves parameters out of the key, e.g. a big map that's the same for every call in a scope. It
+      needs `scoped=True`, so a different map can't get the old map's answers.
+    """
+
+    def decorate(func: Callable) -> Memo:
+        return Memo(func, max_size=max_size, exclude=exclude, scoped=scoped)
+
+    return decorate
+
+
+def reset_stats():
+    for m in _memos:
+        m.stats = MemoStats()
+
+
+def snapshot() -> dict[str, dict]:
+    """Stats for every memoised function that's been called, e.g. `{"day_12.recurse_reports": {"hits": 12, ...}}`."""
+    return {
+        f"{m.func.__module__}.{m.func.__qualname__}": dataclasses.asdict(m.stats)
+        for m in _memos
+        if m.stats.hits or m.stats.misses
+    }
+
+
+def format_snapshot(stats: dict[str, dict]) -> list[str]:
+    lines = []
+    for name, s in stats.items():
+        calls = s["hits"] + s["misses"]
+        line = f"{name}: {s['hits']:,}/{calls:,} hits ({s['hits'] / calls:.0%}), peak {s['peak']:,} entries"
+        if s["evictions"]:
+            line += f", {s['evictions']:,} evictions"
+        lines.append(line)
+    return lines
+
+
+def test_memo_bounds():
+    calls = []
+
+    @memo(max_size=2)
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert [square(x) for x in (1, 2, 1, 3, 2, 1)] == [1, 4, 1, 9, 4, 1]
+    # 1 was used more recently than 2 when 3 came in, so 2 was evicted first, then 1, then 3
+    assert calls == [1, 2, 3, 2, 1]
+    assert dataclasses.asdict(square.stats) == {"hits": 1, "misses": 5, "evictions": 3, "peak": 2}
+
+
+def test_memo_scopes():
+    import pytest
+
+    @memo(scoped=True)
+    def fib(n):
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    assert fib(30) == 832040 and fib.stats.misses == 31
+    # Cleared once the outermost call returned
+    assert len(fib.cache) == 0
+
+    @memo(scoped=True, exclude=("table",))
+    def lookup(key, table):
+        return table[key]
+
+    with lookup.scope():
+        assert lookup("a", table={"a": 1}) == 1
+        assert lookup("a", table={"a": 2}) == 1
+    assert lookup("a", table={"a": 2}) == 2
+    assert (lookup.stats.hits, lookup.stats.misses) == (1, 2)
+
+    @memo(scoped=True, exclude=("table",))
+    def total(keys, table):
+        if len(keys) == 1:
+            return table[keys[0]]
+        return total(keys[:1], table=table) + total(keys[1:], table=table)
+
+    with pytest.raises(KeyError):
+        total(("a", "missing"), table={"a": 1})
+    # What was cached before it raised went with it
+    assert len(total.cache) == 0 and total(("a",), table={"a": 3}) == 3
+
+    assert "test_memo_scopes.<locals>.lookup" in " ".join(snapshot())
+    assert format_snapshot({"f": {"hits": 3, "misses": 1, "evictions": 0, "peak": 1}}) == [
+        "f: 3/4 hits (75%), peak 1 entries"
+    ]
+
+
+def test_exclude_needs_a_scope():
+    import pytest
+
+    with pytest.raises(ValueError):
+        memo(exclude=("table",))(lambda key, table: table[key])
@@ -0,0 +1,130 @@
+import importlib
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from io import StringIO
+from time import perf_counter, process_time
+from typing import Optional
+
+from aoc import answers, history
+from aoc.bench import discover_days
+from aoc.budget import budget_for, declares_budget, describe, run_within
+from aoc.cache import sha256
+from aoc.day import declares_day, load as load_day
+from aoc.variants import choose
+from helpers import call_part, get_input_filepath
+
+TIMINGS_FILE = "timings.json"
+
+
+def load_past_timings(path: str = TIMINGS_FILE) -> dict[str, float]:
+    """Returns the last recorded duration (ms) of each job, keyed by `day/part`."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_timings(results: list[dict], path: str = TIMINGS_FILE):
+    timings = load_past_timings(path)
+    timings.update({f"{r['day']}/{r['part']}": r["ms"] for r in results if r["error"] is None})
+    with open(path, "w") as f:
+        f.write(json.dumps(timings, indent=2, sort_keys=True) + "\n")
+
+
+def timed_run(module, solution, file_contents: str, part: int) -> tuple[object, float]:
+    with redirect_stdout(StringIO()):
+        start = perf_counter()
+        if declares_day(module) and solution is getattr(load_day(module), f"part{part}"):
+            # Takes the parsed input, so parse it first
+            answer = load_day(module).run(file_contents, part)
+        else:
+            answer = call_part(solution, file_contents)
+        return answer, (perf_counter() - start) * 1000
+
+
+def solve(day: str, part: int) -> dict:
+    """
+    Runs a single day/part in a worker process. Parts with a budget (from the module's `BUDGET` or the config file) are
+    solved in a child process within it; the rest are solved in the worker, rather than paying for another fork.
+    """
+    result: dict = {"day": day, "part": part, "answer": None, "ms": None, "error": None, "cached": False}
+    try:
+        module = importlib.import_module(f"day_{day}")
+        with open(get_input_filepath(day)) as f:
+            file_contents = f.read()
+
+        solution = choose(module, part, file_contents)
+        if cached := answers.lookup(solution, file_contents):
+            result.update(cached, cached=True)
+            return result
+
+        if declares_budget(module, day, part):
+            budget = budget_for(module, day, part)
+            outcome = run_within(budget, timed_run, module, solution, file_contents, part)
+            if not outcome.ok:
+                result["error"] = describe(outcome, budget)
+                return result
+            result["answer"], result["ms"] = outcome.value
+            cpu_ms, peak_rss_kib = outcome.progress["cpu_ms"], int(outcome.progress["peak_rss_mib"] * 1024)
+        else:
+            cpu_start = process_time()
+            result["answer"], result["ms"] = timed_run(module, solution, file_contents, part)
+            # The worker's peak RSS covers every job it's run, so isn't this one's
+            cpu_ms, peak_rss_kib = (process_time() - cpu_start) * 1000, None
+        answers.store(solution, file_contents, result["answer"], result["ms"])
+        result["history"] = {
+            "day": day,
+            "part": part,
+            "variant": solution.__name__,
+            "input_hash": sha256(file_contents),
+            "wall_ms": result["ms"],
+            "cpu_ms": cpu_ms,
+            "peak_rss_kib": peak_rss_kib,
+        }
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def schedule(jobs: list[tuple[str, int]], past_timings: dict[str, float]) -> list[tuple[str, int]]:
+    """Longest jobs first. Jobs we've never timed go to the front, as they're the most likely to surprise us."""
+    return sorted(jobs, key=lambda job: past_timings.get(f"{job[0]}/{job[1]}", math.inf), reverse=True)
+
+
+def run_all(days: Optional[list[str]] = None, workers: Optional[int] = None) -> list[dict]:
+    days = days or [day for day in discover_days() if os.path.exists(get_input_filepath(day))]
+    jobs = schedule([(day, part) for day in days for part in (1, 2)], load_past_timings())
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(solve, day, part) for day, part in jobs]
+        for future in as_completed(futures):
+            results.append(future.result())
+
+    results.sort(key=lambda r: (r["day"], r["part"]))
+    save_timings(results)
+    history.record([r["history"] for r in results if "history" in r], source="all")
+    return results
+
+
+def print_results(results: list[dict], wall_ms: float):
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table("Day", "Part", "Answer", "Took (ms)", title=f"All days ({wall_ms:.0f}ms wall clock)")
+    for result in results:
+        if result["error"]:
+            table.add_row(result["day"], str(result["part"]), f"[red]{result['error']}[/red]", "-")
+        else:
+            took = f"{result['ms']:.3f}" + (" (cached)" if result["cached"] else "")
+            table.add_row(result["day"], str(result["part"]), str(result["answer"]), took)
+    Console().print(table)
+
+
+def main(workers: Optional[int] = None):
+    start = perf_counter()
+    results = run_all(workers=workers)
+    print_results(results, (perf_counter() - start) * 1000)
@@ -0,0 +1,65 @@
+import argparse
+import timeit
+from typing import Any, Callable
+
+from aoc.ds import Point, t, to_complex
+
+# Statements to time, with `a`, `b` and the keys of `grid` made from each representation
+OPERATIONS = {
+    "a + b": "a + b",
+    "a - b": "a - b",
+    "a * 3": "a * 3",
+    "lookup a + b": "grid[a + b]",
+}
+
+REPRESENTATIONS: dict[str, Callable[[tuple[int, int]], Any]] = {
+    "t": t,
+    "Point": Point,
+    "complex": to_complex,
+}
+
+# What each operation costs written out by hand with plain tuples, as a floor to compare against
+INLINE = {
+    "a + b": "(a[0] + b[0], a[1] + b[1])",
+    "a - b": "(a[0] - b[0], a[1] - b[1])",
+    "a * 3": "(a[0] * 3, a[1] * 3)",
+    "lookup a + b": "grid[(a[0] + b[0], a[1] + b[1])]",
+}
+
+
+def time_ns(statement: str, namespace: dict, number: int) -> float:
+    return min(timeit.repeat(statement, globals=namespace, number=number, repeat=5)) / number * 1e9
+
+
+def compare(number: int = 100_000) -> dict[str, dict[str, float]]:
+    """Nanoseconds per operation for each point representation."""
+    coords = [(x, y) for x in range(10) for y in range(10)]
+    results = {}
+    for name, make in REPRESENTATIONS.items():
+        namespace = {"a": make((3, 4)), "b": make((1, -1)), "grid": {make(coord): 0 for coord in coords}}
+        results[name] = {op: time_ns(statement, namespace, number) for op, statement in OPERATIONS.items()}
+
+    namespace = {"a": (3, 4), "b": (1, -1), "grid": {coord: 0 for coord in coords}}
+    results["inline tuple"] = {op: time_ns(statement, namespace, number) for op, statement in INLINE.items()}
+    return results
+
+
+def main(argv: list[str]):
+    from rich.console import Console
+    from rich.table import Table
+
+    parser = argparse.ArgumentParser(prog="run.py bench-point", description="Microbenchmark 2D point types.")
+    parser.add_argument("--number", type=int, default=100_000, help="Operations per timing")
+    args = parser.parse_args(argv)
+
+    results = compare(args.number)
+    table = Table("Type", *(f"{op} (ns)" for op in OPERATIONS))
+    for name, timings in results.items():
+        table.add_row(name, *(f"{timings[op]:.0f}" for op in OPERATIONS))
+    Console().print(table)
+
+
+def test_compare():
+    results = compare(number=100)
+    assert list(results) == [*REPRESENTATIONS, "inline tuple"]
+    assert all(list(timings) == list(OPERATIONS) for timings in results.values())
@@ -0,0 +1,128 @@
+import argparse
+import importlib
+import math
+import os
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from time import perf_counter
+from typing import Callable, Optional
+
+from aoc.bench import solution_functions
+from aoc.synthetic import GENERATORS
+from helpers import call_part
+
+
+def fit_exponent(sizes: list[int], times: list[float]) -> Optional[float]:
+    """The `k` in `time ~ size**k`, from a least squares fit of log(time) against log(size)."""
+    if len(sizes) < 2:
+        return None
+    xs, ys = [math.log(s) for s in sizes], [math.log(t) for t in times]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance if variance else None
+
+
+def time_call(func: Callable, file_contents: str, repeat: int) -> float:
+    """The fastest of `repeat` calls, in milliseconds."""
+    timings = []
+    with redirect_stdout(StringIO()):
+        for _ in range(repeat):
+            start = perf_counter()
+            call_part(func, file_contents)
+            timings.append((perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def measure_curve(day: str, steps: int = 5, repeat: int = 3, max_ms: float = 2_000) -> list[dict]:
+    """
+    Times each part of a day on synthetic inputs, doubling the size each step. A part stops growing once a call takes
+    longer than `max_ms`, or fails (some parts only work on inputs shaped exactly like the real one).
+    """
+    synthetic = GENERATORS[day]
+    module = importlib.import_module(f"day_{day}")
+    sizes = [synthetic.base_size * 2**step for step in range(steps)]
+    inputs = {size: synthetic(size) for size in sizes}
+
+    results = []
+    for name, func in solution_functions(module).items():
+        points: list[tuple[int, float]] = []
+        error = None
+        for size in sizes:
+            try:
+                ms = time_call(func, inputs[size], repeat)
+            except Exception as e:
+                error = f"{type(e).__name__} at size {size}"
+                break
+            points.append((size, ms))
+            if ms > max_ms:
+                break
+
+        results.append(
+            {
+                "day": day,
+                "function": name,
+                "unit": synthetic.unit,
+                "points": points,
+                "exponent": fit_exponent([s for s, _ in points], [ms for _, ms in points]),
+                "error": error,
+            }
+        )
+    return results
+
+
+def print_results(results: list[dict]):
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table("Day", "Function", "Size", "Timings (ms)", "Exponent", "Notes")
+    for result in results:
+        points = result["points"]
+        table.add_row(
+            result["day"],
+            result["function"],
+            f"{points[0][0]}..{points[-1][0]} {result['unit']}" if points else result["unit"],
+            ", ".join(f"{ms:.1f}" for _, ms in points),
+            f"{result['exponent']:.2f}" if result["exponent"] is not None else "-",
+            result["error"] or "",
+        )
+
+    Console().print(table)
+
+
+def main(argv: list[str]):
+    parser = argparse.ArgumentParser(
+        prog="run.py scaling", description="Time each part on growing synthetic inputs and fit how it scales."
+    )
+    parser.add_argument("days", nargs="*", help=f"Days to measure (default: {', '.join(sorted(GENERATORS))})")
+    parser.add_argument("--steps", type=int, default=5, help="How many times to double the input size")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed calls per size (the fastest is used)")
+    parser.add_argument("--max-ms", type=float, default=2_000, help="Stop growing a part once a call takes this long")
+    args = parser.parse_args(argv)
+
+    days = [f"{int(day):02}" for day in args.days] or sorted(GENERATORS)
+    if missing := [day for day in days if day not in GENERATORS]:
+        parser.error(f"No synthetic input generator for day(s) {', '.join(missing)}")
+
+    # Every input is new, so caching parsed inputs would only fill the cache and time pickling.
+    os.environ["AOC_PARSE_CACHE"] = "0"
+
+    results = []
+    for day in days:
+        results.extend(measure_curve(day, steps=args.steps, repeat=args.repeat, max_ms=args.max_ms))
+        print(f"day {day}: done", file=sys.stderr)
+
+    print_results(results)
+
+
+def test_fit_exponent():
+    sizes = [10, 20, 40, 80]
+    assert abs(fit_exponent(sizes, [s**2 / 2 for s in sizes]) - 2) < 1e-9  # type: ignore[operator]
+    assert abs(fit_exponent(sizes, [3 * s for s in sizes]) - 1) < 1e-9  # type: ignore[operator]
+    assert fit_exponent([10], [1.0]) is None
+
+
+def test_measure_curve():
+    results = measure_curve("09", steps=3, repeat=1)
+    assert [r["function"] for r in results] == ["part1", "part2"]
+    assert all(len(r["points"]) == 3 and r["exponent"] is not None and r["error"] is None for r in results)
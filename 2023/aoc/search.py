@@ -0,0 +1,198 @@
+import heapq
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from aoc import counters
+
+# Shortest paths over integer states. A state is any int in `range(size)`, usually a flat grid index packed with
+# whatever else the puzzle needs to track (e.g. `index * 2 + axis`), so distances and parents fit in flat lists rather
+# than dicts of tuples. Each search takes a `neighbours(state)` callback: for `bfs` it yields neighbouring states, and
+# for `dial` and `astar` it yields `(state, cost)` pairs.
+
+UNREACHED = -1
+
+
+@dataclass
+class SearchResult:
+    distance: list[int]
+    parent: Optional[list[int]] = None
+    # The goal state the search stopped at, if it was given a goal and found one
+    end: Optional[int] = None
+
+    def reached(self) -> dict[int, int]:
+        """The distance of every state the search reached, by state."""
+        return {state: d for state, d in enumerate(self.distance) if d != UNREACHED}
+
+    def path(self, state: Optional[int] = None) -> list[int]:
+        """The states from a start to `state` (default: `end`). Needs the search to have run with `parents=True`."""
+        if self.parent is None:
+            raise ValueError("Search was run without parents=True")
+        state = self.end if state is None else state
+        if state is None or self.distance[state] == UNREACHED:
+            return []
+        path = [state]
+        while self.parent[state] != UNREACHED:
+            state = self.parent[state]
+            path.append(state)
+        return path[::-1]
+
+
+def _start(starts: Iterable[int], size: int, parents: bool) -> tuple[list[int], Optional[list[int]], list[int]]:
+    distance = [UNREACHED] * size
+    parent = [UNREACHED] * size if parents else None
+    frontier = []
+    for state in starts:
+        if distance[state] == UNREACHED:
+            distance[state] = 0
+            frontier.append(state)
+    return distance, parent, frontier
+
+
+def bfs(
+    starts: Iterable[int],
+    neighbours: Callable[[int], Iterable[int]],
+    size: int,
+    goal: Optional[Callable[[int], bool]] = None,
+    max_distance: Optional[int] = None,
+    parents: bool = False,
+) -> SearchResult:
+    """
+    Breadth-first search, for when every step costs 1. Stops at the first state where `goal(state)` is true, or after
+    reaching everything within `max_distance` steps.
+    """
+    distance, parent, frontier = _start(starts, size, parents)
+    d = 0
+    while frontier:
+        counters.gauge("frontier", len(frontier))
+        if goal is not None:
+            for state in frontier:
+                if goal(state):
+                    return SearchResult(distance, parent, state)
+        if d == max_distance:
+            break
+
+        d += 1
+        next_frontier = []
+        for state in frontier:
+            for neighbour in neighbours(state):
+                if distance[neighbour] == UNREACHED:
+                    distance[neighbour] = d
+                    if parent is not None:
+                        parent[neighbour] = state
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+
+    return SearchResult(distance, parent)
+
+
+def dial(
+    starts: Iterable[int],
+    neighbours: Callable[[int], Iterable[tuple[int, int]]],
+    size: int,
+    goal: Optional[Callable[[int], bool]] = None,
+    parents: bool = False,
+) -> SearchResult:
+    """
+    Dijkstra for small non-negative integer costs, with a bucket queue (Dial's algorithm): one list of states per
+    distance, so pushing and popping are O(1) rather than a heap's O(log n).
+    """
+    distance, parent, frontier = _start(starts, size, parents)
+    buckets = [frontier]
+    d = 0
+    while d < len(buckets):
+        bucket = buckets[d]
+        counters.gauge("frontier", len(bucket))
+        # A state is left in the buckets for every distance it was pushed at; only the shortest counts
+        for state in bucket:
+            if distance[state] != d:
+                continue
+            if goal is not None and goal(state):
+                return SearchResult(distance, parent, state)
+            for neighbour, cost in neighbours(state):
+                next_distance = d + cost
+                if distance[neighbour] == UNREACHED or next_distance < distance[neighbour]:
+                    distance[neighbour] = next_distance
+                    if parent is not None:
+                        parent[neighbour] = state
+                    while len(buckets) <= next_distance:
+                        buckets.append([])
+                    buckets[next_distance].append(neighbour)
+                    counters.count("queue_push")
+        buckets[d] = []
+        d += 1
+
+    return SearchResult(distance, parent)
+
+
+def astar(
+    starts: Iterable[int],
+    neighbours: Callable[[int], Iterable[tuple[int, int]]],
+    size: int,
+    goal: Callable[[int], bool],
+    heuristic: Callable[[int], int],
+    parents: bool = False,
+) -> SearchResult:
+    """
+    A*: Dijkstra that expands states in order of distance plus `heuristic(state)`, an estimate of the distance left
+    that must never overestimate it (or the path found might not be the shortest).
+    """
+    distance, parent, frontier = _start(starts, size, parents)
+    queue = [(heuristic(state), 0, state) for state in frontier]
+    heapq.heapify(queue)
+    while queue:
+        _, d, state = heapq.heappop(queue)
+        if distance[state] != d:
+            continue
+        if goal(state):
+            return SearchResult(distance, parent, state)
+        for neighbour, cost in neighbours(state):
+            next_distance = d + cost
+            if distance[neighbour] == UNREACHED or next_distance < distance[neighbour]:
+                distance[neighbour] = next_distance
+                if parent is not None:
+                    parent[neighbour] = state
+                heapq.heappush(queue, (next_distance + heuristic(neighbour), next_distance, neighbour))
+                counters.count("queue_push")
+
+    return SearchResult(distance, parent)
+
+
+# A 4x4 grid as states 0..15, with walls at 5, 6 and 9, and moving right costing 2
+TEST_WALLS = {5, 6, 9}
+
+
+def _grid_steps(state: int) -> Iterable[int]:
+    x, y = divmod(state, 4)
+    for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+        if 0 <= nx < 4 and 0 <= ny < 4 and nx * 4 + ny not in TEST_WALLS:
+            yield nx * 4 + ny
+
+
+def _weighted_steps(state: int) -> Iterable[tuple[int, int]]:
+    return ((n, 2 if n == state + 1 else 1) for n in _grid_steps(state))
+
+
+def test_bfs():
+    result = bfs([0], _grid_steps, 16, parents=True)
+    assert result.distance[15] == 6 and result.distance[5] == UNREACHED
+    path = result.path(15)
+    assert path[0] == 0 and path[-1] == 15 and len(path) == 7
+    assert all(b in _grid_steps(a) for a, b in zip(path, path[1:]))
+
+    assert bfs([0], _grid_steps, 16, goal=lambda s: s == 10).end == 10
+    assert set(bfs([0], _grid_steps, 16, max_distance=2).reached()) == {0, 1, 2, 4, 8}
+
+
+def test_dial_and_astar_agree():
+    expected = dial([0], _weighted_steps, 16).distance
+    for end in range(16):
+        result = dial([0], _weighted_steps, 16, goal=lambda s: s == end, parents=True)
+        heuristic = lambda s: abs(s // 4 - end // 4) + abs(s % 4 - end % 4)  # noqa: E731
+        other = astar([0], _weighted_steps, 16, goal=lambda s: s == end, heuristic=heuristic, parents=True)
+        assert result.distance[end] == other.distance[end] == expected[end]
+        if expected[end] != UNREACHED:
+            for path in (result.path(), other.path()):
+                costs = [dict(_weighted_steps(a))[b] for a, b in zip(path, path[1:])]
+                assert sum(costs) == expected[end]
+    # Every step right costs 2
+    assert expected[3] == 6 and expected[15] == 9
@@ -0,0 +1,230 @@
+import dataclasses
+import random
+from typing import Callable
+
+from aoc.testing import parametrize
+
+
+@dataclasses.dataclass
+class SyntheticInput:
+    day: str
+    generate: Callable[[int, random.Random], str]
+    # The smallest size worth timing; the scaling report doubles it from here
+    base_size: int
+    # What `size` counts, e.g. the side of a grid
+    unit: str
+
+    def __call__(self, size: int, seed: int = 0) -> str:
+        return self.generate(size, random.Random(f"{self.day}:{size}:{seed}"))
+
+
+GENERATORS: dict[str, SyntheticInput] = {}
+
+
+def generator(day: str, base_size: int, unit: str) -> Callable:
+    """Registers a function that generates a valid input for a day, of a given size, from a random number generator."""
+
+    def decorator(func: Callable[[int, random.Random], str]) -> Callable[[int, random.Random], str]:
+        GENERATORS[day] = SyntheticInput(day, func, base_size, unit)
+        return func
+
+    return decorator
+
+
+def name(i: int) -> str:
+    """A unique lowercase name for a module/workflow, at least 3 letters long so it can't clash with `in`."""
+    letters = ""
+    while i or len(letters) < 3:
+        i, r = divmod(i, 26)
+        letters = chr(ord("a") + r) + letters
+    return letters
+
+
+def random_grid(size: int, rng: random.Random, weights: dict[str, float]) -> list[list[str]]:
+    return [rng.choices(list(weights), list(weights.values()), k=size) for _ in range(size)]
+
+
+def join_grid(grid: list[list[str]]) -> str:
+    return "\n".join("".join(row) for row in grid) + "\n"
+
+
+def primes_between(low: int, high: int) -> list[int]:
+    return [n for n in range(low, high) if all(n % d for d in range(2, int(n**0.5) + 1))]
+
+
+@generator("07", base_size=250, unit="hands")
+def camel_cards(size: int, rng: random.Random) -> str:
+    return "".join(f"{''.join(rng.choices('AKQJT98765432', k=5))} {rng.randint(1, 1000)}\n" for _ in range(size))
+
+
+@generator("09", base_size=250, unit="sequences")
+def oasis_report(size: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(size):
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(1, 7))]
+        values = [sum(c * x**i for i, c in enumerate(coefficients)) for x in range(21)]
+        lines.append(" ".join(map(str, values)))
+    return "\n".join(lines) + "\n"
+
+
+@generator("10", base_size=16, unit="grid side")
+def pipe_maze(size: int, rng: random.Random) -> str:
+    """A rectangular loop one tile in from the edge, with junk pipes inside it."""
+    size = max(size, 5)
+    grid = [["."] * size for _ in range(size)]
+    for x in range(2, size - 2):
+        grid[x][2 : size - 2] = rng.choices("|-LJ7F.", k=size - 4)
+
+    last = size - 2
+    for i in range(2, last):
+        grid[1][i] = grid[last][i] = "-"
+        grid[i][1] = grid[i][last] = "|"
+    grid[1][1], grid[1][last], grid[last][1], grid[last][last] = "S", "7", "L", "J"
+    return join_grid(grid)
+
+
+@generator("11", base_size=16, unit="grid side")
+def galaxy_image(size: int, rng: random.Random) -> str:
+    grid = random_grid(size, rng, {".": 0.97, "#": 0.03})
+    for x in rng.sample(range(size), k=max(1, size // 20)):
+        grid[x] = ["."] * size
+    for y in rng.sample(range(size), k=max(1, size // 20)):
+        for row in grid:
+            row[y] = "."
+    return join_grid(grid)
+
+
+@generator("12", base_size=250, unit="rows")
+def spring_records(size: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(size):
+        springs = rng.choices("#.", k=rng.randint(8, 20))
+        groups = [len(group) for group in "".join(springs).split(".") if group]
+        if not groups:
+            springs[0], groups = "#", [1]
+        # part1 tries every combination of unknowns, so keep them to what the real input has
+        for i in rng.sample(range(len(springs)), k=min(len(springs), rng.randint(3, 9))):
+            springs[i] = "?"
+        lines.append(f"{''.join(springs)} {','.join(map(str, groups))}")
+    return "\n".join(lines) + "\n"
+
+
+@generator("14", base_size=16, unit="grid side")
+def rock_platform(size: int, rng: random.Random) -> str:
+    return join_grid(random_grid(size, rng, {".": 0.7, "O": 0.2, "#": 0.1}))
+
+
+@generator("16", base_size=16, unit="grid side")
+def mirror_contraption(size: int, rng: random.Random) -> str:
+    return join_grid(random_grid(size, rng, {".": 0.9, "|": 0.025, "-": 0.025, "/": 0.025, "\\": 0.025}))
+
+
+@generator("17", base_size=16, unit="grid side")
+def heat_loss_map(size: int, rng: random.Random) -> str:
+    return join_grid(random_grid(size, rng, {str(d): 1 for d in range(1, 10)}))
+
+
+@generator("19", base_size=50, unit="workflows")
+def workflows(size: int, rng: random.Random) -> str:
+    """A random tree of `size` workflows, plus `size` parts to sort through it."""
+    queue, created, lines = ["in"], 1, []
+    while queue:
+        workflow = queue.pop(0)
+
+        def target(force_new: bool = False) -> str:
+            nonlocal created
+            if created < size and (force_new or rng.random() < 0.7):
+                queue.append(name(created))
+                created += 1
+                return queue[-1]
+            return rng.choice("AR")
+
+        rules = [
+            f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{target()}" for _ in range(rng.randint(1, 3))
+        ]
+        # Keep growing the tree if every other branch has ended
+        rules.append(target(force_new=not queue))
+        lines.append(f"{workflow}{{{','.join(rules)}}}")
+
+    parts = [
+        f"{{x={rng.randint(1, 4000)},m={rng.randint(1, 4000)},a={rng.randint(1, 4000)},s={rng.randint(1, 4000)}}}"
+        for _ in range(size)
+    ]
+    return "\n".join(lines) + "\n\n" + "\n".join(parts) + "\n"
+
+
+@generator("20", base_size=2, unit="counters")
+def module_network(size: int, rng: random.Random) -> str:
+    """
+    The same shape as the real input: `size` 12 bit counters made of flip-flops, each with a conjunction that fires
+    (and resets the counter) every `period` presses, where the periods are distinct primes. rx gets a low pulse when
+    they all fire together.
+    """
+    periods = rng.sample(primes_between(2**11, 2**12), k=size)
+    lines, names = [], iter(map(name, range(size * 14 + 1)))
+    final = next(names)
+
+    first_flip_flops = []
+    for period in periods:
+        flip_flops = [next(names) for _ in range(12)]
+        hub, inverter = next(names), next(names)
+        first_flip_flops.append(flip_flops[0])
+
+        hub_outputs = [flip_flops[0]]
+        for bit, flip_flop in enumerate(flip_flops):
+            outputs = flip_flops[bit + 1 : bit + 2]
+            if period >> bit & 1:
+                outputs.append(hub)
+            elif bit:
+                hub_outputs.append(flip_flop)
+            lines.append(f"%{flip_flop} -> {', '.join(outputs)}")
+        lines.append(f"&{hub} -> {', '.join(hub_outputs + [inverter])}")
+        lines.append(f"&{inverter} -> {final}")
+
+    lines.append(f"&{final} -> rx")
+    lines.append(f"broadcaster -> {', '.join(first_flip_flops)}")
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
+
+
+@generator("21", base_size=17, unit="grid side")
+def garden_map(size: int, rng: random.Random) -> str:
+    """A square garden with an odd side, starting in the middle, with its middle row and column clear of rocks."""
+    size |= 1
+    grid = random_grid(size, rng, {".": 0.9, "#": 0.1})
+    middle = size // 2
+    for i in range(size):
+        grid[middle][i] = grid[i][middle] = "."
+    grid[middle][middle] = "S"
+    return join_grid(grid)
+
+
+def test_name():
+    assert [name(i) for i in (0, 1, 26, 26**3)] == ["aaa", "aab", "aba", "baaa"]
+    assert len({name(i) for i in range(30_000)}) == 30_000
+
+
+@parametrize("day", sorted(GENERATORS))
+def test_generators_make_valid_inputs(day):
+    import importlib
+
+    from helpers import call_part
+
+    module = importlib.import_module(f"day_{day}")
+    data = GENERATORS[day](GENERATORS[day].base_size)
+    assert data == GENERATORS[day](GENERATORS[day].base_size)
+    assert data != GENERATORS[day](GENERATORS[day].base_size, seed=1)
+
+    # Day 21 part 2 relies on the real input's exact size
+    parts = [module.part1] if day == "21" else [module.part1, module.part2]
+    for part in parts:
+        assert call_part(part, data) is not None
+
+
+def test_module_network_fires_at_product_of_periods():
+    import math
+
+    import day_20
+
+    periods = random.Random("20:3:0").sample(primes_between(2**11, 2**12), k=3)
+    assert day_20.part2(GENERATORS["20"](3)) == math.prod(periods)
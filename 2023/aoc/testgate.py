@@ -0,0 +1,97 @@
+import itertools
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Any, Callable, Iterable, Optional
+
+
+def _parametrize_cases(argnames, argvalues) -> list[dict[str, Any]]:
+    if isinstance(argnames, str):
+        argnames = [name.strip() for name in argnames.split(",") if name.strip()]
+
+    cases = []
+    for values in argvalues:
+        # Unwrap `pytest.param(...)`
+        if type(values).__name__ == "ParameterSet":
+            values = values.values
+        elif len(argnames) == 1:
+            values = (values,)
+        cases.append(dict(zip(argnames, values)))
+    return cases
+
+
+def expand_test(func: Callable) -> Optional[list[dict[str, Any]]]:
+    """
+    Returns the keyword arguments for each case of a (possibly parametrized) test function, or None if it needs
+    something we can't provide without pytest itself (e.g. fixtures).
+    """
+    marks = [mark.args[:2] for mark in getattr(func, "pytestmark", []) if mark.name == "parametrize"]
+    # Cases recorded by `aoc.testing.parametrize` when pytest wasn't loaded
+    marks += getattr(func, "parametrize", [])
+    cases: list[dict[str, Any]] = [{}]
+    if marks:
+        cases = [
+            {k: v for case in combination for k, v in case.items()}
+            for combination in itertools.product(*(_parametrize_cases(*mark) for mark in marks))
+        ]
+
+    required = func.__code__.co_varnames[: func.__code__.co_argcount]
+    if any(set(required) != set(case) for case in cases):
+        return None
+    return cases
+
+
+def collect_tests(module, part: int) -> Iterable[tuple[str, Callable]]:
+    """Finds the same tests as `pytest -k test_partN` would for a day module."""
+    for name, func in vars(module).items():
+        if f"test_part{part}" in name and callable(func) and getattr(func, "__module__", None) == module.__name__:
+            yield name, func
+
+
+def run_tests(module, part: int) -> Optional[list[str]]:
+    """
+    Runs a day's tests for a part in-process. Returns the names of any failing tests, or None if the tests can't be
+    run without pytest.
+    """
+    failures = []
+    for name, func in collect_tests(module, part):
+        cases = expand_test(func)
+        if cases is None:
+            return None
+
+        for i, kwargs in enumerate(cases):
+            try:
+                with redirect_stdout(StringIO()):
+                    func(**kwargs)
+            except Exception:
+                failures.append(f"{name}[{i}]" if len(cases) > 1 else name)
+
+    return failures
+
+
+def test_expand_test():
+    import pytest
+
+    @pytest.mark.parametrize("a, b", ((1, 2), pytest.param(3, 4)))
+    @pytest.mark.parametrize("c", (5, 6))
+    def parametrized(a, b, c):
+        pass
+
+    def needs_fixture(tmp_path):
+        pass
+
+    assert expand_test(parametrized) == [
+        {"c": 5, "a": 1, "b": 2},
+        {"c": 5, "a": 3, "b": 4},
+        {"c": 6, "a": 1, "b": 2},
+        {"c": 6, "a": 3, "b": 4},
+    ]
+    assert expand_test(needs_fixture) is None
+
+
+def test_expand_test_without_pytest():
+    def parametrized(a, b):
+        pass
+
+    parametrized.parametrize = [("a, b", [(1, 2), (3, 4)])]  # type: ignore[attr-defined]
+    assert expand_test(parametrized) == [{"a": 1, "b": 2}, {"a": 3, "b": 4}]
+    assert expand_test(test_expand_test) == [{}]
@@ -0,0 +1,19 @@
+import sys
+from typing import Any, Callable, Iterable
+
+
+def parametrize(argnames: str, argvalues: Iterable[Any]) -> Callable:
+    """
+    `pytest.mark.parametrize`, without importing pytest just to decorate tests. Under pytest this is the real mark;
+    otherwise the cases are recorded on the function for `aoc.testgate` to run.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if "pytest" in sys.modules:
+            return sys.modules["pytest"].mark.parametrize(argnames, argvalues)(func)
+
+        cases = (argnames, list(argvalues))
+        func.parametrize = [*getattr(func, "parametrize", []), cases]  # type: ignore[attr-defined]
+        return func
+
+    return decorator
@@ -0,0 +1,221 @@
+import argparse
+import importlib
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from time import perf_counter
+from typing import Any, Callable, Optional, TypeVar
+
+from aoc.answers import code_hash
+from aoc.budget import Budget, budget_for, describe, run_within
+from aoc.cache import CACHE_DIR, atomic_write_bytes, sha256
+from aoc.day import declares_day
+from aoc.testing import parametrize
+from helpers import call_part, get_input_filepath
+
+# Rankings of each day's variants, from `./run.py variants`
+VARIANTS_DIR = CACHE_DIR / "variants"
+
+F = TypeVar("F", bound=Callable)
+
+
+def variant(part: int) -> Callable[[F], F]:
+    """
+    Registers a function as another way of solving `part` of its day, taking the same input as `partN`:
+
+        @variant(1)
+        def part1_quadratic(file_contents: str) -> int:
+            ...
+    """
+
+    def register(func: F) -> F:
+        func.variant_of = part  # type: ignore[attr-defined]
+        return func
+
+    return register
+
+
+def variants(module) -> dict[int, dict[str, Callable]]:
+    """Each part's `partN` and registered variants, by name, `partN` first."""
+    found: dict[int, dict[str, Callable]] = {1: {}, 2: {}}
+    for part in found:
+        if callable(func := getattr(module, f"part{part}", None)):
+            found[part][func.__name__] = func
+    for name, func in vars(module).items():
+        if getattr(func, "variant_of", None) in found and getattr(func, "__module__", None) == module.__name__:
+            found[func.variant_of][name] = func
+    return found
+
+
+def part_of(name: str, func: Callable) -> int:
+    """The part a `partN`, `partN_something` or registered variant solves."""
+    return getattr(func, "variant_of", None) or int(name[4])
+
+
+def _timed_call(func: Callable, file_contents: str) -> tuple[Any, float]:
+    with redirect_stdout(StringIO()):
+        start = perf_counter()
+        answer = call_part(func, file_contents)
+        return answer, (perf_counter() - start) * 1000
+
+
+def solve_variants(funcs: dict[str, Callable], file_contents: str, budget: Budget, repeat: int = 1) -> dict[str, dict]:
+    """
+    Each variant's answer (or error) and median time (ms). Every call is made in a child process within the budget, so
+    one variant can't warm a cache (e.g. `functools.cache`) for the next, or for its own next call, and a brute force
+    variant that runs away is stopped.
+    """
+    import statistics
+
+    results = {}
+    for name, func in funcs.items():
+        samples = []
+        for _ in range(repeat):
+            outcome = run_within(budget, _timed_call, func, file_contents)
+            if not outcome.ok:
+                results[name] = {"error": describe(outcome, budget)}
+                break
+            answer, ms = outcome.value
+            samples.append(ms)
+        else:
+            results[name] = {"answer": answer, "ms": statistics.median(samples)}
+    return results
+
+
+def disagreements(results: dict[str, dict]) -> list[str]:
+    """Which variants gave a different answer to the first one, or failed, e.g. `["part1_fast: 12 != 13"]`."""
+    expected = next(iter(results.values())).get("answer")
+    found = []
+    for name, result in results.items():
+        if "error" in result:
+            found.append(f"{name}: {result['error']}")
+        elif result["answer"] != expected:
+            found.append(f"{name}: {result['answer']!r} != {expected!r}")
+    return found
+
+
+def _ranking_path(module):
+    return VARIANTS_DIR / f"{module.__name__}.json"
+
+
+def check_day(day: str, repeat: int = 3) -> dict[int, dict]:
+    """
+    Checks each part's variants agree on the day's `test_data` and real input, then ranks them by speed on the real
+    input. Rankings are saved for `fastest()`, along with hashes of the code and input they're for.
+    """
+    module = importlib.import_module(f"day_{day}")
+    test_data = getattr(module, "test_data", None)
+    real_input = None
+    if os.path.exists(get_input_filepath(day)):
+        with open(get_input_filepath(day)) as f:
+            real_input = f.read()
+
+    report: dict[int, dict] = {}
+    for part, funcs in variants(module).items():
+        budget = budget_for(module, day, part)
+        problems = disagreements(solve_variants(funcs, test_data, budget)) if isinstance(test_data, str) else []
+        timings = {}
+        if real_input is not None and not problems:
+            results = solve_variants(funcs, real_input, budget, repeat)
+            problems = [f"{problem} (real input)" for problem in disagreements(results)]
+            timings = {name: result["ms"] for name, result in results.items() if "ms" in result}
+        report[part] = {
+            "verified": not problems and real_input is not None,
+            "disagreements": problems,
+            # Fastest first
+            "ms": dict(sorted(timings.items(), key=lambda item: item[1])),
+        }
+
+    if real_input is not None:
+        ranking = {"code_hash": code_hash(module.__name__), "input_hash": sha256(real_input), "parts": report}
+        atomic_write_bytes(_ranking_path(module), json.dumps(ranking, indent=2).encode())
+    return report
+
+
+def fastest(module, part: int, file_contents: str) -> Optional[Callable]:
+    """
+    The fastest variant of a part for this input, if `./run.py variants` verified them all against each other since
+    the code last changed. Days declaring a `Day` solve through it, so don't have variants.
+    """
+    if declares_day(module):
+        return None
+    try:
+        ranking = json.loads(_ranking_path(module).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if ranking["code_hash"] != code_hash(module.__name__) or ranking["input_hash"] != sha256(file_contents):
+        return None
+    report = ranking["parts"][str(part)]
+    if not report["verified"] or not report["ms"]:
+        return None
+    return getattr(module, next(iter(report["ms"])), None)
+
+
+def choose(module, part: int, file_contents: str) -> Callable:
+    """The fastest verified variant of a part, or `partN`."""
+    return fastest(module, part, file_contents) or getattr(module, f"part{part}")
+
+
+def print_report(reports: dict[str, dict[int, dict]]):
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table("Day", "Part", "Variant", "Median (ms)", "Verified", title="Variants, fastest first")
+    for day, report in reports.items():
+        for part, result in report.items():
+            for problem in result["disagreements"]:
+                table.add_row(day, str(part), f"[red]{problem}[/red]", "-", "❌")
+            for name, ms in result["ms"].items():
+                table.add_row(day, str(part), name, f"{ms:.3f}", "✅" if result["verified"] else "-")
+    Console().print(table)
+
+
+def main(argv: list[str]):
+    from aoc.bench import discover_days
+
+    parser = argparse.ArgumentParser(
+        prog="run.py variants",
+        description="Check each part's variants give the same answers, and rank them by speed on the real input.",
+    )
+    parser.add_argument("days", nargs="*", help="Days to check, e.g. 06 12 (default: days with more than one variant)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed calls per variant")
+    args = parser.parse_args(argv)
+
+    days = [f"{int(day):02}" for day in args.days] or [
+        day
+        for day in discover_days()
+        if any(len(funcs) > 1 for funcs in variants(importlib.import_module(f"day_{day}")).values())
+    ]
+    reports = {day: check_day(day, repeat=args.repeat) for day in days}
+    print_report(reports)
+    if any(result["disagreements"] for report in reports.values() for result in report.values()):
+        sys.exit(1)
+
+
+@parametrize("day", ["06", "12"])
+def test_variants_agree_on_test_data(day):
+    module = importlib.import_module(f"day_{day}")
+    for part, funcs in variants(module).items():
+        results = solve_variants(funcs, module.test_data, Budget(seconds=10))
+        assert disagreements(results) == [] and all(result["ms"] > 0 for result in results.values())
+    assert len(variants(module)[1]) == 2
+
+    results = {"part1": {"answer": 1}, "part1_fast": {"answer": 2}, "part1_broken": {"error": "ValueError"}}
+    assert disagreements(results) == ["part1_fast: 2 != 1", "part1_broken: ValueError"]
+
+
+def test_fastest(tmp_path, monkeypatch):
+    import day_06
+
+    monkeypatch.setitem(globals(), "VARIANTS_DIR", tmp_path)
+    monkeypatch.setitem(globals(), "get_input_filepath", lambda day: str(tmp_path / f"{day}.txt"))
+    (tmp_path / "06.txt").write_text(day_06.test_data)
+
+    assert fastest(day_06, 1, day_06.test_data) is None
+    report = check_day("06", repeat=1)
+    assert report[1]["verified"] and set(report[1]["ms"]) == {"part1", "part1_quadratic"}
+    assert fastest(day_06, 1, day_06.test_data) is getattr(day_06, next(iter(report[1]["ms"])))
+    # Only for the input it was ranked on
+    assert choose(day_06, 1, day_06.test_data + "\n") is day_06.part1
@@ -0,0 +1,134 @@
+import itertools
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+from aoc.answers import ROOT
+from aoc.grid import Grid
+
+# Visualisations are off unless asked for (`./run.py --viz` or AOC_VIZ=1), so solving never pays for rendering.
+# Animation frames are written to this directory, wherever it's run from.
+FRAMES_DIR = ROOT / "viz"
+
+
+def enabled() -> bool:
+    return os.environ.get("AOC_VIZ") == "1"
+
+
+def enable():
+    # Through the environment, so worker processes see it too
+    os.environ["AOC_VIZ"] = "1"
+
+
+def _runs(grid: Grid, x: int, key: Callable[[int], Optional[str]]):
+    """(first column, length, key) for each run of cells in row `x` with the same key."""
+    y = 0
+    indices = [grid.index(x, col) for col in range(grid.width)]
+    for value, run in itertools.groupby(indices, key):
+        length = sum(1 for _ in run)
+        yield y, length, value
+        y += length
+
+
+def render(grid: Grid, style_of: Callable[[int], Optional[str]]):
+    """
+    The grid as rich Text, styling each cell (by flat index) with a rich style string. Cells are appended in runs of
+    the same style, so a whole grid is a few thousand spans rather than a console call per cell.
+    """
+    from rich.text import Text
+
+    text = Text()
+    for x in range(grid.height):
+        row = grid.row(x).tobytes().decode()
+        for y, length, style in _runs(grid, x, style_of):
+            text.append(row[y : y + length], style=style or "")
+        text.append("\n")
+    return text
+
+
+def show(grid: Grid, style_of: Callable[[int], Optional[str]]):
+    from rich.console import Console
+
+    Console(highlight=False).print(render(grid, style_of), end="")
+
+
+def write_svg(path, grid: Grid, colour_of: Callable[[int], Optional[str]], cell: int = 6):
+    """
+    Draws the grid as a square of colour per cell (by flat index; None for none), writing each row to the file as it
+    goes rather than building the whole image in memory.
+    """
+    width, height = grid.width * cell, grid.height * cell
+    with open(path, "w") as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">\n')
+        for x in range(grid.height):
+            f.write(
+                "".join(
+                    f'<rect x="{y * cell}" y="{x * cell}" width="{length * cell}" height="{cell}" fill="{colour}"/>'
+                    for y, length, colour in _runs(grid, x, colour_of)
+                    if colour
+                )
+                + "\n"
+            )
+        f.write("</svg>\n")
+
+
+class Frames:
+    """
+    Frames of an animation, written as numbered SVGs as they're added. Only every `every`th frame is drawn, up to
+    `max_frames` of them, so a long animation doesn't cost a render per step.
+    """
+
+    def __init__(self, name: str, every: int = 1, max_frames: int = 100, directory: Path = FRAMES_DIR):
+        self.name = name
+        self.every = every
+        self.max_frames = max_frames
+        self.directory = directory
+        self.added = 0
+        self.written: list[Path] = []
+
+    def add(self, grid: Grid, colour_of: Callable[[int], Optional[str]]) -> bool:
+        """Draws the frame if it's sampled, returning whether it was."""
+        sampled = self.added % self.every == 0 and len(self.written) < self.max_frames
+        self.added += 1
+        if sampled:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"{self.name}-{len(self.written):04}.svg"
+            write_svg(path, grid, colour_of)
+            self.written.append(path)
+        return sampled
+
+
+_frames: dict[str, Frames] = {}
+
+
+def frames(name: str) -> Frames:
+    """The animation called `name`, sampling every AOC_VIZ_EVERY (default 1) frames."""
+    if name not in _frames:
+        _frames[name] = Frames(name, every=int(os.environ.get("AOC_VIZ_EVERY", 1)))
+    return _frames[name]
+
+
+test_grid = """
+#..
+.#.
+"""
+
+
+def test_render_batches_runs():
+    grid = Grid.parse(test_grid)
+    text = render(grid, lambda i: "red" if grid.data[i] == ord("#") else None)
+    assert text.plain == "#..\n.#.\n"
+    assert [(span.start, span.end) for span in text.spans] == [(0, 1), (5, 6)]
+
+
+def test_write_svg_and_frames(tmp_path):
+    grid = Grid.parse(test_grid)
+    colour_of = lambda i: "black" if grid.data[i] == ord("#") else "white"  # noqa: E731
+    write_svg(tmp_path / "grid.svg", grid, colour_of)
+    svg = (tmp_path / "grid.svg").read_text()
+    # A rect per run: "#" then "..", and "." then "#" then "."
+    assert svg.count("<rect") == 5 and svg.startswith("<svg") and svg.endswith("</svg>\n")
+
+    animation = Frames("test", every=2, max_frames=2, directory=tmp_path)
+    assert [animation.add(grid, colour_of) for _ in range(6)] == [True, False, True, False, False, False]
+    assert [path.name for path in animation.written] == ["test-0000.svg", "test-0001.svg"]
@@ -0,0 +1,241 @@
+import graphlib
+import importlib
+import importlib.util
+import subprocess
+import sys
+import time
+import traceback
+import types
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Optional
+
+from aoc import answers, counters, day as protocol, testgate
+from aoc.answers import ROOT
+from helpers import call_part, get_input_filepath
+
+# How often (seconds) files are checked for changes. A change is only acted on once files have stopped changing for
+# this long, so an editor saving in several writes only triggers one run.
+POLL_EVERY = 0.05
+
+# Reloading the watcher (or run.py) from under itself would leave it running the old code anyway
+NEVER_RELOAD = {"__main__", "run", __name__}
+
+
+def watched_files(day: str) -> list[Path]:
+    return [
+        ROOT / f"day_{day}.py",
+        ROOT / "helpers.py",
+        *sorted((ROOT / "aoc").glob("*.py")),
+        ROOT / get_input_filepath(day),
+    ]
+
+
+def mtimes(paths: list[Path]) -> dict[Path, Optional[int]]:
+    result: dict[Path, Optional[int]] = {}
+    for path in paths:
+        try:
+            result[path] = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            result[path] = None
+    return result
+
+
+def wait_for_changes(paths: list[Path], last: dict[Path, Optional[int]]) -> dict[Path, Optional[int]]:
+    """Blocks until some of the files change, then returns their new mtimes once they've settled."""
+    while (current := mtimes(paths)) == last:
+        time.sleep(POLL_EVERY)
+    while (settled := mtimes(paths)) != current:
+        current = settled
+        time.sleep(POLL_EVERY)
+    return current
+
+
+def local_modules(root: Path = ROOT) -> dict[Path, Any]:
+    """Every imported module that's a file under `root` (this repo), by path."""
+    modules = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if name not in NEVER_RELOAD and path and Path(path).resolve().is_relative_to(root):
+            modules[Path(path).resolve()] = module
+    return modules
+
+
+def imported_from(module) -> set[str]:
+    """
+    The names of the modules a module imported, going by what's in its namespace: modules, and where functions and
+    classes were defined. Unlike reading its source, this skips imports inside functions, e.g. in tests.
+    """
+    names = set()
+    for value in vars(module).values():
+        name = value.__name__ if isinstance(value, types.ModuleType) else getattr(value, "__module__", None)
+        if isinstance(name, str):
+            names.add(name)
+    return names
+
+
+def reload_changed(changed: set[Path], root: Path = ROOT) -> list[str]:
+    """
+    Reloads the modules under `root` whose files changed, and then every module there that imports them (directly or
+    not), so none are left holding functions from the old code. Returns the names of the modules reloaded.
+    """
+    modules = {module.__name__: module for module in local_modules(root).values()}
+    imports = {name: imported_from(module) & modules.keys() - {name} for name, module in modules.items()}
+    stale = {name for name, module in modules.items() if Path(module.__file__).resolve() in changed}
+    while importers := {name for name, imported in imports.items() if imported & stale} - stale:
+        stale |= importers
+
+    was_counting = counters.enabled()
+    # Every module is reloaded after the ones it imports
+    reloaded = list(graphlib.TopologicalSorter({name: imports[name] & stale for name in stale}).static_order())
+    for name in reloaded:
+        # The bytecode cache is only checked against the source's mtime in seconds (and its size), so a quick edit can
+        # otherwise load the old code
+        Path(importlib.util.cache_from_source(modules[name].__file__)).unlink(missing_ok=True)
+        importlib.reload(modules[name])
+    if was_counting:
+        counters.enable()
+    # Code hashes are cached for the life of the process, so answers would be looked up for the old code
+    answers.code_hash.cache_clear()
+    return reloaded
+
+
+def passes_tests(module, part: int) -> bool:
+    failures = testgate.run_tests(module, part)
+    if failures is None:
+        # Needs fixtures, so needs pytest, which is much slower to collect than running the tests here
+        command = [sys.executable, "-m", "pytest", module.__file__, "-k", f"test_part{part}", "-q"]
+        return subprocess.run(command).returncode == 0
+    for failure in failures:
+        print(f"\t  Failed: {failure}")
+    return not failures
+
+
+class Solver:
+    """
+    Solves a day's parts, keeping its input (and, for days declaring a `Day`, its parsed input) in memory between runs.
+    The input is read again when it changes, and parsed again when it, the day's `parse` or any other module changes.
+    """
+
+    def __init__(self, day: str):
+        self.day = day
+        self.file_contents: Optional[str] = None
+        self.run: Optional[protocol.DayRun] = None
+        self.parse_source: Optional[str] = None
+
+    def read_input(self) -> Optional[str]:
+        try:
+            with open(ROOT / get_input_filepath(self.day)) as f:
+                file_contents = f.read()
+        except FileNotFoundError:
+            return None
+        if file_contents != self.file_contents:
+            self.file_contents, self.run = file_contents, None
+        return file_contents
+
+    def forget_parsed(self):
+        self.run = None
+
+    def solve(self, module, part: int) -> tuple[Any, float]:
+        assert self.file_contents is not None
+        start = perf_counter()
+        if protocol.declares_day(module):
+            day = protocol.load(module)
+            parse_source = _source(day.parse)
+            if self.run is None or parse_source != self.parse_source:
+                self.run, self.parse_source = protocol.DayRun(day, self.file_contents), parse_source
+            else:
+                # Keep what was parsed, but solve with the new code, and don't trust what the old code shared
+                self.run.day, self.run.shared = day, {}
+            answer = self.run.solve(part)
+        else:
+            answer = call_part(getattr(module, f"part{part}"), self.file_contents)
+        return answer, (perf_counter() - start) * 1000
+
+
+def _source(func) -> str:
+    import inspect
+
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return repr(func)
+
+
+def run_once(day: str, solver: Solver):
+    module = importlib.import_module(f"day_{day}")
+    if solver.read_input() is None:
+        print(f"\tNo input at {get_input_filepath(day)}, only testing")
+
+    for part in (1, 2):
+        start = perf_counter()
+        passed = passes_tests(module, part)
+        print(f"Part {part}: tests {'✅' if passed else '❌'} ({(perf_counter() - start) * 1000:.1f}ms)")
+        if not passed or solver.file_contents is None:
+            continue
+        answer, ms = solver.solve(module, part)
+        print(f"\tAnswer: {answer} ({ms:.3f}ms)")
+
+
+def watch(day: str):
+    """Runs a day's tests and solves both parts, and does it again whenever its code, the `aoc` code or input change."""
+    day = f"{int(day):02}"
+    paths = watched_files(day)
+    solver = Solver(day)
+    last = mtimes(paths)
+    print(f"Watching day {day} (Ctrl-C to stop)")
+
+    reload_failed = False
+    while True:
+        if not reload_failed:
+            try:
+                run_once(day, solver)
+            except Exception:
+                traceback.print_exc()
+            print()
+
+        try:
+            current = wait_for_changes(paths, last)
+        except KeyboardInterrupt:
+            return
+        changed = {path for path in paths if current[path] != last[path]}
+        last = current
+
+        start = perf_counter()
+        try:
+            reloaded = reload_changed({path.resolve() for path in changed})
+        except Exception:
+            # e.g. a syntax error; wait for it to be fixed
+            traceback.print_exc()
+            reload_failed = True
+            continue
+        reload_failed = False
+        if set(reloaded) - {f"day_{day}"}:
+            # `parse` may use any of them, or have returned their classes
+            solver.forget_parsed()
+        names = ", ".join(path.name for path in sorted(changed))
+        print(
+            f"Changed: {names}; reloaded {', '.join(reloaded) or 'nothing'} ({(perf_counter() - start) * 1000:.1f}ms)"
+        )
+
+
+def test_reload_changed(tmp_path, monkeypatch):
+    # Two throwaway modules in a package of their own, away from the repo: `second` imports `first`
+    root = tmp_path.resolve()
+    package = root / "watch_test"
+    package.mkdir()
+    first, second = package / "first.py", package / "second.py"
+    first.write_text("def value():\n    return 1\n")
+    second.write_text("from watch_test.first import value\n")
+    monkeypatch.syspath_prepend(str(root))
+    try:
+        module = importlib.import_module("watch_test.second")
+        assert module.value() == 1
+
+        first.write_text("def value():\n    return 2\n")
+        reloaded = reload_changed({first}, root=root)
+        assert reloaded == ["watch_test.first", "watch_test.second"]
+        assert module.value() == 2
+    finally:
+        for name in ("watch_test", "watch_test.first", "watch_test.second"):
+            sys.modules.pop(name, None)
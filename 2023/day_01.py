@@ -1,10 +1,13 @@
 #!/usr/bin/env python
 
-from rich import print
-
+from aoc.day import Day
 from helpers import load_input
 
 
+def parse(file_contents: str) -> list[str]:
+    return file_contents.strip().splitlines()
+
+
 def part1(data: list[str]) -> int:
     def _yield_values():
         for line in data:
@@ -81,8 +84,13 @@ def part2(data: list[str]) -> int:
     return sum(_yield_values())
 
 
+DAY = Day(parse=parse, part1=part1, part2=part2)
+
+
 if __name__ == "__main__":
-    data = load_input(__file__).strip().splitlines()
+    from rich import print
+
+    data = parse(load_input(__file__))
     answer1, answer2 = part1(data), part2(data)
     print(f"Answer is: {answer1=}, {answer2=}")
 
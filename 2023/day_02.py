@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 
-from rich import print
 from typing import Iterable
 
+from aoc.day import Day
 from helpers import load_input
 
 
+def parse(file_contents: str) -> list[str]:
+    return file_contents.strip().splitlines()
+
+
 def yield_games(lines: list[str]) -> Iterable[tuple[int, str]]:
     for line in lines:
         game, game_cubedraws = line.split(":")
@@ -55,9 +59,14 @@ def part2(lines: list[str]) -> int:
     return sum(calculate_game_power(game_cubedraws) for game_id, game_cubedraws in yield_games(lines))
 
 
+DAY = Day(parse=parse, part1=part1, part2=part2)
+
+
 if __name__ == "__main__":
-    data = load_input(__file__).strip().splitlines()
-    answer1, answer2 = part1(data), part2(data)
+    from rich import print
+
+    lines = parse(load_input(__file__))
+    answer1, answer2 = part1(lines), part2(lines)
     print(f"Answer is: {answer1=}, {answer2=}")
 
 
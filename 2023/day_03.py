@@ -1,64 +1,57 @@
 #!/usr/bin/env python3
 
-import itertools
+import re
 import string
 from typing import Iterator
 from collections import defaultdict
 
-from rich import print
-
+from aoc import gridops
+from aoc.grid import Grid
 from helpers import load_input
 
 
-def yield_all_possible_parts_with_boundaries(
-    grid: tuple[tuple[str, ...], ...]
-) -> Iterator[tuple[int, tuple[int, int], tuple[int, int]]]:
-    """Read the entire schematic and yield ((x, y1), (x, y2)) coords pairs encapsulating all possible part numbers"""
-    for x, row in enumerate(grid):
-        y1 = None
-        for y, char in enumerate(row):
-            if char.isdigit():
-                if y1 is None:
-                    # Starting character of a part number
-                    y1 = y
-            else:
-                if y1 is not None:
-                    # We've moved beyond the last character of a part number, yield it and its grid co-ords
-                    yield int("".join(row[y1:y])), (x, y1), (x, y)
-                    y1 = None
-        if y1 is not None:
-            # We've moved beyond the last character of a part number, yield it and its grid co-ords
-            yield int("".join(row[y1 : y + 1])), (x, y1), (x, y)
-
-
-def get_part_border_coords(x, y1, y2) -> Iterator[tuple[int, int]]:
-    return itertools.chain(
-        [(x - 1, y) for y in range(y1 - 1, y2 + 1)],
-        [(x, y1 - 1)],
-        [(x, y2)],
-        [(x + 1, y) for y in range(y1 - 1, y2 + 1)],
-    )
+SYMBOLS = string.punctuation.replace(".", "")
+GEAR = ord("*")
 
 
-def yield_valid_parts(
-    grid, parts_with_boundaries: Iterator[tuple[int, tuple[int, int], tuple[int, int]]]
-) -> Iterator[int]:
+def yield_all_possible_parts_with_boundaries(grid: Grid) -> Iterator[tuple[int, int, int]]:
     """
-    Take a list of (part_num, (x, y1), (x, y2)) entries and check if any of its border coords is a non-period symbol.
+    Read the entire schematic and yield (part_number, start, stop) for all possible part numbers, where start/stop are
+    the flat indices of its first digit and of the character after its last.
     """
-    symbols = set(string.punctuation)
-    symbols.remove(".")
+    # Rows are separated by newlines, so a number can't run from one row into the next
+    for match in re.finditer(rb"\d+", grid.data):
+        yield int(match[0]), match.start(), match.end()
 
-    for part_number, start, stop in parts_with_boundaries:  # type: int, tuple[int, int], tuple[int, int]
-        for x, y in get_part_border_coords(start[0], start[1], stop[1]):
-            if 0 <= x < len(grid) and 0 <= y < len(grid[x]):
-                if grid[x][y] in symbols:
-                    yield part_number
-                    break
+
+def get_part_border_indices(grid: Grid, start: int, stop: int) -> Iterator[int]:
+    """
+    Flat indices of every cell around a part number. Stepping off either side of a row lands on a newline, which is
+    never a symbol, so only the ends of the grid need checking.
+    """
+    size = len(grid.data)
+    for i in (
+        *range(start - 1 - grid.stride, stop + 1 - grid.stride),
+        start - 1,
+        stop,
+        *range(start - 1 + grid.stride, stop + 1 + grid.stride),
+    ):
+        if 0 <= i < size:
+            yield i
+
+
+def yield_valid_parts(grid: Grid, parts_with_boundaries: Iterator[tuple[int, int, int]]) -> Iterator[int]:
+    """
+    Take a list of (part_num, start, stop) entries and check if any of its digits is next to a non-period symbol.
+    """
+    next_to_symbol = gridops.neighbour_mask(grid, SYMBOLS)
+    for part_number, start, stop in parts_with_boundaries:
+        if any(next_to_symbol[start:stop]):
+            yield part_number
 
 
-def make_grid(schematic: str) -> tuple[tuple[str, ...], ...]:
-    return tuple([tuple([char for char in line.strip()]) for line in schematic.strip().split("\n")])
+def make_grid(schematic: str) -> Grid:
+    return Grid.parse(schematic)
 
 
 def part1(schematic: str):
@@ -71,22 +64,23 @@ def part1(schematic: str):
 
 def part2(schematic):
     grid = make_grid(schematic)
-    gear_coords_to_part_numbers = defaultdict(list)
+    gear_indices_to_part_numbers = defaultdict(list)
 
     for part_number, start, stop in yield_all_possible_parts_with_boundaries(grid):
-        for x, y in get_part_border_coords(start[0], start[1], stop[1]):
-            if 0 <= x < len(grid) and 0 <= y < len(grid[x]):
-                if grid[x][y] == "*":
-                    gear_coords_to_part_numbers[(x, y)].append(part_number)
+        for i in get_part_border_indices(grid, start, stop):
+            if grid.data[i] == GEAR:
+                gear_indices_to_part_numbers[i].append(part_number)
 
     return sum(
         part_numbers[0] * part_numbers[1]
-        for part_numbers in gear_coords_to_part_numbers.values()
+        for part_numbers in gear_indices_to_part_numbers.values()
         if len(part_numbers) == 2
     )
 
 
 if __name__ == "__main__":
+    from rich import print
+
     data = load_input(__file__)
     answer1, answer2 = part1(data), part2(data)
     print(f"Answer is: {answer1=}, {answer2=}")
@@ -107,48 +101,51 @@ data = """
 
 
 def test_part1_make_grid():
-    assert make_grid(data) == (
-        ("4", "6", "7", ".", ".", "1", "1", "4", ".", "."),
-        (".", ".", ".", "*", ".", ".", ".", ".", ".", "."),
-        (".", ".", "3", "5", ".", ".", "6", "3", "3", "."),
-        (".", ".", ".", ".", ".", ".", "#", ".", ".", "."),
-        ("6", "1", "7", "*", ".", ".", ".", ".", ".", "."),
-        (".", ".", ".", ".", ".", "+", ".", "5", "8", "."),
-        (".", ".", "5", "9", "2", ".", ".", ".", ".", "."),
-        (".", ".", ".", ".", ".", ".", "7", "5", "5", "."),
-        (".", ".", ".", "$", ".", "*", ".", ".", ".", "."),
-        (".", "6", "6", "4", ".", "5", "9", "8", ".", "."),
-    )
+    grid = make_grid(data)
+    assert (grid.height, grid.width) == (10, 10)
+    assert str(grid) == data.strip()
+    assert grid[3, 6] == "#" and grid[4, 3] == "*"
 
 
 def test_part1_yield_all_possible_parts_with_boundaries():
-    assert list(yield_all_possible_parts_with_boundaries(make_grid(data))) == [
-        (467, (0, 0), (0, 3)),
-        (114, (0, 5), (0, 8)),
-        (35, (2, 2), (2, 4)),
-        (633, (2, 6), (2, 9)),
-        (617, (4, 0), (4, 3)),
-        (58, (5, 7), (5, 9)),
-        (592, (6, 2), (6, 5)),
-        (755, (7, 6), (7, 9)),
-        (664, (9, 1), (9, 4)),
-        (598, (9, 5), (9, 8)),
+    grid = make_grid(data)
+    assert list(yield_all_possible_parts_with_boundaries(grid)) == [
+        (467, grid.index(0, 0), grid.index(0, 3)),
+        (114, grid.index(0, 5), grid.index(0, 8)),
+        (35, grid.index(2, 2), grid.index(2, 4)),
+        (633, grid.index(2, 6), grid.index(2, 9)),
+        (617, grid.index(4, 0), grid.index(4, 3)),
+        (58, grid.index(5, 7), grid.index(5, 9)),
+        (592, grid.index(6, 2), grid.index(6, 5)),
+        (755, grid.index(7, 6), grid.index(7, 9)),
+        (664, grid.index(9, 1), grid.index(9, 4)),
+        (598, grid.index(9, 5), grid.index(9, 8)),
+    ]
+
+
+def test_part1_get_part_border_indices():
+    grid = make_grid(data)
+    border = [grid.coord(i) for i in get_part_border_indices(grid, grid.index(0, 0), grid.index(0, 3))]
+    # Index -1, before 467, is off the start of the data so is skipped. The range for the row below starts on the
+    # newline at the end of row 0, which isn't a cell
+    assert sorted(coord for coord in border if coord in grid) == [
+        (0, 3),
+        (1, 0),
+        (1, 1),
+        (1, 2),
+        (1, 3),
     ]
 
 
 def test_part1_yield_valid_parts():
-    grid = (
-        ("1", "2", "3"),
-        (".", ".", "*"),
-        ("8", ".", "!"),
-        (".", ".", "7"),
-    )
+    grid = make_grid("123\n..*\n8.!\n..7")
     assert list(
         yield_valid_parts(
             grid,
             (
-                (123, (0, 0), (0, 3)),
-                (7, (3, 2), (3, 3)),
+                (123, grid.index(0, 0), grid.index(0, 3)),
+                (8, grid.index(2, 0), grid.index(2, 1)),
+                (7, grid.index(3, 2), grid.index(3, 3)),
             ),
         )
     ) == [123, 7]
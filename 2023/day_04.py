@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 from typing import Iterator
 
-from rich import print
 import re
 
 
@@ -30,6 +29,8 @@ def part2(file_contents: str) -> int:
 
 
 if __name__ == "__main__":
+    from rich import print
+
     with open("input/4.txt") as f:
         data = f.read()
     answer1, answer2 = part1(data), part2(data)
@@ -1,46 +1,13 @@
 #!/usr/bin/env python3
-import dataclasses
-import sys
-from typing import Optional
-
-from rich import print
+import functools
 
+from aoc.cache import parse_cache
+from aoc.intervals import IntervalMap
 from helpers import load_input
 
 
-@dataclasses.dataclass
-class AlmanacMap:
-    entries: list["AlmanacEntry"]
-
-    def lookup(self, number):
-        for entry in self.entries:
-            if entry.source_start <= number <= entry.source_end:
-                offset = number - entry.source_start
-                return entry.destination_start + offset
-
-        return number
-
-
-@dataclasses.dataclass
-class AlmanacEntry:
-    source_start: int
-    destination_start: int
-    length: int
-
-    @property
-    def source_end(self) -> int:
-        return self.source_start + self.length - 1
-
-    @property
-    def destination_end(self) -> int:
-        return self.destination_start + self.length - 1
-
-    @property
-    def offset(self) -> int:
-        return self.destination_start - self.source_start
-
-
-def parse_almanac(file_contents: str) -> tuple[list[int], list[AlmanacMap]]:
+@parse_cache
+def parse_almanac(file_contents: str) -> tuple[list[int], list[IntervalMap]]:
     paragraphs = file_contents.strip().split("\n\n")
     seeds = [int(seed) for seed in paragraphs[0][7:].split(" ")]
 
@@ -49,126 +16,32 @@ def parse_almanac(file_contents: str) -> tuple[list[int], list[AlmanacMap]]:
         entries = []
         for entry in section.splitlines()[1:]:
             destination_start, source_start, length = [int(x) for x in entry.split(" ")]
-            entries.append(AlmanacEntry(source_start=source_start, destination_start=destination_start, length=length))
-
-        almanac_maps.append(AlmanacMap(entries=sorted(entries, key=lambda entry: entry.source_start)))
+            entries.append((source_start, source_start + length, destination_start - source_start))
+        almanac_maps.append(IntervalMap(entries))
 
     return seeds, almanac_maps
 
 
-def part1(file_contents: str) -> int:
-    seeds, almanac_maps = parse_almanac(file_contents)
-
-    locations = []
-    for seed in seeds:
-        lookup = seed
-        for almanac_map in almanac_maps:
-            lookup = almanac_map.lookup(lookup)
-        locations.append(lookup)
-
-    return min(locations)
-
-
-# --------- PART 2 ---------------
-
-
-@dataclasses.dataclass
-class RangedAlmanac:
-    maps: list["RangedAlmanacMap"]
-
-    def lookup_smallest_location_for_range(self, r: "Range"):
-        map_ranges = [r]
-        for i, almanac_map in enumerate(self.maps):
-            map_ranges = almanac_map.lookup(map_ranges)
-
-        return min(r.first for r in map_ranges)
-
-
-@dataclasses.dataclass
-class Range:
-    first: int
-    last: int
-
-
-@dataclasses.dataclass
-class RangedAlmanacMap(AlmanacMap):
-    def __post_init__(self):
-        # Add a catch-all entry for numbers that aren't in explicit ranges
-        self.entries.append(AlmanacEntry(source_start=0, destination_start=0, length=sys.maxsize))
+def seed_to_location(almanac_maps: list[IntervalMap]) -> IntervalMap:
+    """All of the maps, one after another, as a single map."""
+    return functools.reduce(IntervalMap.then, almanac_maps)
 
-    def _overlay_ranges(self, unmapped_range: Range, entry: AlmanacEntry) -> tuple[Optional[Range], list[Range]]:
-        """Returns (mapped_range, [unmapped_range, ...]"""
-        mapped, unmapped = None, []
-        if unmapped_range.first > entry.source_end or unmapped_range.last < entry.source_start:
-            unmapped.append(unmapped_range)
 
-        elif unmapped_range.first >= entry.source_start and unmapped_range.last <= entry.source_end:
-            mapped = Range(first=unmapped_range.first + entry.offset, last=unmapped_range.last + entry.offset)
-
-        elif unmapped_range.first < entry.source_start and unmapped_range.last > entry.source_end:
-            mapped = Range(first=entry.source_start + entry.offset, last=entry.source_end + entry.offset)
-            unmapped.append(Range(first=unmapped_range.first, last=entry.source_start - 1))
-            unmapped.append(Range(first=entry.source_end + 1, last=unmapped_range.last))
-
-        elif unmapped_range.first < entry.source_start:
-            mapped = Range(first=entry.source_start + entry.offset, last=unmapped_range.last + entry.offset)
-            unmapped.append(Range(first=unmapped_range.first, last=entry.source_start - 1))
-
-        elif unmapped_range.last > entry.source_end:
-            mapped = Range(first=unmapped_range.first + entry.offset, last=entry.source_end + entry.offset)
-            unmapped.append(Range(first=entry.source_end + 1, last=unmapped_range.last))
-
-        return mapped, unmapped
-
-    def lookup(self, unmapped_ranges: list[Range]) -> list[Range]:
-        mapped_ranges = []
-
-        ranges_to_check = unmapped_ranges.copy()
-        while ranges_to_check:
-            mapped, unmapped = None, [ranges_to_check.pop()]
-            while unmapped:
-                for entry in self.entries:
-                    mapped, unmapped = self._overlay_ranges(unmapped.pop(), entry)
-                    if mapped:
-                        mapped_ranges.append(mapped)
-                    if not unmapped:
-                        break
-
-        mapped_ranges.sort(key=lambda r: r.first)
-        return mapped_ranges
-
-
-def parse_ranged_almanac(file_contents: str) -> tuple[list[Range], RangedAlmanac]:
-    paragraphs = file_contents.strip().split("\n\n")
-
-    seed_range_list = [int(seed) for seed in paragraphs[0][7:].split(" ")]
-    pairs = zip(seed_range_list[::2], seed_range_list[1::2])
-    seeds = [Range(first=x, last=x + y - 1) for x, y in pairs]
-
-    almanac_maps = []
-    for section in paragraphs[1:]:
-        entries = []
-        for entry in section.splitlines()[1:]:
-            destination_start, source_start, length = [int(x) for x in entry.split(" ")]
-            entries.append(AlmanacEntry(source_start=source_start, destination_start=destination_start, length=length))
-
-        entries = sorted(entries, key=lambda entry: entry.source_start)
-
-        almanac_maps.append(RangedAlmanacMap(entries=entries))
-
-    return seeds, RangedAlmanac(maps=almanac_maps)
+def part1(file_contents: str) -> int:
+    seeds, almanac_maps = parse_almanac(file_contents)
+    almanac_map = seed_to_location(almanac_maps)
+    return min(almanac_map[seed] for seed in seeds)
 
 
 def part2(file_contents: str) -> int:
-    source_ranges, almanac = parse_ranged_almanac(file_contents)
-    smallest_seed_locations = []
-    for source_range in source_ranges:
-        smallest_seed_locations.append(almanac.lookup_smallest_location_for_range(source_range))
-
-    return min(smallest_seed_locations)
+    seeds, almanac_maps = parse_almanac(file_contents)
+    seed_ranges = [(start, start + length) for start, length in zip(seeds[::2], seeds[1::2])]
+    return seed_to_location(almanac_maps).map_intervals(seed_ranges)[0][0]
 
 
 if __name__ == "__main__":
+    from rich import print
+
     data = load_input(__file__)
     answer1 = part1(data)
     answer2 = part2(data)
@@ -4,8 +4,7 @@ import math
 import re
 from functools import reduce
 
-from rich import print
-
+from aoc.variants import variant
 from helpers import load_input
 
 
@@ -32,6 +31,7 @@ def part1(file_contents: str) -> int:
     return reduce(lambda x, y: x * y, ways_to_beat)
 
 
+@variant(1)
 def part1_quadratic(file_contents: str) -> int:
     races = parse_racelist(file_contents)
     ways_to_beat = []
@@ -52,6 +52,7 @@ def part2(file_contents: str) -> int:
     return ways_to_beat
 
 
+@variant(2)
 def part2_quadratic(file_contents: str) -> int:
     race = parse_racelist_part2(file_contents)
     quickest, slowest = sorted(solve_quadratic(-1, race.time, -race.distance))  # type: float, float
@@ -59,6 +60,8 @@ def part2_quadratic(file_contents: str) -> int:
 
 
 if __name__ == "__main__":
+    from rich import print
+
     data = load_input(__file__)
     answer1 = part1_quadratic(data)
     answer2 = part2_quadratic(data)
@@ -4,9 +4,9 @@ import enum
 from collections import Counter
 from functools import cached_property
 
-import pytest
-from rich import print
-
+from aoc.answers import cached_call
+from aoc.cache import parse_cache
+from aoc.testing import parametrize
 from helpers import load_input
 
 
@@ -98,6 +98,7 @@ class CamelCard:
         return CamelCard(hand=hand, bid=int(bid))
 
 
+@parse_cache
 def parse_file(file_contents: str) -> list[CamelCard]:
     return [CamelCard.from_line(line) for line in file_contents.strip().splitlines()]
 
@@ -115,6 +116,8 @@ def part2(file_contents: str) -> int:
 
 
 if __name__ == "__main__":
+    from rich import print
+
     data = load_input(__file__)
     answer1 = part1(data)
     answer2 = part2(data)
@@ -136,14 +139,14 @@ def test_part1():
 
 def test_part1_real_input():
     data = load_input(__file__)
-    assert part1(data) == 256448566
+    assert cached_call(part1, data) == 256448566
 
 
 def test_part2():
     assert part2(test_data) == 5905
 
 
-@pytest.mark.parametrize(
+@parametrize(
     "hand, expected_type",
     (
         ("AAAAJ", HandType.FIVE_OAK),
@@ -168,4 +171,4 @@ def test_part2_joker_hand_types(hand, expected_type):
 
 def test_part2_real_input():
     data = load_input(__file__)
-    assert part2(data) == 254412181
+    assert cached_call(part2, data) == 254412181
@@ -1,15 +1,15 @@
 #!/usr/bin/env python3
-import functools
 import itertools
 import math
 import re
 
 from frozendict import frozendict
-from rich import print
 
+from aoc.cache import parse_cache
 from helpers import load_input
 
 
+@parse_cache
 def parse_file(file_contents: str) -> tuple[str, frozendict[str, tuple[str, str]]]:
     lines = file_contents.strip().splitlines()
     directions = lines[0].strip()
@@ -32,7 +32,6 @@ def part1(file_contents: str) -> int:
     return steps
 
 
-@functools.cache
 def find_next_z(
     start_location: str, node_map: dict[str, tuple[str, str]], steps: int, directions: str
 ) -> tuple[str, int]:
@@ -84,6 +83,8 @@ def part2(file_contents: str) -> int:
 
 
 if __name__ == "__main__":
+    from rich import print
+
     data = load_input(__file__)
     answer1 = part1(data)
     answer2 = part2(data)
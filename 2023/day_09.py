@@ -1,7 +1,5 @@
 #!/usr/bin/env python3
 
-from rich import print
-
 from helpers import load_input
 
 
@@ -25,6 +23,8 @@ def part2(file_contents: str) -> int:
 
 
 if __name__ == "__main__":
+    from rich import print
+
     data = load_input(__file__)
     answer1 = part1(data)
     answer2 = part2(data)
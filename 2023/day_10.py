@@ -1,27 +1,13 @@
 #!/usr/bin/env python3
-import dataclasses
 import enum
-from collections import Counter
-from typing import Optional
+import functools
 
-import pytest
-from rich.console import Console
-from rich.style import Style
-
-from helpers import load_input, parse_grid
-
-console = Console(record=True, highlight=False)
-
-
-@dataclasses.dataclass
-class Node:
-    char: str
-    depth: Optional[int] = None
-    inside: Optional[bool] = None
-
-    @property
-    def pipe(self):
-        return self.depth is not None
+from aoc import search, viz
+from aoc.answers import cached_call
+from aoc.day import Day
+from aoc.grid import Grid
+from aoc.testing import parametrize
+from helpers import load_input
 
 
 class Direction(enum.Enum):
@@ -46,138 +32,139 @@ class Direction(enum.Enum):
         return Direction((self.value[0] * -1, self.value[1] * -1))
 
 
-def get_node(grid: list[list[Node]], coord: tuple[int, int]) -> Node:
-    return grid[coord[0]][coord[1]]
-
-
 def get_adjacent_coord(coord: tuple[int, int], direction: Direction) -> tuple[int, int]:
     return coord[0] + direction.value[0], coord[1] + direction.value[1]
 
 
-def parse_file_contents(file_contents: str) -> list[list[Node]]:
-    grid = parse_grid(file_contents, pad_edges=".")
-    return [[Node(c) for c in row] for row in grid]
-
-
-def solve_s_piece(grid: list[list[Node]], coord: tuple[int, int]):
+def solve_s_piece(grid: Grid, coord: tuple[int, int]):
     x, y = coord
     above, left, right, below = (
-        get_node(grid, get_adjacent_coord((x, y), Direction.ABOVE)),
-        get_node(grid, get_adjacent_coord((x, y), Direction.LEFT)),
-        get_node(grid, get_adjacent_coord((x, y), Direction.RIGHT)),
-        get_node(grid, get_adjacent_coord((x, y), Direction.BELOW)),
+        grid[get_adjacent_coord((x, y), Direction.ABOVE)],
+        grid[get_adjacent_coord((x, y), Direction.LEFT)],
+        grid[get_adjacent_coord((x, y), Direction.RIGHT)],
+        grid[get_adjacent_coord((x, y), Direction.BELOW)],
     )
-    if above.char in Direction.ABOVE.pipes and left.char in Direction.LEFT.pipes:
+    if above in Direction.ABOVE.pipes and left in Direction.LEFT.pipes:
         return "J"
-    elif above.char in Direction.ABOVE.pipes and right.char in Direction.RIGHT.pipes:
+    elif above in Direction.ABOVE.pipes and right in Direction.RIGHT.pipes:
         return "L"
-    elif above.char in Direction.ABOVE.pipes and below.char in Direction.BELOW.pipes:
+    elif above in Direction.ABOVE.pipes and below in Direction.BELOW.pipes:
         return "|"
-    elif left.char in Direction.LEFT.pipes and right.char in Direction.RIGHT.pipes:
+    elif left in Direction.LEFT.pipes and right in Direction.RIGHT.pipes:
         return "-"
-    elif left.char in Direction.LEFT.pipes and below.char in Direction.BELOW.pipes:
+    elif left in Direction.LEFT.pipes and below in Direction.BELOW.pipes:
         return "7"
-    elif below.char in Direction.BELOW.pipes and right.char in Direction.RIGHT.pipes:
+    elif below in Direction.BELOW.pipes and right in Direction.RIGHT.pipes:
         return "F"
 
 
-def find_and_fix_start_tile(grid):
-    for x in range(len(grid)):
-        for y in range(len(grid[x])):
-            if grid[x][y].char == "S":
-                grid[x][y].char = solve_s_piece(grid, (x, y))
-                return x, y
-
-
-def follow_pipes_and_record_depths(grid: list[list[Node]], queue: list[tuple[tuple[int, int], int]]):
-    i = 0
-    while i < len(queue):
-        coord, depth = queue[i]
-
-        if isinstance(grid[coord[0]][coord[1]].depth, int):
-            i += 1
-            continue
-
-        self = get_node(grid, coord)
-        neighbours = [(direction, get_adjacent_coord(coord, direction)) for direction in Direction]
-        track_neighbour_depths: Counter = Counter()
-        for direction, neighbour_coord in neighbours:
-            neighbour = get_node(grid, neighbour_coord)
-            if neighbour.char in direction.pipes and self.char in direction.opposite.pipes:
-                queue.append((neighbour_coord, depth + 1))
-                grid[coord[0]][coord[1]].depth = depth
-                track_neighbour_depths.update([depth + 1])
-
-        i += 1
-
-
-def print_grid(grid: list[list[Node]], cur_coord: Optional[tuple[int, int]] = None):
-    max_depth = max([node.depth or 0 for row in grid for node in row])
-    for x, row in enumerate(grid):
-        for y, node in enumerate(row):
-            if node.pipe:
-                if cur_coord and cur_coord == (x, y):
-                    style = Style(color="white", bgcolor="rgb(0,255,0)", blink=True, blink2=True)
-                elif node.depth == max_depth or node.depth == 0:
-                    style = Style(color="black", bgcolor="rgb(255,255,0)")
-                else:
-                    r, g, b = (
-                        abs((196 if node.depth % 256 >= 128 else -64) - (node.depth % 128)),
-                        abs((196 if (node.depth // 2) % 256 >= 128 else -64) - ((node.depth // 2) % 128)),
-                        abs((196 if (node.depth // 3) % 256 >= 128 else -64) - ((node.depth // 3) % 128)),
-                    )
-                    style = Style(color="white", bgcolor=f"rgb({r}, {g}, {b})")
-                console.print(str(node.char), end="", style=style)
-            else:
-                if cur_coord and cur_coord == (x, y):
-                    style = Style(color="green", bgcolor="green", blink=True, blink2=True)
-                else:
-                    style = Style(
-                        color="rgb(75, 75, 75)",
-                        bgcolor="rgb(255, 0, 0)"
-                        if node.inside
-                        else "rgb(0, 0, 0)"
-                        if node.inside is not None
-                        else "rgb(255, 255, 255)",
-                    )
-                console.print(node.char, end="", style=style)
-        console.print("\n", end="")
-
-    console.save_svg(path="day-10.svg")
+def find_and_fix_start_tile(grid: Grid) -> int:
+    """Replaces S with the pipe it must be, returning its flat index."""
+    x, y = grid.find("S")  # type: ignore[misc]
+    grid[x, y] = solve_s_piece(grid, (x, y))
+    return grid.index(x, y)
 
 
-def part1(file_contents: str) -> int:
-    grid = parse_file_contents(file_contents)
-    coords = [(find_and_fix_start_tile(grid), 0)]
-    follow_pipes_and_record_depths(grid, coords)
-    return max(node.depth or 0 for row in grid for node in row)
+def follow_pipes_and_record_depths(grid: Grid, start: int) -> dict[int, int]:
+    """Walks the loop from a flat index, returning the depth of every pipe in it by flat index."""
+    data, size = grid.data, len(grid.data)
+    # (flat index step, pipes that connect back from that neighbour, pipes that connect out in that direction)
+    connections = [
+        (
+            direction.value[0] * grid.stride + direction.value[1],
+            {ord(c) for c in direction.pipes},
+            {ord(c) for c in direction.opposite.pipes},
+        )
+        for direction in Direction
+    ]
+
+    def neighbours(index: int) -> list[int]:
+        # Stepping off either side of a row lands on a newline, which isn't a pipe
+        return [
+            index + step
+            for step, neighbour_pipes, own_pipes in connections
+            if data[index] in own_pipes and 0 <= index + step < size and data[index + step] in neighbour_pipes
+        ]
+
+    return search.bfs([start], neighbours, size).reached()
+
+
+def cell_colours(depths: dict[int, int], inside: dict[int, bool], max_depth: int, i: int) -> tuple[str, str]:
+    """(foreground, background) for a cell: the loop coloured by depth, and tiles inside it red."""
+    depth = depths.get(i)
+    if depth is None:
+        return "rgb(75,75,75)", "rgb(255,0,0)" if inside.get(i) else "rgb(0,0,0)" if i in inside else "rgb(255,255,255)"
+    if depth == max_depth or depth == 0:
+        return "black", "rgb(255,255,0)"
+    r, g, b = (
+        abs((196 if depth % 256 >= 128 else -64) - (depth % 128)),
+        abs((196 if (depth // 2) % 256 >= 128 else -64) - ((depth // 2) % 128)),
+        abs((196 if (depth // 3) % 256 >= 128 else -64) - ((depth // 3) % 128)),
+    )
+    return "white", f"rgb({r},{g},{b})"
 
 
-def part2(file_contents: str) -> int:
-    grid = parse_file_contents(file_contents)
-    coords = [(find_and_fix_start_tile(grid), 0)]
-    follow_pipes_and_record_depths(grid, coords)
+def print_grid(grid: Grid, depths: dict[int, int], inside: dict[int, bool]):
+    colours = functools.partial(cell_colours, depths, inside, max(depths.values(), default=0))
+    viz.show(grid, lambda i: "{} on {}".format(*colours(i)))
+    viz.FRAMES_DIR.mkdir(exist_ok=True)
+    viz.write_svg(viz.FRAMES_DIR / "day-10.svg", grid, lambda i: colours(i)[1])
+
 
-    for x in range(len(grid)):
-        inside = False
+def parse_file_contents(file_contents: str) -> tuple[Grid, int]:
+    """The grid, with S replaced by the pipe it must be, and the flat index of the start."""
+    grid = Grid.parse(file_contents, pad=".")
+    return grid, find_and_fix_start_tile(grid)
+
+
+def loop_depths(parsed: tuple[Grid, int], shared: dict) -> dict[int, int]:
+    """Both parts need the loop, so whichever runs first leaves it for the other."""
+    if "depths" not in shared:
+        shared["depths"] = follow_pipes_and_record_depths(*parsed)
+    return shared["depths"]
+
+
+def furthest_pipe(parsed: tuple[Grid, int], shared: dict) -> int:
+    return max(loop_depths(parsed, shared).values())
+
+
+def count_enclosed_tiles(parsed: tuple[Grid, int], shared: dict) -> int:
+    grid, _ = parsed
+    depths = loop_depths(parsed, shared)
+
+    inside: dict[int, bool] = {}
+    for x in range(grid.height):
+        is_inside = False
         last_corner = None
-        for y in range(len(grid[x])):
-            node = get_node(grid, (x, y))
-            if not node.pipe:
-                node.inside = inside
+        for i in range(grid.index(x, 0), grid.index(x, grid.width)):
+            if i not in depths:
+                inside[i] = is_inside
             else:
-                if node.char == "|":
-                    inside = not inside
+                char = chr(grid.data[i])
+                if char == "|":
+                    is_inside = not is_inside
                 elif last_corner is None:
-                    last_corner = node.char
-                elif node.char != "-":
-                    corners = {last_corner, node.char}
+                    last_corner = char
+                elif char != "-":
+                    corners = {last_corner, char}
                     if corners == {"F", "J"} or corners == {"7", "L"}:
-                        inside = not inside
+                        is_inside = not is_inside
                     last_corner = None
 
-    print_grid(grid)
-    return sum(1 if node.inside else 0 for row in grid for node in row)
+    if viz.enabled():
+        print_grid(grid, depths, inside)
+    return sum(inside.values())
+
+
+DAY = Day(parse=parse_file_contents, part1=furthest_pipe, part2=count_enclosed_tiles)
+
+
+def part1(file_contents: str) -> int:
+    return DAY.run(file_contents, 1)
+
+
+def part2(file_contents: str) -> int:
+    return DAY.run(file_contents, 2)
 
 
 if __name__ == "__main__":
@@ -201,10 +188,10 @@ def test_part1():
 
 
 def test_part1_real():
-    assert part1(load_input(__file__)) == 6942
+    assert cached_call(part1, load_input(__file__)) == 6942
 
 
-@pytest.mark.parametrize(
+@parametrize(
     "data, num_inside_tiles",
     (
         (
@@ -258,4 +245,4 @@ def test_part2(data, num_inside_tiles):
 
 
 def test_part2_real():
-    assert part2(load_input(__file__)) == 297
+    assert cached_call(part2, load_input(__file__)) == 297
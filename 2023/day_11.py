@@ -2,30 +2,32 @@
 import itertools
 from typing import Iterable
 
-import pytest
+from aoc import gridops
+from aoc.answers import cached_call
+from aoc.testing import parametrize
+from aoc.grid import Grid
+from helpers import load_input
 
-from rich import print
+GALAXY = ord("#")
 
-from helpers import load_input, parse_grid
 
+def parse_file_contents(file_contents: str) -> Grid:
+    return Grid.parse(file_contents)
 
-def parse_file_contents(file_contents: str) -> list[list[str]]:
-    grid = parse_grid(file_contents)
-    return grid
 
-
-def yield_star_coords(universe: list[list[str]]) -> Iterable[list[tuple[int, int]]]:
-    yield from ((x, y) for x in range(len(universe)) for y in range(len(universe[x])) if universe[x][y] == "#")
+def yield_star_coords(universe: Grid) -> Iterable[tuple[int, int]]:
+    i = universe.data.find(GALAXY)
+    while i != -1:
+        yield universe.coord(i)
+        i = universe.data.find(GALAXY, i + 1)
 
 
 def get_star_pairs(star_coords: list[tuple[int, int]]) -> Iterable[tuple[tuple[int, int], tuple[int, int]]]:
     return itertools.combinations(star_coords, 2)
 
 
-def find_universal_expansions(universe) -> tuple[tuple[int], tuple[int]]:
-    x_expansions = tuple(x for x in range(len(universe)) if all(p == "." for p in universe[x]))
-    y_expansions = tuple(y for y in range(len(universe[0])) if all(universe[x][y] == "." for x in range(len(universe))))
-    return x_expansions, y_expansions
+def find_universal_expansions(universe: Grid) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    return tuple(gridops.empty_rows(universe, "#")), tuple(gridops.empty_columns(universe, "#"))
 
 
 def find_distances_between_stars(star_coords, x_expansions, y_expansions, expansion_factor):
@@ -58,6 +60,8 @@ def part2(file_contents: str, expansion_factor: int = 1_000_000) -> int:
 
 
 if __name__ == "__main__":
+    from rich import print
+
     data = load_input(__file__)
     answer1 = part1(data)
     answer2 = part2(data)
@@ -83,10 +87,10 @@ def test_part1():
 
 
 def test_part1_real():
-    assert part1(load_input(__file__)) == 10173804
+    assert cached_call(part1, load_input(__file__)) == 10173804
 
 
-@pytest.mark.parametrize(
+@parametrize(
     "expansion_factor, expected_sum_distance",
     (
         (10, 1030),
@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
-import functools
 import re
 
-from rich import print
-
+from aoc import counters
+from aoc.budget import Budget
+from aoc.cache import parse_cache
+from aoc.memo import memo
+from aoc.variants import variant
 from helpers import load_input
 
+# Part 1 tries every combination of unknown springs, which is 2**k per report
+BUDGET = {1: Budget(seconds=30), 2: Budget(seconds=10)}
+
 
+@parse_cache
 def parse_file_contents(file_contents: str, part2: bool = False) -> tuple[tuple[str, tuple[int, ...]], ...]:
     data = []
 
@@ -34,6 +40,7 @@ def count_valid_groups(original_report, spring_groups):
     count = 0
 
     for i, report in enumerate(all_unknown_combinations(original_report)):
+        counters.count("combination")
         if tuple([len(group) for group in filter(lambda x: x, re.split(r"\.+", report))]) == spring_groups:
             count += 1
 
@@ -45,8 +52,10 @@ def part1(file_contents: str) -> int:
     return sum(count_valid_groups(report, spring_groups) for report, spring_groups in data)
 
 
-@functools.cache
+# Scoped, so each record's entries are dropped once it's counted rather than kept for the rest of the input
+@memo(scoped=True)
 def recurse_reports(report, spring_groups):
+    counters.count("recurse_reports")
     if len(spring_groups) == 0:
         return 0 if "#" in report else 1
 
@@ -65,12 +74,20 @@ def recurse_reports(report, spring_groups):
     return total
 
 
+@variant(1)
+def part1_recursive(file_contents: str) -> int:
+    data = parse_file_contents(file_contents)
+    return sum(recurse_reports(report, spring_groups) for report, spring_groups in data)
+
+
 def part2(file_contents: str) -> int:
     data = parse_file_contents(file_contents, part2=True)
     return sum(recurse_reports(report, spring_groups) for report, spring_groups in data)
 
 
 if __name__ == "__main__":
+    from rich import print
+
     data = load_input(__file__)
     answer1 = part1(data)
     answer2 = part2(data)
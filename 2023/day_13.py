@@ -1,36 +1,22 @@
 #!/usr/bin/env python3
-import itertools
+from aoc import gridops
+from aoc.answers import cached_call
+from aoc.grid import Grid
+from helpers import load_input
 
-from rich import print
 
-from helpers import load_input, parse_grid
+def parse_file_contents(file_contents: str) -> list[Grid]:
+    return [Grid.parse(grid) for grid in file_contents.split("\n\n")]
 
 
-def parse_file_contents(file_contents: str) -> list[list[list[str]]]:
-    return [parse_grid(grid) for grid in file_contents.split("\n\n")]
+def check_grid_rows(grid: Grid, smudges=0):
+    for i, differences in enumerate(gridops.mirror_differences(grid, limit=smudges)):
+        if differences == smudges:
+            return (i + 1) * 100
 
-
-def count_differences(first, second):
-    return sum(1 for chars in zip(first, second) if chars[0] != chars[1])
-
-
-def check_grid_rows(grid, smudges=0):
-    for i, pairs in enumerate(itertools.pairwise(grid)):
-        r1, r2 = pairs
-        pair_smudges = count_differences(r1, r2)
-        if pair_smudges in {0, 1}:
-            mirror_row_pairs = list(zip(grid[i - 1 :: -1] if i > 0 else [], grid[i + 2 : :]))
-            if sum(count_differences(y1, y2) for y1, y2 in mirror_row_pairs) == (smudges - pair_smudges):
-                return (i + 1) * 100
-
-    transposed_grid = list(zip(*grid))
-    for i, pairs in enumerate(itertools.pairwise(transposed_grid)):
-        r1, r2 = pairs
-        pair_smudges = count_differences(r1, r2)
-        if pair_smudges in {0, 1}:
-            mirror_row_pairs = list(zip(transposed_grid[i - 1 :: -1] if i > 0 else [], transposed_grid[i + 2 : :]))
-            if sum(count_differences(y1, y2) for y1, y2 in mirror_row_pairs) == (smudges - pair_smudges):
-                return i + 1
+    for i, differences in enumerate(gridops.mirror_differences(grid.transpose(), limit=smudges)):
+        if differences == smudges:
+            return i + 1
 
 
 def part1(file_contents: str) -> int:
@@ -44,6 +30,8 @@ def part2(file_contents: str) -> int:
 
 
 if __name__ == "__main__":
+    from rich import print
+
     data = load_input(__file__)
     answer1 = part1(data)
     answer2 = part2(data)
@@ -74,7 +62,7 @@ def test_part1():
 
 
 def test_part1_real():
-    assert part1(load_input(__file__)) == 32371
+    assert cached_call(part1, load_input(__file__)) == 32371
 
 
 def test_part2():
@@ -82,4 +70,4 @@ def test_part2():
 
 
 def test_part2_real():
-    assert part2(load_input(__file__)) == 37416
+    assert cached_call(part2, load_input(__file__)) == 37416
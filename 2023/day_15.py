@@ -2,9 +2,8 @@
 from functools import reduce
 from itertools import chain
 
-import pytest
-from rich import print
-
+from aoc.answers import cached_call
+from aoc.testing import parametrize
 from helpers import load_input
 
 
@@ -49,21 +48,21 @@ def part2(file_contents: str) -> int:
 
 
 if __name__ == "__main__":
+    from rich import print
+
     data = load_input(__file__)
     answer1 = part1(data)
     answer2 = part2(data)
     print(f"The answer is: {answer1=}, {answer2=}")
 
 
-@pytest.mark.parametrize(
-    "data, expected_output", (("HASH", 52), ("rn=1,cm-,qp=3,cm=2,qp-,pc=4,ot=9,ab=5,pc-,pc=6,ot=7", 1320))
-)
+@parametrize("data, expected_output", (("HASH", 52), ("rn=1,cm-,qp=3,cm=2,qp-,pc=4,ot=9,ab=5,pc-,pc=6,ot=7", 1320)))
 def test_part1(data, expected_output):
     assert part1(data) == expected_output
 
 
 def test_part1_real():
-    assert part1(load_input(__file__)) == 507291
+    assert cached_call(part1, load_input(__file__)) == 507291
 
 
 def test_part2():
@@ -71,4 +70,4 @@ def test_part2():
 
 
 def test_part2_real():
-    assert part2(load_input(__file__)) == 296921
+    assert cached_call(part2, load_input(__file__)) == 296921
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 import itertools
 
-from rich import print
-
+from aoc import counters
+from aoc.answers import cached_call
+from aoc.grid import Grid
 from helpers import load_input
 
 
@@ -11,50 +12,45 @@ SOUTH = (1, 0)
 WEST = (0, -1)
 EAST = (0, 1)
 
+SPLIT_VERTICAL, SPLIT_HORIZONTAL, MIRROR_UP, MIRROR_DOWN, NEWLINE = map(ord, "|-/\\\n")
+
 
-def energise_grid(grid, beams):
+def energise_grid(grid: Grid, beams: list[tuple[int, tuple[int, int]]]) -> int:
+    """Follows beams of (flat index, direction) until they leave the grid or retrace their steps."""
+    data, stride, size = grid.data, grid.stride, len(grid.data)
     visited = set()
     while beams:
-        coord, direction = beams[0]
-        new_direction = direction
-
-        if coord not in grid:
-            beams.pop(0)
-            continue
-
-        if (coord, direction) in visited:
-            beams.pop(0)
-            continue
-
-        visited.add((coord, direction))
-        match grid[coord]:
-            case "|" if direction[0] == 0:
-                new_direction = NORTH
-                beams.append(((beams[0][0][0] + SOUTH[0], beams[0][0][1] + SOUTH[1]), SOUTH))
-            case "-" if direction[1] == 0:
-                new_direction = WEST
-                beams.append(((beams[0][0][0] + EAST[0], beams[0][0][1] + EAST[1]), EAST))
-            case "/":
-                new_direction = (-direction[1], -direction[0])
-            case "\\":
-                new_direction = (direction[1], direction[0])
-
-        beams[0] = ((coord[0] + new_direction[0], coord[1] + new_direction[1]), new_direction)
-
-    return len(set(coord for coord, direction in visited))
+        i, direction = beams.pop()
+        # Leaving a row sideways lands on a newline (or off either end of the grid)
+        while 0 <= i < size and data[i] != NEWLINE and (i, direction) not in visited:
+            visited.add((i, direction))
+            counters.count("beam_state")
+            c = data[i]
+            if c == SPLIT_VERTICAL and direction[0] == 0:
+                direction = NORTH
+                beams.append((i + stride, SOUTH))
+            elif c == SPLIT_HORIZONTAL and direction[1] == 0:
+                direction = WEST
+                beams.append((i + 1, EAST))
+            elif c == MIRROR_UP:
+                direction = (-direction[1], -direction[0])
+            elif c == MIRROR_DOWN:
+                direction = (direction[1], direction[0])
+
+            i += direction[0] * stride + direction[1]
+
+    return len(set(i for i, direction in visited))
 
 
 def part1(file_contents: str) -> int:
-    lines = file_contents.strip().splitlines()
-    grid = {(x, y): c for x, line in enumerate(lines) for y, c in enumerate(line)}
-    return energise_grid(grid, [((0, 0), EAST)])
+    grid = Grid.parse(file_contents)
+    return energise_grid(grid, [(grid.index(0, 0), EAST)])
 
 
 def part2(file_contents: str) -> int:
     max_energy = 0
-    lines = file_contents.strip().splitlines()
-    m, n = len(lines), len(lines[0])
-    grid = {(x, y): c for x, line in enumerate(lines) for y, c in enumerate(line)}
+    grid = Grid.parse(file_contents)
+    m, n = grid.height, grid.width
 
     for x, y, direction in itertools.chain(
         itertools.product(range(m), [0], [EAST]),
@@ -62,14 +58,17 @@ def part2(file_contents: str) -> int:
         itertools.product([0], range(n), [SOUTH]),
         itertools.product([m - 1], range(n), [NORTH]),
     ):
-        max_energy = max(max_energy, energise_grid(grid, [((x, y), direction)]))
+        max_energy = max(max_energy, energise_grid(grid, [(grid.index(x, y), direction)]))
 
     return max_energy
 
 
 if __name__ == "__main__":
-    answer1 = part1(load_input(__file__))
-    answer2 = part2(load_input(__file__))
+    from rich import print
+
+    data = load_input(__file__)
+    answer1 = part1(data)
+    answer2 = part2(data)
     print(f"The answer is: {answer1=}, {answer2=}")
 
 
@@ -92,7 +91,7 @@ def test_part1():
 
 
 def test_part1_real():
-    assert part1(load_input(__file__)) == 8249
+    assert cached_call(part1, load_input(__file__)) == 8249
 
 
 def test_part2():
@@ -100,4 +99,4 @@ def test_part2():
 
 
 def test_part2_real():
-    assert part2(load_input(__file__)) == 8444
+    assert cached_call(part2, load_input(__file__)) == 8444
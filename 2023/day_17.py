@@ -1,65 +1,48 @@
 #!/usr/bin/env python3
 
+from aoc import search
+from aoc.answers import cached_call
+from aoc.grid import Grid
+from helpers import load_input
 
-from rich import print
 
-from aoc.ds import t
-from helpers import load_input
+ZERO, NEWLINE = ord("0"), ord("\n")
+VERTICAL, HORIZONTAL = 0, 1
+
+
+def make_grid(file_contents: str) -> Grid:
+    return Grid.parse(file_contents)
 
 
-N = t((-1, 0))
-S = t((1, 0))
-W = t((0, -1))
-E = t((0, 1))
-
-
-def make_grid(file_contents: str):
-    return {t((x, y)): int(c) for x, line in enumerate(file_contents.strip().splitlines()) for y, c in enumerate(line)}
-
-
-def make_queue(queue, min_length):
-    if len(queue) < min_length + 1:
-        queue.extend(list() for _ in range(min_length - len(queue) + 1))
-    return queue
-
-
-def explore_grid(grid, min_steps, max_steps):
-    start, end = min(grid), max(grid)
-    distance = -1
-    queue = make_queue([], 10)
-    # Queue items are tuples of (coord, from_direction, stride)
-    queue[0].append((start, None, 1))
-    visited = {}
-    while True:
-        distance += 1
-        for item in queue[distance]:
-            coord, from_direction, stride = item
-
-            if coord == end:
-                return distance
-
-            if item in visited and visited[item] < distance:
-                continue
-
-            next_directions = (
-                (S, E)
-                if from_direction is None
-                else ((from_direction[1], from_direction[0]), (-from_direction[1], -from_direction[0]))
-            )
-            for next_direction in next_directions:
-                next_coord = coord
-                next_distance = distance
-                for steps in range(1, max_steps + 1):
-                    next_coord += next_direction
-                    if next_coord in grid:
-                        next_distance += grid[next_coord]
-                        if steps < min_steps:
-                            continue
-                        next_item = (next_coord, (-next_direction[0], -next_direction[1]), steps)
-                        if next_item not in visited or visited[next_item] > next_distance:
-                            make_queue(queue, min_length=next_distance)
-                            queue[next_distance].append(next_item)
-                            visited[next_item] = next_distance
+def explore_grid(grid: Grid, min_steps, max_steps):
+    """
+    The least heat lost getting from the top left to the bottom right. After each run of steps the crucible has to
+    turn, so all that matters about how it got to a cell is which axis it was moving along: states are
+    `index * 2 + axis`.
+    """
+    data, size = grid.data, len(grid.data)
+    start, end = grid.index(0, 0), grid.index(grid.height - 1, grid.width - 1)
+    turns = {VERTICAL: (HORIZONTAL, (-1, 1)), HORIZONTAL: (VERTICAL, (-grid.stride, grid.stride))}
+
+    def neighbours(state: int) -> list[tuple[int, int]]:
+        axis, steps = turns[state & 1]
+        result = []
+        for step in steps:
+            index, heat_loss = state >> 1, 0
+            for run in range(1, max_steps + 1):
+                index += step
+                # Leaving a row sideways lands on a newline (or off either end of the grid)
+                if not 0 <= index < size or data[index] == NEWLINE:
+                    break
+                heat_loss += data[index] - ZERO
+                if run >= min_steps:
+                    result.append((index * 2 + axis, heat_loss))
+        return result
+
+    result = search.dial(
+        [start * 2 + VERTICAL, start * 2 + HORIZONTAL], neighbours, size * 2, goal=lambda state: state >> 1 == end
+    )
+    return result.distance[result.end] if result.end is not None else None
 
 
 def part1(file_contents: str) -> int:
@@ -73,8 +56,11 @@ def part2(file_contents: str) -> int:
 
 
 if __name__ == "__main__":
-    answer1 = part1(load_input(__file__))
-    answer2 = part2(load_input(__file__))
+    from rich import print
+
+    data = load_input(__file__)
+    answer1 = part1(data)
+    answer2 = part2(data)
     print(f"The answer is: {answer1=}, {answer2=}")
 
 
@@ -100,7 +86,7 @@ def test_part1():
 
 
 def test_part1_real():
-    assert part1(load_input(__file__)) == 694
+    assert cached_call(part1, load_input(__file__)) == 694
 
 
 def test_part2():
@@ -108,4 +94,4 @@ def test_part2():
 
 
 def test_part2_real():
-    assert part2(load_input(__file__)) == 829
+    assert cached_call(part2, load_input(__file__)) == 829
@@ -1,16 +1,15 @@
 #!/usr/bin/env python3
 import re
 
-from rich import print
-
-from aoc.ds import t
+from aoc.answers import cached_call
+from aoc.ds import Point
 from helpers import load_input
 
 
-U = t((-1, 0))
-D = t((1, 0))
-L = t((0, -1))
-R = t((0, 1))
+U = Point((-1, 0))
+D = Point((1, 0))
+L = Point((0, -1))
+R = Point((0, 1))
 
 DIRMAP = {"0": R, "1": D, "2": L, "3": U}
 
@@ -34,7 +33,7 @@ def picks_theorem_area(coords, circumference_length):
 
 
 def part1(file_contents: str) -> int:
-    coord = t((0, 0))
+    coord = Point((0, 0))
     coords = [(0, 0)]
     circumference_length = 0
 
@@ -54,7 +53,7 @@ def parse_file_contents_part2(file_contents: str):
 
 
 def part2(file_contents: str) -> int:
-    coord = t((0, 0))
+    coord = Point((0, 0))
     coords = [(0, 0)]
     circumference_length = 0
 
@@ -68,8 +67,11 @@ def part2(file_contents: str) -> int:
 
 
 if __name__ == "__main__":
-    answer1 = part1(load_input(__file__))
-    answer2 = part2(load_input(__file__))
+    from rich import print
+
+    data = load_input(__file__)
+    answer1 = part1(data)
+    answer2 = part2(data)
     print(f"The answer is: {answer1=}, {answer2=}")
 
 
@@ -96,7 +98,7 @@ def test_part1():
 
 
 def test_part1_real():
-    assert part1(load_input(__file__)) == 47045
+    assert cached_call(part1, load_input(__file__)) == 47045
 
 
 def test_part2():
@@ -104,4 +106,4 @@ def test_part2():
 
 
 def test_part2_real():
-    assert part2(load_input(__file__)) == 147839570293376
+    assert cached_call(part2, load_input(__file__)) == 147839570293376
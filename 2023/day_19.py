@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 import math
-from rich import print
 
+from aoc.answers import cached_call
+from aoc.cache import parse_cache
+from aoc.intervals import Interval, length, split_at
 from helpers import load_input
 
 
+@parse_cache
 def parse_file(file_contents: str):
     para1, para2 = file_contents.strip().split("\n\n")
     workflows = {}
@@ -54,50 +57,39 @@ def part1(file_contents: str) -> int:
     return total
 
 
-def calculate_variations_for_constraints(constraints):
-    PARTS = "sxma"
-    above = {k: 0 for k in PARTS}
-    below = {k: 4_001 for k in PARTS}
-    for check_attr, check_cond, check_val in constraints:
-        if check_cond == ">":
-            above[check_attr] = max(above[check_attr], check_val)
-        else:
-            below[check_attr] = min(below[check_attr], check_val)
-    return math.prod(len(range(above[k] + 1, below[k])) for k in PARTS)
+def count_variations(ranges: dict[str, Interval]) -> int:
+    return math.prod(length(interval) for interval in ranges.values())
 
 
-def yield_accepted_variations(workflows, curr_workflow, constraints: tuple):
+def yield_accepted_variations(workflows, curr_workflow, ranges: dict[str, Interval]):
+    """How many combinations of ratings, out of the intervals in `ranges`, each path to A from a workflow accepts."""
     for condition, next_workflow in workflows[curr_workflow]:
         if condition:
             check_attr, check_cond, check_val = condition
-            if next_workflow == "A":
-                yield calculate_variations_for_constraints(constraints + ((check_attr, check_cond, check_val),))
-            elif next_workflow != "R":
-                yield from yield_accepted_variations(
-                    workflows, next_workflow, constraints + ((check_attr, check_cond, check_val),)
-                )
-            constraints += (
-                (
-                    check_attr,
-                    ">" if check_cond == "<" else "<",
-                    check_val - 1 if check_cond == "<" else check_val + 1,
-                ),
-            )
+            below, above = split_at(ranges[check_attr], check_val if check_cond == "<" else check_val + 1)
+            matched, unmatched = (below, above) if check_cond == "<" else (above, below)
+            matched_ranges = {**ranges, check_attr: matched}
+            ranges = {**ranges, check_attr: unmatched}
         else:
-            if next_workflow == "A":
-                yield calculate_variations_for_constraints(constraints)
-            elif next_workflow != "R":
-                yield from yield_accepted_variations(workflows, next_workflow, constraints)
+            matched_ranges = ranges
+
+        if next_workflow == "A":
+            yield count_variations(matched_ranges)
+        elif next_workflow != "R" and count_variations(matched_ranges):
+            yield from yield_accepted_variations(workflows, next_workflow, matched_ranges)
 
 
 def part2(file_contents: str) -> int:
     workflows, parts = parse_file(file_contents)
-    return sum(yield_accepted_variations(workflows, "in", tuple()))
+    return sum(yield_accepted_variations(workflows, "in", {k: (1, 4_001) for k in "xmas"}))
 
 
 if __name__ == "__main__":
-    answer1 = part1(load_input(__file__))
-    answer2 = part2(load_input(__file__))
+    from rich import print
+
+    data = load_input(__file__)
+    answer1 = part1(data)
+    answer2 = part2(data)
     print(f"The answer is: {answer1=}, {answer2=}")
 
 
@@ -127,7 +119,7 @@ def test_part1():
 
 
 def test_part1_real():
-    assert part1(load_input(__file__)) == 399284
+    assert cached_call(part1, load_input(__file__)) == 399284
 
 
 def test_part2():
@@ -135,4 +127,4 @@ def test_part2():
 
 
 def test_part2_real():
-    assert part2(load_input(__file__)) == 121964982771486
+    assert cached_call(part2, load_input(__file__)) == 121964982771486
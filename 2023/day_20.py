@@ -4,11 +4,17 @@ import dataclasses
 from typing import Optional, Tuple, Iterable
 
 import math
-import pytest
-from rich import print
 
+from aoc import counters
+from aoc.answers import cached_call
+from aoc.budget import Budget
+from aoc.cycles import CycleFinder
+from aoc.testing import parametrize
 from helpers import load_input
 
+# Part 2 presses the button until its assumptions about the input come true, which they might never
+BUDGET = Budget(seconds=10)
+
 
 @dataclasses.dataclass
 class Module:
@@ -106,6 +112,7 @@ def part1(file_contents: str) -> int:
         loop = 0
         while queue:
             pulse, module, from_module = queue.popleft()
+            counters.count("pulse")
             if pulse:
                 high += 1
             else:
@@ -117,46 +124,82 @@ def part1(file_contents: str) -> int:
     return high * low
 
 
+def find_counter(start: Module, end: Module) -> list[Module]:
+    """Every module reachable from `start` without going through `end`."""
+    seen, queue = {start.id: start}, [start]
+    while queue:
+        for output in queue.pop().outputs:
+            if output is not end and output.id not in seen:
+                seen[output.id] = output
+                queue.append(output)
+    return list(seen.values())
+
+
+def counter_key(counter: list[Module]) -> tuple:
+    return tuple(
+        tuple(module.memory.values()) if isinstance(module, ConjunctionModule) else module.on for module in counter
+    )
+
+
 def part2(file_contents: str) -> int:
     modules = parse_file_contents(file_contents)
     queue: collections.deque[Tuple[bool, Module, str]] = collections.deque()
 
+    # From input spelunking, the broadcaster starts a handful of separate counters, each feeding one of the inputs to
+    # the module before rx. Each counter sends its high pulse every so many presses, and rx gets its low pulse once
+    # they all line up: the LCM of those periods. Each counter's states are watched until they repeat, along with the
+    # presses it sends high pulses on, to check that's really what happens.
     input_to_end = modules["rx"].inputs[0]  # there is only 1
-    inputs_to_penultimate = {m.id for m in input_to_end.inputs}  # there are 4
-    presses_to_activate = {}
+    binary_counters = [find_counter(module, input_to_end) for module in modules["broadcaster"].outputs]
+    counter_of = {module.id: i for i, counter in enumerate(binary_counters) for module in counter}
+    high_presses: list[set[int]] = [set() for _ in binary_counters]
+    finders = [CycleFinder() for _ in binary_counters]
+    for counter, finder in zip(binary_counters, finders):
+        finder.see(counter_key(counter))
 
-    high, low = 0, 0
     button_presses = 0
     while True:
         button_presses += 1
         queue.append((False, modules["broadcaster"], "button"))
         while queue:
             pulse, module, from_module = queue.popleft()
-            if pulse:
-                high += 1
-
-                # If we've got a high pulse at one of the inputs which activates the penultimate module, record
-                # how many presses it took to get there. From input spelunking, we know they are all conjunction
-                # modules.
-                # From reddit threads and from iterative checks, they activate on prime number button presses.
-                # Working out when they would all trigger a high pulse together is therefore just a case of LCM;
-                # with prime numbers that's just multiplying them all together.
-                if from_module in inputs_to_penultimate and from_module not in presses_to_activate:
-                    presses_to_activate[from_module] = button_presses
-
-                if len(presses_to_activate) == len(inputs_to_penultimate):
-                    return math.prod(presses_to_activate.values())
-            else:
-                low += 1
+            counters.count("pulse")
             for next_pulse, next_module in module.pulse(from_module=from_module, high=pulse):
                 if next_pulse is False and next_module.id == "rx":
                     return button_presses
+                if next_pulse and next_module is input_to_end:
+                    high_presses[counter_of[module.id]].add(button_presses)
                 queue.append((next_pulse, next_module, module.id))
 
+        for counter, finder in zip(binary_counters, finders):
+            finder.see(counter_key(counter))
+        if all(finder.cycle for finder in finders):
+            return counters_line_up(finders, high_presses, button_presses)
+
+
+def counters_line_up(finders: list[CycleFinder], high_presses: list[set[int]], button_presses: int) -> int:
+    """
+    The press on which every counter sends its high pulse, if each sends them on exactly the multiples of its cycle
+    length. Every press after a cycle's start is covered, as a whole cycle has been seen.
+    """
+    lengths = []
+    for i, finder in enumerate(finders):
+        assert finder.cycle is not None
+        length = finder.cycle.length
+        if high_presses[i] != set(range(length, button_presses + 1, length)):
+            raise ValueError(
+                f"Counter {i} sent high pulses on presses {sorted(high_presses[i])}, not every {length} (its cycle)"
+            )
+        lengths.append(length)
+    return math.lcm(*lengths)
+
 
 if __name__ == "__main__":
-    answer1 = part1(load_input(__file__))
-    answer2 = part2(load_input(__file__))
+    from rich import print
+
+    data = load_input(__file__)
+    answer1 = part1(data)
+    answer2 = part2(data)
     print(f"The answer is: {answer1=}, {answer2=}")
 
 
@@ -184,14 +227,56 @@ broadcaster -> a
 ]
 
 
-@pytest.mark.parametrize("test_input, expected_output", test_data)
+@parametrize("test_input, expected_output", test_data)
 def test_part1(test_input, expected_output):
     assert part1(test_input) == expected_output
 
 
 def test_part1_real():
-    assert part1(load_input(__file__)) == 886347020
+    assert cached_call(part1, load_input(__file__)) == 886347020
+
+
+# Two counters from the broadcaster, one every 5 presses and one every 7, like the real input's
+counters_test_data = """
+broadcaster -> a0, b0
+%a0 -> a1, c0
+%a1 -> a2
+%a2 -> c0
+&c0 -> a0, a1, i0
+&i0 -> fin
+%b0 -> b1, c1
+%b1 -> b2, c1
+%b2 -> c1
+&c1 -> b0, i1
+&i1 -> fin
+&fin -> rx
+"""
+
+offset_counters_test_data = """
+broadcaster -> s, p
+%s -> n
+&n -> a0
+%a0 -> c0
+&c0 -> a0, i0
+&i0 -> fin
+%p -> b0
+%b0 -> c1
+&c1 -> b0, i1
+&i1 -> fin
+&fin -> rx
+"""
+
+
+def test_part2():
+    import pytest
+
+    assert part2(counters_test_data) == 35
+
+    # Both counters repeat every 2 presses, but the first sends its high pulses on odd presses and the second on even
+    # ones, so they never line up and there's no answer (rather than the LCM, 2)
+    with pytest.raises(ValueError):
+        part2(offset_counters_test_data)
 
 
 def test_part2_real():
-    assert part2(load_input(__file__)) == 233283622908263
+    assert cached_call(part2, load_input(__file__)) == 233283622908263
@@ -1,68 +1,49 @@
 #!/usr/bin/env python3
-import pytest
-from rich import get_console
-from rich.style import Style
+from typing import Optional
 
-from aoc.ds import t
+from aoc import search, viz
+from aoc.answers import cached_call
+from aoc.grid import Grid
+from aoc.testing import parametrize
 from helpers import load_input
 
 
-N = t((-1, 0))
-S = t((1, 0))
-W = t((0, -1))
-E = t((0, 1))
+ROCK, NEWLINE = ord("#"), ord("\n")
 
-console = get_console()
-print = console.print
 
+def parse_file_contents(file_contents: str) -> Grid:
+    return Grid.parse(file_contents)
 
-def parse_file_contents(file_contents: str):
-    return {(x, y): c for x, line in enumerate(file_contents.strip().splitlines()) for y, c in enumerate(line.strip())}
 
+def print_grid(grid: Grid, even_step_locs: set[int], visited_step_locs: set[int]):
+    """Shows the plots counted in blue and the other plots reached in red, and adds the grid to the day's animation."""
 
-def print_grid(grid, even_step_locs, visited_step_locs):
-    max_x, max_y = max(k[0] for k in grid), max(k[1] for k in grid)
+    def colour(i: int) -> Optional[str]:
+        return "rgb(0,0,255)" if i in even_step_locs else "rgb(255,0,0)" if i in visited_step_locs else None
 
-    print(max_x, max_y)
+    viz.show(grid, lambda i: f"on {colour(i)}" if colour(i) else None)
+    viz.frames("day-21").add(grid, lambda i: colour(i) or "white")
 
-    x = 0
-    while x <= max_x:
-        y = 0
-        while y <= max_y:
-            if (x, y) in even_step_locs:
-                style = Style(bgcolor="rgb(0, 0, 255)")
-            elif (x, y) in visited_step_locs:
-                style = Style(bgcolor="rgb(255, 0, 0)")
-            else:
-                style = Style()
 
-            print(grid[(x, y)], end="", style=style)
-            y += 1
-        print("")
-        x += 1
+def explore_grid(grid: Grid, start_coord, until_steps, start_even=True) -> int:
+    """How many plots within `until_steps` steps are an even (or with `start_even=False`, odd) number of steps away."""
+    data, size = grid.data, len(grid.data)
+    directions = (-grid.stride, grid.stride, -1, 1)
 
+    def neighbours(index: int) -> list[int]:
+        # Leaving a row sideways lands on a newline (or off either end of the grid)
+        return [
+            index + step
+            for step in directions
+            if 0 <= index + step < size and data[index + step] not in (ROCK, NEWLINE)
+        ]
 
-def explore_grid(grid, start_coord, until_steps, start_even=True) -> int:
-    steps = 0
-    even_step_locs = set()
-    next_steps = {start_coord}
-    visited_steps = set()
-    while steps <= until_steps:
-        curr_steps = next_steps
-        next_steps = set()
-        if steps % 2 == (0 if start_even else 1):
-            even_step_locs |= curr_steps
+    reached = search.bfs([grid.index(*start_coord)], neighbours, size, max_distance=until_steps).reached()
+    parity = 0 if start_even else 1
+    even_step_locs = {index for index, steps in reached.items() if steps % 2 == parity}
 
-        for step in curr_steps:
-            visited_steps.add(step)
-            for dir in (N, S, W, E):
-                next_step = step + dir
-                if next_step not in visited_steps and grid.get(next_step, "#") != "#":
-                    next_steps.add(next_step)
-
-        steps += 1
-
-    print_grid(grid, even_step_locs, visited_steps)
+    if viz.enabled():
+        print_grid(grid, even_step_locs, set(reached))
     print(len(even_step_locs))
 
     return len(even_step_locs)
@@ -70,7 +51,7 @@ def explore_grid(grid, start_coord, until_steps, start_even=True) -> int:
 
 def part1(file_contents: str, until_steps=64) -> int:
     grid = parse_file_contents(file_contents)
-    start_coord = next(coord for coord in grid if grid[coord] == "S")
+    start_coord = grid.find("S")
     print(start_coord)
 
     return explore_grid(grid, start_coord, until_steps=until_steps)
@@ -78,8 +59,8 @@ def part1(file_contents: str, until_steps=64) -> int:
 
 def part2(file_contents: str, until_steps=26_501_365) -> int:
     grid = parse_file_contents(file_contents)
-    start_coord = next(coord for coord in grid if grid[coord] == "S")
-    max_x, max_y = max(k[0] for k in grid), max(k[1] for k in grid)
+    start_coord = grid.find("S")
+    max_x, max_y = grid.height - 1, grid.width - 1
 
     assert max_x == max_y
     grid_diameter = max_x + 1
@@ -164,10 +145,10 @@ def test_part1():
 
 
 def test_part1_real():
-    assert part1(load_input(__file__)) == 3615
+    assert cached_call(part1, load_input(__file__)) == 3615
 
 
-@pytest.mark.parametrize(
+@parametrize(
     "steps, reached_plots",
     (
         # (6, 16),
@@ -227,4 +208,4 @@ def test_part2(steps, reached_plots):
 
 
 # def test_part2_real():
-#     assert part2(load_input(__file__)) == 0
+#     assert cached_call(part2, load_input(__file__)) == 0
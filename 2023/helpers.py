@@ -1,16 +1,47 @@
 import datetime
+import functools
 import json
 import os
 import shutil
 import stat
+from contextlib import contextmanager
 from pathlib import Path
-from time import perf_counter
-from typing import Optional, Any
+from time import perf_counter, process_time
+from typing import Optional, Any, Callable
 
-import requests
 
-_session = requests.Session()
-_session.cookies.set("session", os.environ["AOC_SESSION_COOKIE_DATA"])
+AOC_URL = "https://adventofcode.com"
+# The event these solutions are for, whatever year it is now
+YEAR = 2023
+
+
+def make_session(pool_size: int = 10, retries: int = 3, backoff_factor: float = 0.5):
+    """A keep-alive session that retries failed and rate-limited requests with exponential backoff."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.cookies.set("session", os.environ.get("AOC_SESSION_COOKIE_DATA", ""))
+    return session
+
+
+@functools.cache
+def get_session():
+    """The session is only needed to talk to adventofcode.com, so don't pay for importing requests until then."""
+    if "AOC_SESSION_COOKIE_DATA" not in os.environ:
+        raise KeyError("AOC_SESSION_COOKIE_DATA")
+    return make_session()
 
 
 def get_input_filepath(day):
@@ -31,25 +62,59 @@ def get_current_day():
     return datetime.date.today().day
 
 
-def download_input_data(day):
+def download_input_data(day, session=None, base_url: str = AOC_URL, year: int = YEAR) -> bool:
+    """Downloads a day's input if we don't already have it. Returns whether anything was downloaded."""
+    from aoc.cache import atomic_write_bytes
+
     filename = get_input_filepath(day)
     if os.path.exists(filename):
-        return
+        return False
 
-    resp = _session.get(f"https://adventofcode.com/{get_current_year()}/day/{day}/input")
+    resp = (session or get_session()).get(f"{base_url}/{year}/day/{int(day)}/input")
     resp.raise_for_status()
 
-    with open(filename, "w") as outfile:
-        outfile.write(resp.text)
+    atomic_write_bytes(Path(filename), resp.content)
+    return True
+
+
+def prefetch_inputs(days, session=None, base_url: str = AOC_URL, max_workers: int = 8) -> dict[str, Optional[str]]:
+    """Downloads every missing input concurrently. Returns each day's error, or None if it was fine."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    missing = [day for day in days if not os.path.exists(get_input_filepath(day))]
+    if not missing:
+        return {}
+    # Made once up front and shared, rather than each thread racing to make (and cache) its own
+    try:
+        session = session or get_session()
+    except Exception as e:
+        return {day: f"{type(e).__name__}: {e}" for day in missing}
+
+    def download(day):
+        try:
+            download_input_data(day, session=session, base_url=base_url, year=YEAR)
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(missing, executor.map(download, missing)))
+
+
+def prefetch_in_background(days):
+    """Starts downloading inputs on a background thread, returning a future for `prefetch_inputs`' result."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(prefetch_inputs, days)
+    executor.shutdown(wait=False)
+    return future
 
 
 def submit_answer(day: int, answer: int, part: int) -> bool:
     if has_star(day=day, part=part):
         return True
 
-    resp = _session.post(
-        f"https://adventofcode.com/{get_current_year()}/day/{day}/answer", data={"level": part, "answer": str(answer)}
-    )
+    resp = get_session().post(f"{AOC_URL}/{YEAR}/day/{int(day)}/answer", data={"level": part, "answer": str(answer)})
 
     if "That's the right answer!" in resp.text:
         set_star(day=day, part=part)
@@ -61,27 +126,80 @@ def submit_answer(day: int, answer: int, part: int) -> bool:
     return False
 
 
-def make_star_record():
-    if not os.path.exists("stars.json"):
-        with open("stars.json", "w") as starfile:
-            starfile.write(json.dumps({day: ["-", "-"] for day in range(1, 26)}, indent=2) + "\n")
+STARS_FILE = "stars.json"
 
 
-def has_star(day: int, part: int):
-    with open("stars.json") as starfile:
-        star_record = json.load(starfile)
+class StarRecord:
+    """
+    Stars earned so far, read from disk once. Updates are batched in memory until `flush`, which merges them into the
+    latest copy on disk under a file lock and swaps the file in atomically, so concurrent runners can't lose each
+    other's stars or leave a half-written file behind.
+    """
 
-    return star_record[str(day)][part - 1] == "*"
+    def __init__(self, path: str | Path = STARS_FILE):
+        self.path = Path(path)
+        self.stars = self._read()
+        self.pending: set[tuple[int, int]] = set()
 
+    def _read(self) -> dict[str, list[str]]:
+        try:
+            with open(self.path) as starfile:
+                return json.load(starfile)
+        except FileNotFoundError:
+            return {str(day): ["-", "-"] for day in range(1, 26)}
 
-def set_star(day: int, part: int):
-    with open("stars.json") as starfile:
-        star_record = json.load(starfile)
+    @contextmanager
+    def _lock(self):
+        import fcntl
+
+        with open(self.path.with_name(f".{self.path.name}.lock"), "w") as lockfile:
+            fcntl.flock(lockfile, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lockfile, fcntl.LOCK_UN)
+
+    def has(self, day: int | str, part: int) -> bool:
+        return self.stars[str(int(day))][part - 1] == "*"
 
-    star_record[str(day)][part - 1] = "*"
+    def set(self, day: int | str, part: int):
+        self.stars[str(int(day))][part - 1] = "*"
+        self.pending.add((int(day), part))
 
-    with open("stars.json", "w") as starfile:
-        starfile.write(json.dumps(star_record, indent=2) + "\n")
+    def flush(self):
+        from aoc.cache import atomic_write_bytes
+
+        with self._lock():
+            self.stars = self._read()
+            for day, part in self.pending:
+                self.stars[str(day)][part - 1] = "*"
+            atomic_write_bytes(self.path, (json.dumps(self.stars, indent=2) + "\n").encode())
+        self.pending.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
+
+
+@functools.cache
+def get_star_record() -> StarRecord:
+    return StarRecord()
+
+
+def make_star_record():
+    if not os.path.exists(STARS_FILE):
+        get_star_record().flush()
+
+
+def has_star(day: int, part: int):
+    return get_star_record().has(day, part)
+
+
+def set_star(day: int, part: int):
+    with get_star_record() as star_record:
+        star_record.set(day, part)
 
 
 def make_day(day: str | int):
@@ -96,15 +214,28 @@ def make_day(day: str | int):
 class RecordTime:
     def __enter__(self):
         self.start = perf_counter()
+        self.cpu_start = process_time()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Records time taken in milliseconds"""
+        """Records time taken (and CPU time used) in milliseconds"""
         t = perf_counter() - self.start
         t *= 1000
+        self.ms = t
+        self.cpu_ms = (process_time() - self.cpu_start) * 1000
         self.time = f"{t:.3f}ms"
 
 
+def call_part(func: Callable, file_contents: str) -> Any:
+    """Call a part function, splitting the input into lines for the days that expect pre-split lines."""
+    import inspect
+
+    params = list(inspect.signature(func).parameters.values())
+    if params and params[0].annotation == list[str]:
+        return func(file_contents.strip().splitlines())
+    return func(file_contents)
+
+
 def parse_grid(data: str, pad_edges: Optional[str] = None, tile_class=str) -> list[list[Any]]:
     grid = [[tile_class(char) for char in line.strip()] for line in data.strip().splitlines()]
 
@@ -115,3 +246,73 @@ def parse_grid(data: str, pad_edges: Optional[str] = None, tile_class=str) -> li
         grid.append([tile_class(pad_edges)] * len(grid[0]))
 
     return grid
+
+
+def _set_stars(path: Path, day: int):
+    with StarRecord(path) as star_record:
+        star_record.set(day, 1)
+        star_record.set(day, 2)
+
+
+def test_star_record_concurrent_writers(tmp_path):
+    from concurrent.futures import ProcessPoolExecutor
+
+    path = tmp_path / STARS_FILE
+    StarRecord(path).flush()
+
+    with ProcessPoolExecutor(max_workers=8) as executor:
+        list(executor.map(_set_stars, [path] * 25, range(1, 26)))
+
+    star_record = StarRecord(path)
+    assert all(star_record.has(day, part) for day in range(1, 26) for part in (1, 2))
+    # No temporary files left behind
+    assert {p.name for p in tmp_path.iterdir()} == {STARS_FILE, f".{STARS_FILE}.lock"}
+
+
+def test_prefetch_inputs(tmp_path, monkeypatch):
+    import re
+    import threading
+    from collections import Counter
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    requests_seen: Counter = Counter()
+
+    class FakeAdventOfCode(BaseHTTPRequestHandler):
+        def do_GET(self):
+            day = int(re.fullmatch(r"/2023/day/(\d+)/input", self.path).group(1))  # type: ignore[union-attr]
+            requests_seen[day] += 1
+            # Day 3 fails the first time round, and should be retried
+            if day == 3 and requests_seen[day] == 1:
+                self.send_response(503)
+                self.end_headers()
+                return
+
+            body = f"input for day {day}\n".encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAdventOfCode)
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "input").mkdir()
+    (tmp_path / "input" / "02.txt").write_text("already downloaded\n")
+
+    try:
+        errors = prefetch_inputs(
+            ["01", "02", "03", "04"],
+            session=make_session(backoff_factor=0),
+            base_url=f"http://127.0.0.1:{server.server_port}",
+        )
+    finally:
+        server.shutdown()
+
+    assert errors == {"01": None, "03": None, "04": None}
+    assert requests_seen == {1: 1, 3: 2, 4: 1}
+    assert (tmp_path / "input" / "02.txt").read_text() == "already downloaded\n"
+    assert (tmp_path / "input" / "03.txt").read_text() == "input for day 3\n"
+    assert sorted(p.name for p in (tmp_path / "input").iterdir()) == ["01.txt", "02.txt", "03.txt", "04.txt"]
@@ -1,17 +1,20 @@
 #!/usr/bin/env python3
-import webbrowser
-from contextlib import redirect_stdout
+import argparse
 import importlib
+import os
+import subprocess
 import sys
-from io import StringIO
-
-import pytest
-from rich import print
 
+from aoc import answers, counters, memo
+from aoc.cache import sha256
+from aoc.day import DayRun, declares_day, load as load_day
+from aoc.measure import measure_part, measure_run
+from aoc.testgate import run_tests
 from helpers import (
     load_input,
     get_current_day,
-    download_input_data,
+    prefetch_in_background,
+    prefetch_inputs,
     make_day,
     RecordTime,
     make_star_record,
@@ -19,48 +22,265 @@ from helpers import (
     submit_answer,
 )
 
-if __name__ == "__main__":
-    current_day = sys.argv[1] if len(sys.argv) >= 2 else get_current_day()
+
+def passes_tests(solution_module, solution_filename, part) -> bool:
+    """Runs a part's tests in-process, only falling back to pytest for tests that need it (e.g. fixtures)."""
+    failures = run_tests(solution_module, part)
+    if failures is None:
+        return run_pytest(solution_filename, part, capture_output=True).returncode == 0
+    return not failures
+
+
+def run_pytest(solution_filename, part, *args, capture_output=False):
+    # A fresh interpreter, so that pytest is loaded before the day module and its parametrize marks are real
+    return subprocess.run(
+        [sys.executable, "-m", "pytest", solution_filename, "-k", f"test_part{part}", *args],
+        capture_output=capture_output,
+    )
+
+
+def print_measurement(measurement):
+    from rich import print
+
+    for phase in measurement.phases.values():
+        line = f"\t{phase.name:>6}: {phase.ms:.3f}ms"
+        if phase.peak_bytes is not None:
+            line += f", {phase.peak_bytes / 1024:.1f}KiB peak traced, {phase.net_blocks:+} net blocks"
+        print(f"{line}, {phase.peak_rss_kib / 1024:.1f}MiB peak RSS")
+
+
+def measure_solve(solution_module, solution, run, part, data, trace_memory=False):
+    if run:
+        return measure_run(run, part, trace_memory=trace_memory)
+    return measure_part(solution_module, solution, data, trace_memory=trace_memory)
+
+
+def run_day(current_day, trace_memory=False, budgeted=False):
+    from rich import print
+
     make_star_record()
     make_day(current_day)
-    download_input_data(current_day)
+    # Download the input while the solution is imported and tested
+    download = prefetch_in_background([current_day])
     solution_filename = f"day_{current_day}.py"
     print(f"Running day {current_day}:")
 
-    data = load_input(solution_filename)
-    stdout = StringIO()
+    solution_module = importlib.import_module(solution_filename[:-3])
+    # For days declaring a `Day`, both parts share one parse of the input
+    run = None
 
     for part in [1, 2]:
-        with redirect_stdout(stdout):
-            retval = pytest.main([solution_filename, "-k", f"test_part{part}"])
         print(f"\nPart {part}:")
 
-        if retval == 0:
+        downloaded = download.done()
+        passed = passes_tests(solution_module, solution_filename, part)
+        if not passed and not downloaded:
+            # Tests against the real input may have run before it arrived
+            download.result()
+            passed = passes_tests(solution_module, solution_filename, part)
+
+        if passed:
             print("\t Tests:", "✅")
         else:
             print("\t Tests:", "❌")
-            retval = pytest.main([solution_filename, "-k", f"test_part{part}", "-vvvs"])
+            run_pytest(solution_filename, part, "-vvvs")
             sys.exit(part)
 
         if (part == 1 and (not has_star(current_day, 1) or has_star(current_day, 2))) or part == 2:
-            solution_module = importlib.import_module(solution_filename[:-3])
+            if error := download.result().get(current_day):
+                print(f"\tCouldn't download input: {error}")
+                sys.exit(part)
+            data = load_input(solution_filename)
+
+            from aoc.variants import choose
 
-            with RecordTime() as rt:
-                answer = getattr(solution_module, f"part{part}")(data)
+            solution = choose(solution_module, part, data)
+            if solution.__name__ != f"part{part}":
+                print(f"\tVariant: {solution.__name__} (the fastest verified by `./run.py variants`)")
+            measurement = None
+            if cached := answers.lookup(solution, data):
+                answer, took = cached["answer"], f"{cached['ms']:.3f}ms (cached)"
+            else:
+                if declares_day(solution_module):
+                    run = run or DayRun(load_day(solution_module), data)
+                counters.reset()
+                memo.reset_stats()
+                with RecordTime() as rt:
+                    if budgeted:
+                        from aoc.budget import budget_for, describe, run_within
+
+                        # In a child process, so its parse isn't kept for the other part
+                        budget = budget_for(solution_module, current_day, part)
+                        outcome = run_within(
+                            budget, measure_solve, solution_module, solution, run, part, data, trace_memory
+                        )
+                        if not outcome.ok:
+                            print(f"\t{describe(outcome, budget)}")
+                            sys.exit(part)
+                        answer, measurement = outcome.value
+                        counts = outcome.progress.get("counters", {})
+                        memo_stats = outcome.progress.get("memo", {})
+                        cpu_ms = outcome.progress["cpu_ms"]
+                    else:
+                        answer, measurement = measure_solve(solution_module, solution, run, part, data, trace_memory)
+                        counts = counters.snapshot()
+                        memo_stats = memo.snapshot()
+                answers.store(solution, data, answer, rt.ms)
+                took = rt.time
+                if not trace_memory:
+                    from aoc import history
+
+                    # Tracing allocations makes solving much slower, so those timings would look like regressions
+                    result = {
+                        "day": current_day,
+                        "part": part,
+                        "variant": solution.__name__,
+                        "input_hash": sha256(data),
+                        "wall_ms": rt.ms,
+                        "cpu_ms": cpu_ms if budgeted else rt.cpu_ms,
+                        "peak_rss_kib": max(phase.peak_rss_kib for phase in measurement.phases.values()),
+                    }
+                    history.record([result], source="run")
 
             print(
                 f"\tAnswer: {answer}",
             )
-            print(f"\t  Took: {rt.time}")
+            print(f"\t  Took: {took}")
+            if measurement:
+                print_measurement(measurement)
+            if measurement and counters.enabled():
+                for line in counters.format_snapshot(counts) + memo.format_snapshot(memo_stats):
+                    print(f"\t{line}")
 
             if not has_star(current_day, part):
                 print("\n\t[bold]Submit?[/bold] ", end="")
                 submit = input()
                 if submit.lower() in {"y", "yes"}:
                     if submit_answer(current_day, answer=answer, part=part):
+                        import webbrowser
+
                         print("\t  Star: 🌟")
                         webbrowser.open(f"https://adventofcode.com/2023/day/{current_day}{'#part2' if part==1 else ''}")
                     else:
                         print("\t  Star: ❌")
 
                 break
+
+
+def prefetch(argv):
+    from aoc.bench import discover_days
+
+    parser = argparse.ArgumentParser(prog="run.py prefetch", description="Download every missing input.")
+    parser.add_argument("days", nargs="*", help="Days to download (default: every day with a solution)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent downloads")
+    args = parser.parse_args(argv)
+
+    days = [f"{int(day):02}" for day in args.days] or discover_days()
+    for day, error in prefetch_inputs(days, max_workers=args.workers).items():
+        print(f"Day {day}: {error or 'downloaded'}")
+
+
+def batch(argv):
+    from aoc.batch import main
+
+    main(argv)
+
+
+def bench(argv):
+    from aoc.bench import main
+
+    main(argv)
+
+
+def bench_grid(argv):
+    from aoc.gridbench import main
+
+    main(argv)
+
+
+def bench_point(argv):
+    from aoc.pointbench import main
+
+    main(argv)
+
+
+def check_variants(argv):
+    from aoc.variants import main
+
+    main(argv)
+
+
+def regressions(argv):
+    from aoc.history import main
+
+    main(argv)
+
+
+def scaling(argv):
+    from aoc.scaling import main
+
+    main(argv)
+
+
+COMMANDS = {
+    "batch": batch,
+    "bench": bench,
+    "bench-grid": bench_grid,
+    "bench-point": bench_point,
+    "prefetch": prefetch,
+    "regressions": regressions,
+    "scaling": scaling,
+    "variants": check_variants,
+}
+
+
+def main(argv):
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+
+    parser = argparse.ArgumentParser(description=f"Run a day. Other commands: {', '.join(COMMANDS)}.")
+    parser.add_argument("day", nargs="?", default=get_current_day(), help="Day to run (default: today)")
+    parser.add_argument("--all", action="store_true", help="Run every day/part in parallel and tabulate the answers")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --all (default: CPU count)")
+    parser.add_argument("--memory", action="store_true", help="Trace allocations while solving (slower)")
+    parser.add_argument("--counters", action="store_true", help="Count operations in solutions' hot paths")
+    parser.add_argument(
+        "--viz", action="store_true", help="Draw visualisations (slow), e.g. grids, to the terminal/viz/"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Solve again even if the answer is cached")
+    parser.add_argument("--budget", action="store_true", help="Solve in a child process within the day's budget")
+    parser.add_argument("--watch", action="store_true", help="Test and solve again whenever the code or input changes")
+    parser.add_argument("--import-profile", action="store_true", help="Report import time of run.py and the day")
+    parser.add_argument("--import-budget", type=float, default=None, help="Fail --import-profile above this (ms)")
+    args = parser.parse_args(argv)
+
+    if args.no_cache or args.viz:
+        # A cached answer would skip drawing, too
+        os.environ["AOC_ANSWER_CACHE"] = "0"
+    if args.viz:
+        from aoc import viz
+
+        viz.enable()
+
+    if args.counters:
+        counters.enable()
+
+    if args.import_profile:
+        from aoc.importprofile import IMPORT_BUDGET_MS, report
+
+        modules = ["run"] + ([f"day_{args.day}"] if os.path.exists(f"day_{args.day}.py") else [])
+        sys.exit(0 if report(modules, budget_ms=args.import_budget or IMPORT_BUDGET_MS) else 1)
+    elif args.watch:
+        from aoc.watch import watch
+
+        watch(args.day)
+    elif args.all:
+        from aoc.parallel import main as run_all
+
+        run_all(workers=args.workers)
+    else:
+        run_day(args.day, trace_memory=args.memory, budgeted=args.budget)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])